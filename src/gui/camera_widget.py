@@ -2,20 +2,36 @@ import logging
 
 import cv2
 import numpy as np
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QImage, QPixmap
-from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QVBoxLayout, QWidget
-
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QFrame,
+    QHBoxLayout,
+    QLabel,
+    QVBoxLayout,
+    QWidget,
 )
 
+from server.config import CameraPriority
+
 logger = logging.getLogger(__name__)
 
 
+# (label, value) pairs for the priority selector; -1 = follow tally
+PRIORITY_CHOICES = [
+    ("🔄 Auto (tally)", -1),
+    ("🎬 Program", int(CameraPriority.PROGRAM)),
+    ("👁️ Preview", int(CameraPriority.PREVIEW)),
+    ("🎞️ ISO", int(CameraPriority.ISO)),
+]
+
+
 class CameraWidget(QWidget):
     """Camera display widget with preview and stats"""
 
+    priority_requested = pyqtSignal(int, int)  # cam_id, priority (-1 = auto)
+
     def __init__(self, cam_id, port, theme, parent=None):
         super().__init__(parent)
         self.cam_id = cam_id
@@ -27,6 +43,7 @@ class CameraWidget(QWidget):
         self.frame_count = 0
         self.last_pixmap = None
         self.preview_paused = False
+        self.priority = CameraPriority.PREVIEW
         self.setup_ui()
 
     def setup_ui(self):
@@ -45,8 +62,25 @@ class CameraWidget(QWidget):
         name_font.setBold(True)
         self.name_label.setFont(name_font)
         h_layout.addWidget(self.name_label)
+
+        self.priority_label = QLabel("")
+        priority_font = QFont()
+        priority_font.setBold(True)
+        priority_font.setPointSize(9)
+        self.priority_label.setFont(priority_font)
+        h_layout.addWidget(self.priority_label)
+
         h_layout.addStretch()
 
+        self.priority_combo = QComboBox()
+        self.priority_combo.setToolTip(
+            "Resource priority: Program never drops frames, ISO degrades first"
+        )
+        for label, value in PRIORITY_CHOICES:
+            self.priority_combo.addItem(label, value)
+        self.priority_combo.currentIndexChanged.connect(self._on_priority_selected)
+        h_layout.addWidget(self.priority_combo)
+
         self.status_label = QLabel("🔴 Disconnected")
         status_font = QFont()
         status_font.setBold(True)
@@ -153,6 +187,26 @@ class CameraWidget(QWidget):
                 exc_info=True,
             )
 
+    def _on_priority_selected(self, index):
+        self.priority_requested.emit(self.cam_id, self.priority_combo.itemData(index))
+
+    def reset_priority(self):
+        """Back to tally-driven priority (server restarted)"""
+        self.priority_combo.blockSignals(True)
+        self.priority_combo.setCurrentIndex(0)
+        self.priority_combo.blockSignals(False)
+        self.set_priority(CameraPriority.PREVIEW)
+
+    def set_priority(self, priority: int):
+        """Reflect the server's effective priority for this camera"""
+        self.priority = CameraPriority(priority)
+        if self.priority == CameraPriority.PROGRAM:
+            self.priority_label.setText("🎬 ON AIR")
+        elif self.priority == CameraPriority.ISO:
+            self.priority_label.setText("🎞️ ISO")
+        else:
+            self.priority_label.setText("")
+
     def pause_preview(self):
         """Pause video preview updates to save resources"""
         self.preview_paused = True
@@ -202,25 +256,9 @@ class CameraWidget(QWidget):
             if self.handler:
                 stats_parts = []
 
-                if (
-                    hasattr(self.handler, "average_latency")
-                    and self.handler.average_latency > 0
-                ):
-                    latency_ms = self.handler.average_latency * 1000
-                    # Color code latency: green < 100ms, yellow < 200ms, red >= 200ms
-                    if latency_ms < 50:
-                        latency_icon = "🟢"
-                        quality = "Excellent"
-                    elif latency_ms < 100:
-                        latency_icon = "🟢"
-                        quality = "Good"
-                    elif latency_ms < 200:
-                        latency_icon = "🟡"
-                        quality = "Fair"
-                    else:
-                        latency_icon = "🔴"
-                        quality = "Poor"
-                    stats_parts.append(f"{latency_icon} {quality} - {latency_ms:.0f}ms")
+                latency = self._latency_summary()
+                if latency:
+                    stats_parts.append(latency)
 
                 if (
                     hasattr(self.handler, "battery_percent")
@@ -251,6 +289,38 @@ class CameraWidget(QWidget):
                 f"Error displaying frame for camera {self.cam_id}: {e}", exc_info=True
             )
 
+    def _latency_summary(self) -> str | None:
+        """Latency part of the stats line, rated by its median"""
+        # Glass-to-glass once the phone answers clock pings, else processing only
+        g2g = getattr(self.handler, "glass_to_glass", None)
+        processing = getattr(self.handler, "processing_latency", None)
+        if not (g2g or processing):
+            return None
+
+        latency_ms = (g2g or processing)[50] * 1000
+        # Color code latency: green < 100ms, yellow < 200ms, red >= 200ms
+        if latency_ms < 50:
+            latency_icon = "🟢"
+            quality = "Excellent"
+        elif latency_ms < 100:
+            latency_icon = "🟢"
+            quality = "Good"
+        elif latency_ms < 200:
+            latency_icon = "🟡"
+            quality = "Fair"
+        else:
+            latency_icon = "🔴"
+            quality = "Poor"
+        if g2g:
+            return (
+                f"{latency_icon} {quality} - {latency_ms:.0f}ms glass-to-glass "
+                f"(p95 {g2g[95] * 1000:.0f}ms)"
+            )
+        return (
+            f"{latency_icon} {quality} - {latency_ms:.0f}ms processing "
+            f"(p99 {processing[99] * 1000:.0f}ms)"
+        )
+
     def update_info(self, info):
         parts = []
         if "device_model" in info:
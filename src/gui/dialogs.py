@@ -7,6 +7,10 @@ from PyQt6.QtGui import QFont
 
 # Import existing bridge components
 from network_diagnostics import get_all_interfaces
+from server.handover import HANDOVER_SUPPORTED
+
+MAX_CAMERAS_PER_PORT = 8      # One listener per camera
+MAX_CAMERAS_SINGLE_PORT = 32  # Multiplexed listener, limited by decode capacity
 
 class NetworkSelectionDialog(QDialog):
     """Initial network selection dialog"""
@@ -96,7 +100,8 @@ class SettingsDialog(QDialog):
     """Settings dialog with theme and port configuration"""
     
     def __init__(self, current_port, current_theme_mode, theme, current_omt_quality, 
-                 current_camera_count, server_running, auto_check_updates, test_network, parent=None):
+                 current_camera_count, server_running, auto_check_updates, test_network, parent=None,
+                 single_port=False, udp_ingest=False, multi_nic=False, handover=False):
         super().__init__(parent)
         self.theme = theme
         self.current_port = current_port
@@ -112,6 +117,14 @@ class SettingsDialog(QDialog):
         self.new_camera_count = current_camera_count
         self.test_network = test_network
         self.new_auto_check_updates = auto_check_updates
+        self.single_port = single_port
+        self.new_single_port = single_port
+        self.udp_ingest = udp_ingest
+        self.new_udp_ingest = udp_ingest
+        self.multi_nic = multi_nic
+        self.new_multi_nic = multi_nic
+        self.handover = handover
+        self.new_handover = handover
         self.setup_ui()
         
     def setup_ui(self):
@@ -251,7 +264,7 @@ class SettingsDialog(QDialog):
         camera_count_label.setFont(section_label_font)
         layout.addWidget(camera_count_label)
         
-        camera_desc = QLabel("Total number of phone connections to support (requires restart)")
+        camera_desc = QLabel("Total number of phone connections to support (applies immediately)")
         layout.addWidget(camera_desc)
         
         camera_count_layout = QHBoxLayout()
@@ -262,7 +275,7 @@ class SettingsDialog(QDialog):
         camera_count_layout.addWidget(camera_count_input_label)
         
         self.camera_spin = QSpinBox()
-        self.camera_spin.setRange(1, 8)
+        self.camera_spin.setRange(1, MAX_CAMERAS_SINGLE_PORT if self.single_port else MAX_CAMERAS_PER_PORT)
         self.camera_spin.setValue(self.current_camera_count)
         self.camera_spin.setMinimumWidth(100)
         self.camera_spin.setMaximumWidth(120)
@@ -318,7 +331,7 @@ class SettingsDialog(QDialog):
             warning_icon.setMinimumHeight(30)
             warning_layout.addWidget(warning_icon)
             
-            warning_text = QLabel("Server is running. Stop the server before changing ports.")
+            warning_text = QLabel("Server is running. Connected phones keep streaming; new connections use the new ports.")
             warning_text.setStyleSheet("color: #ff6b6b; font-weight: bold;")
             warning_text.setWordWrap(True)
             warning_layout.addWidget(warning_text)
@@ -348,7 +361,6 @@ class SettingsDialog(QDialog):
         self.port_spin.setMinimumWidth(120)
         self.port_spin.setMaximumWidth(150)
         self.port_spin.setMinimumHeight(36)
-        self.port_spin.setEnabled(not self.server_running)
         self.port_spin.setButtonSymbols(QSpinBox.ButtonSymbols.PlusMinus)
         self.port_spin.setStyleSheet("""
             QSpinBox {
@@ -366,6 +378,42 @@ class SettingsDialog(QDialog):
         
         port_config_layout.addLayout(base_port_layout)
         
+        # Single-port (multiplexed) mode
+        self.single_port_checkbox = QCheckBox(
+            "Single-port mode (all cameras share the base port; more than 8 cameras)"
+        )
+        self.single_port_checkbox.setChecked(self.single_port)
+        self.single_port_checkbox.setEnabled(not self.server_running)
+        self.single_port_checkbox.setMinimumHeight(32)
+        port_config_layout.addWidget(self.single_port_checkbox)
+        
+        # UDP ingest alongside TCP on the same port numbers
+        self.udp_checkbox = QCheckBox(
+            "Also accept UDP from phones (lower latency on lossy Wi-Fi)"
+        )
+        self.udp_checkbox.setChecked(self.udp_ingest)
+        self.udp_checkbox.setEnabled(not self.server_running)
+        self.udp_checkbox.setMinimumHeight(32)
+        port_config_layout.addWidget(self.udp_checkbox)
+        
+        # Listen on every interface so phones can fail over between paths
+        self.multi_nic_checkbox = QCheckBox(
+            "Listen on all network interfaces (cameras fail over, e.g. Wi-Fi to USB)"
+        )
+        self.multi_nic_checkbox.setChecked(self.multi_nic)
+        self.multi_nic_checkbox.setEnabled(not self.server_running)
+        self.multi_nic_checkbox.setMinimumHeight(32)
+        port_config_layout.addWidget(self.multi_nic_checkbox)
+        
+        # Upgrades: the next server instance takes over live phones
+        self.handover_checkbox = QCheckBox(
+            "Hand live cameras over to a newly started instance (Linux/macOS upgrades)"
+        )
+        self.handover_checkbox.setChecked(self.handover)
+        self.handover_checkbox.setEnabled(not self.server_running and HANDOVER_SUPPORTED)
+        self.handover_checkbox.setMinimumHeight(32)
+        port_config_layout.addWidget(self.handover_checkbox)
+        
         # Port range display
         port_range_frame = QFrame()
         port_range_frame.setFrameStyle(QFrame.Shape.Box)
@@ -397,6 +445,7 @@ class SettingsDialog(QDialog):
         self.camera_spin.valueChanged.connect(
             lambda v: self.update_port_range_display(self.port_spin.value(), v)
         )
+        self.single_port_checkbox.toggled.connect(self.on_single_port_toggled)
         
         # ===================================================================
         # OUTPUT PROTOCOL SECTION
@@ -478,8 +527,20 @@ class SettingsDialog(QDialog):
         
         main_layout.addWidget(button_bar)
 
+    def on_single_port_toggled(self, checked):
+        """Widen the camera limit when every camera shares one port"""
+        self.camera_spin.setMaximum(MAX_CAMERAS_SINGLE_PORT if checked else MAX_CAMERAS_PER_PORT)
+        self.update_port_range_display(self.port_spin.value(), self.camera_spin.value())
+    
     def update_port_range_display(self, base_port, camera_count):
         """Update the port range display"""
+        if self.single_port_checkbox.isChecked():
+            self.port_range_label.setText(
+                f"All cameras: port {base_port}\n"
+                f"{camera_count} camera slots, assigned from the phone's handshake"
+            )
+            return
+        
         port_list = ", ".join(str(base_port + i) for i in range(min(camera_count, 4)))
         if camera_count > 4:
             port_list += f", ... {base_port + camera_count - 1}"
@@ -499,9 +560,13 @@ class SettingsDialog(QDialog):
             self.new_omt_quality = quality_btn.property('quality')
 
         self.new_camera_count = self.camera_spin.value()
+        self.new_port = self.port_spin.value()
 
         if not self.server_running:
-            self.new_port = self.port_spin.value()
+            self.new_single_port = self.single_port_checkbox.isChecked()
+            self.new_udp_ingest = self.udp_checkbox.isChecked()
+            self.new_multi_nic = self.multi_nic_checkbox.isChecked()
+            self.new_handover = self.handover_checkbox.isChecked()
 
         self.new_auto_check_updates = self.auto_update_checkbox.isChecked()
 
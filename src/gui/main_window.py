@@ -25,6 +25,8 @@ from PyQt6.QtWidgets import (
 
 from constants import APP_VERSION, get_resource_path
 from constants import ICON_PATH as icon_path
+from server.config import CameraPriority
+from server.handover import DEFAULT_HANDOVER_PATH
 from utils.fallback_mode import FallbackMode
 
 from .camera_widget import CameraWidget
@@ -32,10 +34,6 @@ from .dialogs import NetworkSelectionDialog, SettingsDialog
 from .server_thread import ServerThread
 from .theme import Theme
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-
 logger = logging.getLogger(__name__)
 
 
@@ -73,6 +71,11 @@ class MainWindow(QMainWindow):
         self.omt_quality = self.settings.value("omt_quality", "medium", type=str)
         self.camera_count = self.settings.value("camera_count", 4, type=int)
         self.running_camera_count = self.camera_count
+        self.single_port = self.settings.value("single_port", False, type=bool)
+        self.loop_shards = self.settings.value("loop_shards", 0, type=int)  # 0 = auto
+        self.udp_ingest = self.settings.value("udp_ingest", False, type=bool)
+        self.multi_nic = self.settings.value("multi_nic", False, type=bool)
+        self.handover = self.settings.value("handover", False, type=bool)
 
         # Check for updates setting
         self.auto_check_updates = self.settings.value(
@@ -182,6 +185,16 @@ class MainWindow(QMainWindow):
         minimize_btn.clicked.connect(self.minimize_to_tray)
         layout.addWidget(minimize_btn)
 
+        # Profiler button (samples every thread while on)
+        self.profile_btn = QPushButton(" 🔬 ")
+        self.profile_btn.setFixedSize(60, 42)
+        self.profile_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.profile_btn.setCheckable(True)
+        self.profile_btn.setEnabled(False)
+        self.profile_btn.setToolTip("Start profiling (server must be running)")
+        self.profile_btn.clicked.connect(self.toggle_profiling)
+        layout.addWidget(self.profile_btn)
+
         # About button
         about_btn = QPushButton(" ℹ️ ")
         about_btn.setFixedSize(60, 42)
@@ -219,6 +232,9 @@ class MainWindow(QMainWindow):
 
         layout.addStretch()
 
+        self.resources_label = QLabel("")
+        layout.addWidget(self.resources_label)
+
         self.network_label = QLabel("Server IP Address: Not configured")
         layout.addWidget(self.network_label)
 
@@ -232,9 +248,37 @@ class MainWindow(QMainWindow):
 
         # Create new tabs
         for i in range(1, self.camera_count + 1):
-            cam = CameraWidget(i, self.start_port + i - 1, self.theme)
+            cam = CameraWidget(i, self.camera_port(i), self.theme)
+            cam.priority_requested.connect(self.on_priority_requested)
             self.cameras.append(cam)
-            self.tabs.addTab(cam, f"🔴 Camera {i}: {self.start_port + i - 1}")
+            self.tabs.addTab(cam, f"🔴 Camera {i}: {self.camera_port(i)}")
+
+    def sync_camera_tabs(self):
+        """Add or remove tabs to match camera_count, keeping existing ones"""
+        while len(self.cameras) > self.camera_count:
+            cam = self.cameras.pop()
+            self.tabs.removeTab(len(self.cameras))
+            cam.deleteLater()
+
+        for i in range(len(self.cameras) + 1, self.camera_count + 1):
+            cam = CameraWidget(i, self.camera_port(i), self.theme)
+            cam.priority_requested.connect(self.on_priority_requested)
+            self.cameras.append(cam)
+            self.tabs.addTab(cam, f"🔴 Camera {i}: {self.camera_port(i)}")
+
+        self.update_all_camera_displays()
+        self.update_camera_count()
+
+    def camera_port(self, cam_id: int) -> int:
+        """Port a camera connects to (shared in single-port mode)"""
+        if self.single_port:
+            return self.start_port
+        return self.start_port + cam_id - 1
+
+    def listening_ports_text(self) -> str:
+        if self.single_port:
+            return f"Server listening on port {self.start_port} (single-port, {self.camera_count} slots)"
+        return f"Server listening on ports {self.start_port}-{self.start_port + self.camera_count - 1}"
 
     def create_footer(self):
         footer = QFrame()
@@ -244,9 +288,7 @@ class MainWindow(QMainWindow):
         layout.setContentsMargins(20, 10, 20, 10)
 
         # Store reference to footer label for updates
-        self.footer_label = QLabel(
-            f"Server listening on ports {self.start_port}-{self.start_port + self.camera_count - 1} • OMT Protocol"
-        )
+        self.footer_label = QLabel(f"{self.listening_ports_text()} • OMT Protocol")
         self.footer_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.footer_label)
 
@@ -388,28 +430,26 @@ class MainWindow(QMainWindow):
             self.auto_check_updates,
             self.test_network_callback,
             self,
+            single_port=self.single_port,
+            udp_ingest=self.udp_ingest,
+            multi_nic=self.multi_nic,
+            handover=self.handover,
         )
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            restart_needed = False
             port_changed = False
 
-            # Update port
-            if dialog.new_port != self.start_port and not self.running:
-                self.start_port = dialog.new_port
-                self.settings.setValue("start_port", self.start_port)
-                port_changed = True
-
-            # Check if camera count changed
-            if dialog.new_camera_count != self.camera_count:
-                # Save to settings for next restart, but don't update self.camera_count yet
-                self.settings.setValue("camera_count", dialog.new_camera_count)
-                restart_needed = True
-
-                logger.info(
-                    f"Camera count will change from {self.camera_count} to {dialog.new_camera_count} after restart\n"
-                    f"Server currently running with {self.running_camera_count} cameras"
-                )
+            # Listener options take effect on the next server start
+            if not self.running:
+                port_changed = self._apply_startup_settings(dialog)
+
+            # Camera count and ports apply live; connected cameras keep streaming
+            if (
+                dialog.new_camera_count != self.camera_count
+                or dialog.new_port != self.start_port
+            ):
+                self.apply_camera_layout(dialog.new_camera_count, dialog.new_port)
+                port_changed = False  # Tabs already refreshed
 
             # Update OMT quality
             if dialog.new_omt_quality != self.omt_quality:
@@ -436,9 +476,37 @@ class MainWindow(QMainWindow):
             if port_changed:
                 self.update_all_camera_displays()
 
-            # Show restart prompt if needed
-            if restart_needed:
-                self.offer_app_restart()
+    def _apply_startup_settings(self, dialog: SettingsDialog) -> bool:
+        """Settings the server only reads at start (stopped server); True if single-port changed"""
+        single_port_changed = dialog.new_single_port != self.single_port
+        for key, value in (
+            ("single_port", dialog.new_single_port),
+            ("udp_ingest", dialog.new_udp_ingest),
+            ("multi_nic", dialog.new_multi_nic),
+            ("handover", dialog.new_handover),
+        ):
+            if value != getattr(self, key):
+                setattr(self, key, value)
+                self.settings.setValue(key, value)
+        return single_port_changed
+
+    def apply_camera_layout(self, camera_count: int, start_port: int):
+        """Change camera count and base port, on the running server too"""
+        logger.info(
+            f"Camera layout: {self.camera_count} → {camera_count} cameras, "
+            f"base port {self.start_port} → {start_port}"
+        )
+        if self.running and self.server_thread:
+            # The outcome arrives through on_layout_applied()
+            if not self.server_thread.apply_camera_layout(camera_count, start_port):
+                self.on_layout_applied(False)
+            self.running_camera_count = camera_count
+
+        self.camera_count = camera_count
+        self.start_port = start_port
+        self.settings.setValue("camera_count", self.camera_count)
+        self.settings.setValue("start_port", self.start_port)
+        self.sync_camera_tabs()
 
     def start_server(self):
         if self.running:
@@ -456,6 +524,10 @@ class MainWindow(QMainWindow):
                 self.server_thread.error_occurred.disconnect()
                 self.server_thread.server_stopped.disconnect()
                 self.server_thread.network_status_changed.disconnect()
+                self.server_thread.priority_changed.disconnect()
+                self.server_thread.handed_over.disconnect()
+                self.server_thread.resources_updated.disconnect()
+                self.server_thread.layout_applied.disconnect()
             except Exception:
                 pass
 
@@ -466,6 +538,11 @@ class MainWindow(QMainWindow):
             lib_path,
             self.camera_count,
             self.omt_quality,
+            self.single_port,
+            self.loop_shards,
+            self.udp_ingest,
+            self.multi_nic,
+            DEFAULT_HANDOVER_PATH if self.handover else None,
         )
 
         # Track what the server is actually running
@@ -495,11 +572,33 @@ class MainWindow(QMainWindow):
             Qt.ConnectionType.QueuedConnection,  # type: ignore
         )
 
+        self.server_thread.priority_changed.connect(
+            self.on_priority_changed,
+            Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+
+        self.server_thread.handed_over.connect(
+            self.on_handed_over,
+            Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+
+        self.server_thread.resources_updated.connect(
+            self.on_resources_updated,
+            Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+
+        self.server_thread.layout_applied.connect(
+            self.on_layout_applied,
+            Qt.ConnectionType.QueuedConnection,  # type: ignore
+        )
+
         self.server_thread.start()
 
         self.running = True
         self.server_status.setText("🟢 Running")
         self.toggle_btn.setText("⏹️ Stop Server")
+        self.profile_btn.setEnabled(True)
+        self.profile_btn.setToolTip("Start profiling")
 
         logger.info("Server started from GUI")
 
@@ -532,12 +631,75 @@ class MainWindow(QMainWindow):
         self.running = False
         self.server_status.setText("🔴 Stopped")
         self.toggle_btn.setText("▶️ Start Server")
+        self.resources_label.setText("")
+        self.profile_btn.setChecked(False)
+        self.profile_btn.setEnabled(False)
+        self.profile_btn.setToolTip("Start profiling (server must be running)")
 
         for cam in self.cameras:
             cam.set_connected(False)
+            cam.reset_priority()
         self.update_camera_count()
         self.update_all_camera_displays()
 
+    def toggle_profiling(self, checked: bool):
+        """Start the sampling profiler, or stop it and say where the profile went"""
+        if not self.server_thread:
+            self.profile_btn.setChecked(False)
+            return
+
+        if checked:
+            if not self.server_thread.start_profiling():
+                self.profile_btn.setChecked(False)
+                return
+            self.profile_btn.setToolTip("Stop profiling and save the profile")
+            return
+
+        path = self.server_thread.stop_profiling()
+        self.profile_btn.setToolTip("Start profiling")
+        if path:
+            QMessageBox.information(
+                self,
+                "Profile Saved",
+                f"Profile written to:\n{path}\n\nOpen it at https://www.speedscope.app",
+            )
+
+    def on_resources_updated(self, snapshot):
+        """Server-wide usage from the resource sampler (every couple of seconds)"""
+        if not self.running:
+            return
+        lag_ms = snapshot.max_loop_lag * 1000
+        lag_icon = "⏳" if lag_ms < 50 else "🐢"
+        self.resources_label.setText(
+            f"💾 {snapshot.rss_mb:.0f} MB • ⚙️ {snapshot.cpu_percent:.0f}% CPU • "
+            f"{lag_icon} {lag_ms:.1f}ms loop lag"
+        )
+        self.resources_label.setToolTip(
+            "\n".join(
+                [f"System CPU: {snapshot.system_cpu_percent:.0f}%"]
+                + [
+                    f"Camera {camera} decode: {value:.1f}% CPU"
+                    for camera, value in sorted(snapshot.camera_decode_cpu.items())
+                ]
+            )
+        )
+
+    def on_layout_applied(self, ok: bool):
+        """The server finished a live camera count / port change"""
+        if not ok:
+            QMessageBox.warning(
+                self,
+                "Camera Layout",
+                "Some cameras could not be added or moved (port in use?).\n"
+                "Check the log for details.",
+            )
+
+    def on_handed_over(self):
+        """A newly started instance owns the cameras now; this one bows out"""
+        logger.info("🔁 Cameras handed over to the new instance, closing")
+        self.server_status.setText("🔁 Handed over")
+        self.quit_application()
+
     def on_connection_changed(self, cam_id: int, connected: bool, info: dict[str, Any]):
         try:
             # Validate camera ID
@@ -569,7 +731,7 @@ class MainWindow(QMainWindow):
             # Update tab icon safely
             try:
                 icon = "🟢" if connected else "🔴"
-                port = self.start_port + cam_id - 1
+                port = self.camera_port(cam_id)
                 tab_text = f"{icon} Camera {cam_id}: {port}"
 
                 self.tabs.setTabText(cam_id - 1, tab_text)
@@ -602,6 +764,18 @@ class MainWindow(QMainWindow):
                 f"Frame for camera {cam_id} ignored (have {max_camera_id} widgets)"
             )
 
+    def on_priority_requested(self, cam_id: int, priority: int):
+        """Forward a priority selection from a camera tab to the server"""
+        if self.running and self.server_thread:
+            self.server_thread.set_camera_priority(
+                cam_id, None if priority < 0 else CameraPriority(priority)
+            )
+
+    def on_priority_changed(self, cam_id: int, priority: int):
+        """Reflect a camera's effective priority (manual or tally-driven)"""
+        if 1 <= cam_id <= len(self.cameras):
+            self.cameras[cam_id - 1].set_priority(priority)
+
     def update_camera_count(self):
         count = sum(1 for c in self.cameras if c.connected)
         if hasattr(self, "camera_count_label") and hasattr(self, "camera_count"):
@@ -816,9 +990,7 @@ class MainWindow(QMainWindow):
     def update_port_display(self):
         """Update port display in footer"""
         if hasattr(self, "footer_label"):
-            self.footer_label.setText(
-                f"Server listening on ports {self.start_port}-{self.start_port + self.camera_count - 1} • OMT Protocol"
-            )
+            self.footer_label.setText(f"{self.listening_ports_text()} • OMT Protocol")
 
     def apply_omt_quality_change(self):
         """Apply OMT quality change to running server"""
@@ -831,9 +1003,10 @@ class MainWindow(QMainWindow):
         """Update all camera tab labels and port displays"""
         # Update tab labels
         for i, cam in enumerate(self.cameras):
-            cam.port = self.start_port + i
+            cam.port = self.camera_port(i + 1)
             # Update info label
-            cam.info_label.setText(f"Port {cam.port} • Waiting for connection")
+            if not cam.connected:
+                cam.info_label.setText(f"Port {cam.port} • Waiting for connection")
 
             # Update tab text
             icon = "🟢" if cam.connected else "🔴"
@@ -842,30 +1015,6 @@ class MainWindow(QMainWindow):
         # Update footer
         self.update_port_display()
 
-    def offer_app_restart(self):
-        """Offer to restart the application automatically"""
-        from PyQt6.QtWidgets import QMessageBox
-
-        msg_box = QMessageBox(self)
-        msg_box.setIcon(QMessageBox.Icon.Information)
-        msg_box.setWindowTitle("Restart Required")
-        msg_box.setText("Application Restart Required")
-        msg_box.setInformativeText(
-            "The camera count setting has changed and requires an application restart.\n\n"
-            "Would you like to restart now?"
-        )
-
-        restart_btn = msg_box.addButton(
-            "Restart Now", QMessageBox.ButtonRole.AcceptRole
-        )
-        msg_box.addButton("Restart Later", QMessageBox.ButtonRole.RejectRole)
-        msg_box.setDefaultButton(restart_btn)
-
-        msg_box.exec()
-
-        if msg_box.clickedButton() == restart_btn:
-            self.restart_application()
-
     def restart_application(self):
         """Restart the application with new settings"""
         logger.info("Restarting application...")
@@ -885,11 +1034,6 @@ class MainWindow(QMainWindow):
                     logger.warning("Server thread didn't stop gracefully, terminating")
                     self.server_thread.terminate()
                     self.server_thread.wait(2000)
-
-                # Give the OS time to release the ports
-                import time
-
-                time.sleep(1)
             except Exception as e:
                 logger.error(f"Error stopping server during restart: {e}")
 
@@ -7,12 +7,9 @@ from PyQt6.QtCore import QThread, pyqtSignal
 
 # Import existing bridge components
 from server.bridge import OMTBridgeServer
+from server.config import CameraPriority
 from server.handler import PhoneStreamHandler
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +21,10 @@ class ServerThread(QThread):
     error_occurred = pyqtSignal(str)
     server_stopped = pyqtSignal()
     network_status_changed = pyqtSignal(bool, str)
+    priority_changed = pyqtSignal(int, int)
+    handed_over = pyqtSignal()  # A new server process took over our phones
+    resources_updated = pyqtSignal(object)  # ResourceSnapshot from the server's sampler
+    layout_applied = pyqtSignal(bool)  # apply_camera_layout() finished (False: some cameras failed)
 
     def __init__(
         self,
@@ -33,6 +34,11 @@ class ServerThread(QThread):
         lib_path="libomt.dll",
         camera_count=4,
         omt_quality="medium",
+        single_port=False,
+        shards=0,
+        udp=False,
+        multi_nic=False,
+        handover=None,
     ):
         super().__init__()
         self.bind_ip = bind_ip
@@ -41,6 +47,11 @@ class ServerThread(QThread):
         self.lib_path = lib_path
         self.camera_count = camera_count
         self.omt_quality = omt_quality
+        self.single_port = single_port
+        self.shards = shards  # Event loop shards (0 = pick from camera count)
+        self.udp = udp
+        self.multi_nic = multi_nic  # Also listen on every other usable interface
+        self.handover = handover  # Unix socket path for zero-downtime upgrades
         self.server: OMTBridgeServer | None = None
         self.loop = None
         self.running = False
@@ -60,49 +71,26 @@ class ServerThread(QThread):
             )
 
             self.server = OMTBridgeServer(
-                self.output_type, self.lib_path, self.bind_ip, quality_value
+                self.output_type,
+                self.lib_path,
+                self.bind_ip,
+                quality_value,
+                single_port=self.single_port,
+                mux_port=self.start_port,
+                shards=self.shards,
+                udp=self.udp,
+                multi_nic=self.multi_nic,
+                handover=self.handover,
             )
 
-            # Set up callbacks patching handlers
-            def disconnect_signal_wrapper(phone_id, connected, info):
-                """Wrapper to emit disconnect signals safely"""
-                if self.running:  # Only emit if thread is still running
-                    try:
-                        self.connection_changed.emit(phone_id, connected, info)
-                    except RuntimeError:
-                        logger.debug(
-                            f"Could not emit signal for phone {phone_id} (Qt cleaned up)"
-                        )
-
-            def network_status_wrapper(available, ip):
-                logger.info(
-                    f"🔔 Network status callback triggered: available={available}, ip={ip}"
-                )
-                if self.running:
-                    try:
-                        self.network_status_changed.emit(available, ip)
-                        logger.debug(f"✅ Network status signal emitted: {available}")
-                    except RuntimeError as e:
-                        logger.debug(f"Could not emit network status signal: {e}")
-                    except Exception as e:
-                        logger.error(f"Error emitting network status: {e}")
-                else:
-                    logger.debug("Server not running, skipping network status signal")
-
-            self.server._disconnect_signal_callback = disconnect_signal_wrapper
-            self.server._network_status_callback = network_status_wrapper
-
+            self._connect_server_callbacks()
             logger.info("✅ Network status callback registered")
 
             # Configure ports dynamically based on camera_count
-            self.server.configs = []
-            for i in range(self.camera_count):
-                from server.config import StreamConfig
-
-                config = StreamConfig(
-                    i + 1, self.start_port + i, f"VSS Camera {i + 1}", 1280, 720, 30
-                )
-                self.server.configs.append(config)
+            self.server.configs = [
+                self._camera_config(i + 1, self.start_port + i)
+                for i in range(self.camera_count)
+            ]
 
             self._patch_handlers()
 
@@ -124,6 +112,46 @@ class ServerThread(QThread):
             self.cleanup_loop()
             self.server_stopped.emit()
 
+    def _connect_server_callbacks(self):
+        """Route the server's callbacks (on its loop thread) to Qt signals"""
+        self.server._disconnect_signal_callback = self._emit_connection_changed
+        self.server._network_status_callback = self._emit_network_status
+        self.server._priority_callback = self._emit_priority_changed
+        self.server._handover_callback = self.handed_over.emit
+        self.server.resource_sampler.on_sample = self.resources_updated.emit
+
+    def _emit_connection_changed(self, phone_id, connected, info):
+        """Wrapper to emit disconnect signals safely"""
+        if self.running:  # Only emit if thread is still running
+            try:
+                self.connection_changed.emit(phone_id, connected, info)
+            except RuntimeError:
+                logger.debug(
+                    f"Could not emit signal for phone {phone_id} (Qt cleaned up)"
+                )
+
+    def _emit_network_status(self, available, ip):
+        logger.info(
+            f"🔔 Network status callback triggered: available={available}, ip={ip}"
+        )
+        if self.running:
+            try:
+                self.network_status_changed.emit(available, ip)
+                logger.debug(f"✅ Network status signal emitted: {available}")
+            except RuntimeError as e:
+                logger.debug(f"Could not emit network status signal: {e}")
+            except Exception as e:
+                logger.error(f"Error emitting network status: {e}")
+        else:
+            logger.debug("Server not running, skipping network status signal")
+
+    def _emit_priority_changed(self, phone_id, priority):
+        if self.running:
+            try:
+                self.priority_changed.emit(phone_id, priority)
+            except RuntimeError as e:
+                logger.debug(f"Could not emit priority signal: {e}")
+
     async def _run_server(self):
         try:
             await self.server.start() if self.server else None
@@ -131,6 +159,12 @@ class ServerThread(QThread):
             logger.info("Server start cancelled, cleaning up...")
             raise
 
+    @staticmethod
+    def _camera_config(phone_id: int, port: int):
+        from server.config import StreamConfig
+
+        return StreamConfig(phone_id, port, f"VSS Camera {phone_id}", 1280, 720, 30)
+
     def _patch_handlers(self):
         """Patch handlers to emit Qt signals with robust error handling"""
         original_handle = PhoneStreamHandler.handle_client
@@ -161,7 +195,7 @@ class ServerThread(QThread):
                                 "temperature": handler.cpu_temperature_celsius,
                                 "resolution": f"{handler.current_width}x{handler.current_height}",
                                 "fps": handler.current_fps,
-                                "latency": handler.average_latency,
+                                "latency": (handler.processing_latency or {50: 0.0})[50],
                                 "handler": handler,
                             }
                             thread.connection_changed.emit(
@@ -180,7 +214,13 @@ class ServerThread(QThread):
                     result = await orig_process_video(data, flags, receive_time)
 
                     # Send RGB frame to GUI - but DON'T re-decode, handler already did it
-                    if result and thread.running and not (flags & 0x2):
+                    # Lower-priority cameras refresh their preview less often
+                    if (
+                        result
+                        and thread.running
+                        and not (flags & 0x2)
+                        and handler.video_frame_count % handler.preview_every == 0
+                    ):
                         try:
                             # Handler already has the decoded frame in NV12 format
                             # Just convert the last NV12 data to RGB
@@ -189,6 +229,7 @@ class ServerThread(QThread):
                                     handler._last_nv12_frame,
                                     handler.current_width,
                                     handler.current_height,
+                                    handler.preview_step,
                                 )
                                 thread.frame_received.emit(
                                     handler.config.phone_id, rgb_frame
@@ -216,7 +257,11 @@ class ServerThread(QThread):
             finally:
                 # Emit disconnect signal, checking if we're shutting down
                 try:
-                    if thread.running and not thread.shutdown_in_progress:
+                    if handler.superseded or handler.detaching:
+                        logger.debug(
+                            f"Phone {handler.config.phone_id}: Session handed over, staying connected"
+                        )
+                    elif thread.running and not thread.shutdown_in_progress:
                         thread.connection_changed.emit(
                             handler.config.phone_id, False, {}
                         )
@@ -266,6 +311,71 @@ class ServerThread(QThread):
             except Exception as e:
                 logger.error(f"Error updating OMT quality: {e}")
 
+    def apply_camera_layout(self, camera_count: int, start_port: int) -> bool:
+        """
+        Add, remove or re-port cameras on the running server (no restart).
+        Returns once the change is scheduled; ``layout_applied`` reports the
+        outcome, so the GUI thread never waits on the server loop.
+        """
+        if not (self.loop and self.server):
+            return False
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self.server.apply_camera_layout(
+                    camera_count, start_port, self._camera_config
+                ),
+                self.loop,
+            )
+        except Exception as e:
+            logger.error(f"Error applying camera layout: {e}")
+            return False
+
+        def on_done(done: futures.Future):
+            try:
+                ok = done.result()
+            except Exception as e:
+                logger.error(f"Error applying camera layout: {e}")
+                self.layout_applied.emit(False)
+                return
+            self.camera_count = camera_count
+            self.start_port = start_port
+            self.layout_applied.emit(ok)
+
+        future.add_done_callback(on_done)
+        return True
+
+    def start_profiling(self, rate: float = 100.0) -> bool:
+        """Start the server's sampling profiler (it runs on its own thread)"""
+        if not self.server:
+            return False
+        return self.server.start_profiling(rate)
+
+    def stop_profiling(self) -> str | None:
+        """Stop the profiler; path of the speedscope profile being written"""
+        if not self.server:
+            return None
+        return self.server.stop_profiling()
+
+    def set_camera_priority(self, phone_id: int, priority: CameraPriority | None):
+        """Set (or with None, clear) a manual priority override for a camera"""
+        if self.loop and self.server:
+            try:
+                future = asyncio.run_coroutine_threadsafe(
+                    self._async_set_priority(phone_id, priority), self.loop
+                )
+                future.result(timeout=5)
+            except Exception as e:
+                logger.error(f"Error setting camera priority: {e}")
+
+    async def _async_set_priority(
+        self, phone_id: int, priority: CameraPriority | None
+    ):
+        try:
+            if self.server:
+                self.server.set_camera_priority(phone_id, priority)
+        except Exception as e:
+            logger.error(f"Error in _async_set_priority: {e}")
+
     async def _async_update_quality(self, quality_value: int):
         """Async wrapper for updating quality"""
         try:
@@ -283,11 +393,9 @@ class ServerThread(QThread):
                 for task in pending:
                     task.cancel()
 
-                # Give tasks a moment to cancel
+                # Let them unwind, but don't hang on one that ignores cancellation
                 if pending:
-                    self.loop.run_until_complete(
-                        asyncio.gather(*pending, return_exceptions=True)
-                    )
+                    self.loop.run_until_complete(asyncio.wait(pending, timeout=1.0))
 
                 self.loop.close()
                 logger.debug("Asyncio loop cleaned up successfully")
@@ -332,8 +440,5 @@ class ServerThread(QThread):
         try:
             if self.server:
                 await self.server.stop()
-
-                # Give a moment for cleanup
-                await asyncio.sleep(0.5)
         except Exception as e:
             logger.error(f"Error stopping: {e}")
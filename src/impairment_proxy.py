@@ -0,0 +1,552 @@
+"""
+Impairment Proxy
+Sits between phones (or the phone simulator) and the bridge server and makes
+the network worse on purpose: added latency and jitter, an uplink bandwidth
+cap with a bounded queue, packet loss and scripted stalls where nothing
+moves at all. A lost UDP packet is gone; a lost TCP segment arrives a
+retransmission later and holds up everything behind it, as on a real link. Used to benchmark recovery, the watchdog and adaptive bitrate
+repeatably on one machine.
+
+Listens on TCP and UDP for ``count`` consecutive ports starting at
+``--listen-port`` and forwards each to the matching ``--target-port``.
+
+Script files hold one event per line, ``<seconds> <action>``:
+
+    # Venue Wi-Fi falls over after 10 s, then comes back lossy
+    10 stall 3
+    13 loss=0.05 loss_burst=4 delay_ms=80 jitter_ms=30
+    30 rate_kbps=1500
+    45 reset
+
+Requirements:
+    None beyond the standard library
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import socket
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Callable
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+_CLOSE = b""  # Queued on a TCP link to forward the peer's EOF in order
+
+
+@dataclass
+class Impairment:
+    """Current network conditions; change at any time, takes effect per packet"""
+
+    delay_ms: float = 0.0  # One-way, both directions
+    jitter_ms: float = 0.0  # Std. deviation of extra delay, both directions
+    rate_kbps: float = 0.0  # Uplink (phone → server) cap, 0 = unlimited
+    loss: float = 0.0  # Average packet loss, 0-1, both directions
+    loss_burst: float = 1.0  # Mean loss burst length in packets (1 = random)
+    retransmit_ms: float = 0.0  # TCP: extra delay of a lost segment (0 = one round trip)
+    queue_kb: float = 256.0  # Bottleneck queue; UDP drops past it, TCP backs off
+
+
+@dataclass
+class ProxyStats:
+    forwarded_packets: int = 0
+    forwarded_bytes: int = 0
+    lost: int = 0  # Random loss (UDP)
+    retransmitted: int = 0  # Random loss (TCP), delivered late
+    queue_drops: int = 0  # Queue overflow (UDP)
+    stalls: int = 0
+
+
+@dataclass
+class ScriptEvent:
+    at: float  # Seconds from proxy start
+    action: str  # "set", "stall" or "reset"
+    values: dict[str, float]
+
+
+def parse_script(text: str) -> list[ScriptEvent]:
+    """Parse a script file (see module docstring)"""
+    names = {f.name for f in fields(Impairment)}
+    events = []
+
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        at, *words = line.split()
+        try:
+            if words[:1] == ["stall"] and len(words) == 2:
+                events.append(ScriptEvent(float(at), "stall", {"seconds": float(words[1])}))
+            elif words == ["reset"]:
+                events.append(ScriptEvent(float(at), "reset", {}))
+            elif words:
+                values = {}
+                for word in words:
+                    key, value = word.split("=", 1)
+                    if key not in names:
+                        raise ValueError(f"unknown setting {key!r}")
+                    values[key] = float(value)
+                events.append(ScriptEvent(float(at), "set", values))
+            else:
+                raise ValueError("missing action")
+        except ValueError as e:
+            raise ValueError(f"Script line {line_no}: {e}") from None
+
+    return sorted(events, key=lambda event: event.at)
+
+
+class _Link:
+    """
+    One direction of an impaired path.
+
+    Each packet gets a departure time (after stalls and, if shaped, the rate
+    cap's serialisation delay) and an arrival time (departure + delay +
+    jitter). Ordered links (TCP) never deliver out of order, so a lost
+    segment's retransmission delay holds up everything queued after it;
+    datagram links can reorder, lose packets and drop when the queue is full.
+    """
+
+    def __init__(
+        self,
+        proxy: "ImpairmentProxy",
+        deliver: Callable[[bytes], None],
+        datagram: bool,
+        shaped: bool,
+    ):
+        self.proxy = proxy
+        self.deliver = deliver
+        self.datagram = datagram
+        self.shaped = shaped
+
+        self.queued_bytes = 0
+        self._heap: list[tuple[float, int, bytes]] = []
+        self._order = itertools.count()
+        self._link_free = 0.0
+        self._last_arrival = 0.0
+        self._bad = False  # Gilbert-Elliott loss state
+
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._task = asyncio.create_task(self._pump())
+
+    def _lose(self, imp: Impairment) -> bool:
+        """Two-state burst loss with average ``loss`` and mean burst ``loss_burst``"""
+        if imp.loss <= 0:
+            self._bad = False
+            return False
+        burst = max(imp.loss_burst, 1.0)
+        loss = min(imp.loss, 0.99)
+        if self._bad:
+            self._bad = random.random() >= 1 / burst
+        else:
+            self._bad = random.random() < loss / (burst * (1 - loss))
+        return self._bad
+
+    def send(self, data: bytes):
+        imp = self.proxy.impairment
+        stats = self.proxy.stats
+
+        lost = bool(data) and self._lose(imp)
+        if self.datagram:
+            if lost:
+                stats.lost += 1
+                return
+            if self.queued_bytes + len(data) > imp.queue_kb * 1024:
+                stats.queue_drops += 1
+                return
+        elif lost:
+            stats.retransmitted += 1
+
+        now = time.monotonic()
+        departure = max(now, self.proxy.stalled_until)
+        if self.shaped and imp.rate_kbps > 0:
+            departure = max(departure, self._link_free) + len(data) * 8 / (
+                imp.rate_kbps * 1000
+            )
+            self._link_free = departure
+
+        delay = imp.delay_ms
+        if imp.jitter_ms > 0:
+            delay = max(0.0, delay + random.gauss(0, imp.jitter_ms))
+        if lost:
+            delay += imp.retransmit_ms or 2 * imp.delay_ms
+        arrival = departure + delay / 1000
+        if not self.datagram:
+            arrival = max(arrival, self._last_arrival)
+        self._last_arrival = max(arrival, self._last_arrival)
+
+        heapq.heappush(self._heap, (arrival, next(self._order), data))
+        self.queued_bytes += len(data)
+        if self.queued_bytes > imp.queue_kb * 1024:
+            self._drained.clear()
+        self._wakeup.set()
+
+    async def wait_drained(self):
+        """TCP backpressure: hold off reading while the bottleneck queue is full"""
+        await self._drained.wait()
+
+    async def _pump(self):
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due = max(self._heap[0][0], self.proxy.stalled_until)
+            wait = due - time.monotonic()
+            if wait > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, data = heapq.heappop(self._heap)
+            self.queued_bytes -= len(data)
+            if self.queued_bytes <= self.proxy.impairment.queue_kb * 512:
+                self._drained.set()
+
+            if data:
+                self.proxy.stats.forwarded_packets += 1
+                self.proxy.stats.forwarded_bytes += len(data)
+            try:
+                self.deliver(data)
+            except Exception as e:
+                logger.debug(f"Delivery failed: {e}")
+
+    def close(self):
+        self._task.cancel()
+
+
+class _UdpUpstream(asyncio.DatagramProtocol):
+    """Proxy → server socket for one phone address"""
+
+    def __init__(self, flow: "_UdpFlow"):
+        self.flow = flow
+
+    def connection_made(self, transport):
+        self.flow.upstream = transport  # type: ignore
+        for data in self.flow.early:
+            transport.sendto(data)  # type: ignore
+        self.flow.early.clear()
+
+    def datagram_received(self, data, addr):
+        self.flow.last_seen = time.monotonic()
+        self.flow.downlink.send(data)
+
+
+class _UdpFlow:
+    def __init__(self, proxy: "ImpairmentProxy", front: asyncio.DatagramTransport, addr):
+        self.upstream: asyncio.DatagramTransport | None = None
+        self.early: list[bytes] = []
+        self.last_seen = time.monotonic()
+        self.uplink = _Link(proxy, self._send_up, datagram=True, shaped=True)
+        self.downlink = _Link(
+            proxy, lambda data: front.sendto(data, addr), datagram=True, shaped=False
+        )
+
+    def _send_up(self, data: bytes):
+        if self.upstream is None:
+            self.early.append(data)
+        else:
+            self.upstream.sendto(data)
+
+    def close(self):
+        self.uplink.close()
+        self.downlink.close()
+        if self.upstream:
+            self.upstream.close()
+
+
+class _UdpFrontend(asyncio.DatagramProtocol):
+    """Phone-facing UDP socket for one port"""
+
+    def __init__(self, proxy: "ImpairmentProxy", target: tuple[str, int]):
+        self.proxy = proxy
+        self.target = target
+        self.transport: asyncio.DatagramTransport | None = None
+        self.flows: dict[tuple, _UdpFlow] = {}
+
+    def connection_made(self, transport):
+        self.transport = transport  # type: ignore
+
+    def datagram_received(self, data, addr):
+        flow = self.flows.get(addr)
+        if flow is None:
+            flow = _UdpFlow(self.proxy, self.transport, addr)  # type: ignore
+            self.flows[addr] = flow
+            asyncio.ensure_future(
+                asyncio.get_running_loop().create_datagram_endpoint(
+                    lambda: _UdpUpstream(flow), remote_addr=self.target
+                )
+            )
+            logger.info(f"📡 UDP flow {addr[0]}:{addr[1]} → port {self.target[1]}")
+        flow.last_seen = time.monotonic()
+        flow.uplink.send(data)
+
+    def expire(self, idle: float = 30.0):
+        now = time.monotonic()
+        for addr, flow in list(self.flows.items()):
+            if now - flow.last_seen > idle:
+                flow.close()
+                del self.flows[addr]
+
+    def close(self):
+        for flow in self.flows.values():
+            flow.close()
+        self.flows.clear()
+        if self.transport:
+            self.transport.close()
+
+
+class ImpairmentProxy:
+    """TCP + UDP forwarder with adjustable impairments"""
+
+    def __init__(
+        self,
+        listen_host: str,
+        listen_port: int,
+        target_host: str,
+        target_port: int,
+        count: int = 1,
+        impairment: Impairment | None = None,
+    ):
+        """
+        Args:
+            listen_host: Address phones connect to
+            listen_port: First port to listen on (TCP and UDP)
+            target_host: Bridge server address
+            target_port: First bridge port; listen_port + i forwards to target_port + i
+            count: Number of consecutive ports to forward
+            impairment: Starting conditions (default: none)
+        """
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.target_host = target_host
+        self.target_port = target_port
+        self.count = count
+
+        self.baseline = impairment or Impairment()
+        self.impairment = replace(self.baseline)
+        self.stats = ProxyStats()
+        self.stalled_until = 0.0
+
+        self._servers: list[asyncio.AbstractServer] = []
+        self._udp: list[_UdpFrontend] = []
+        self._links: set[_Link] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def set(self, **values: float):
+        """Change conditions, e.g. ``proxy.set(loss=0.05, delay_ms=80)``"""
+        for key, value in values.items():
+            if not hasattr(self.impairment, key):
+                raise AttributeError(f"Unknown impairment setting: {key}")
+            setattr(self.impairment, key, value)
+        logger.info(f"🌩️ Impairment now {self.impairment}")
+
+    def reset(self):
+        self.impairment = replace(self.baseline)
+        self.stalled_until = 0.0
+        logger.info("🌤️ Impairment reset to baseline")
+
+    def stall(self, seconds: float):
+        """Hold all traffic in both directions for ``seconds``"""
+        self.stalled_until = max(self.stalled_until, time.monotonic() + seconds)
+        self.stats.stalls += 1
+        logger.info(f"⏸️ Stalling all traffic for {seconds:g}s")
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        for i in range(self.count):
+            target = (self.target_host, self.target_port + i)
+
+            server = await asyncio.start_server(
+                lambda r, w, target=target: self._handle_tcp(r, w, target),
+                self.listen_host,
+                self.listen_port + i,
+            )
+            self._servers.append(server)
+
+            _, front = await loop.create_datagram_endpoint(
+                lambda target=target: _UdpFrontend(self, target),
+                local_addr=(self.listen_host, self.listen_port + i),
+            )
+            self._udp.append(front)
+
+        self._tasks.append(asyncio.create_task(self._expire_flows()))
+        logger.info(
+            f"🌐 Proxying {self.listen_host}:{self.listen_port}"
+            f"{f'-{self.listen_port + self.count - 1}' if self.count > 1 else ''} → "
+            f"{self.target_host}:{self.target_port} with {self.impairment}"
+        )
+
+    async def run_script(self, events: list[ScriptEvent]):
+        """Apply script events at their offsets from now"""
+        start = time.monotonic()
+        for event in events:
+            await asyncio.sleep(max(0.0, start + event.at - time.monotonic()))
+            if event.action == "stall":
+                self.stall(event.values["seconds"])
+            elif event.action == "reset":
+                self.reset()
+            else:
+                self.set(**event.values)
+        logger.info("📜 Script finished")
+
+    async def _handle_tcp(self, phone_reader, phone_writer, target):
+        peer = phone_writer.get_extra_info("peername")
+        try:
+            server_reader, server_writer = await asyncio.open_connection(*target)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not reach {target[0]}:{target[1]}: {e}")
+            phone_writer.close()
+            return
+
+        for writer in (phone_writer, server_writer):
+            sock = writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        logger.info(f"🔌 TCP {peer[0]}:{peer[1]} → port {target[1]}")
+        uplink = _Link(self, self._tcp_deliver(server_writer), datagram=False, shaped=True)
+        downlink = _Link(self, self._tcp_deliver(phone_writer), datagram=False, shaped=False)
+        self._links.update((uplink, downlink))
+
+        try:
+            await asyncio.gather(
+                self._pipe(phone_reader, uplink), self._pipe(server_reader, downlink)
+            )
+        finally:
+            # Let queued bytes (and the EOF) drain before tearing down
+            while uplink.queued_bytes or downlink.queued_bytes:
+                await asyncio.sleep(0.05)
+            for link in (uplink, downlink):
+                link.close()
+                self._links.discard(link)
+            phone_writer.close()
+            server_writer.close()
+            logger.info(f"🔌 TCP {peer[0]}:{peer[1]} closed")
+
+    @staticmethod
+    def _tcp_deliver(writer: asyncio.StreamWriter) -> Callable[[bytes], None]:
+        def deliver(data: bytes):
+            if not data:
+                if writer.can_write_eof():
+                    writer.write_eof()
+            elif not writer.is_closing():
+                writer.write(data)
+
+        return deliver
+
+    @staticmethod
+    async def _pipe(reader: asyncio.StreamReader, link: _Link):
+        try:
+            while True:
+                await link.wait_drained()
+                data = await reader.read(65536)
+                if not data:
+                    break
+                # Segment-sized pieces so the rate cap paces smoothly
+                for offset in range(0, len(data), 1448):
+                    link.send(data[offset : offset + 1448])
+        except (ConnectionError, OSError):
+            pass
+        link.send(_CLOSE)
+
+    async def _expire_flows(self):
+        while True:
+            await asyncio.sleep(5)
+            for front in self._udp:
+                front.expire()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for server in self._servers:
+            server.close()
+        for front in self._udp:
+            front.close()
+        for link in self._links:
+            link.close()
+        self._servers.clear()
+        self._udp.clear()
+        logger.info(f"📊 Proxy stats: {self.stats}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Network impairment proxy")
+    parser.add_argument("--listen-host", default="127.0.0.1")
+    parser.add_argument("--listen-port", type=int, default=6000)
+    parser.add_argument("--target-host", default="127.0.0.1")
+    parser.add_argument("--target-port", type=int, default=5000)
+    parser.add_argument("--count", type=int, default=1, help="Consecutive ports to forward")
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-kbps", type=float, default=0.0, help="Uplink cap (0 = none)")
+    parser.add_argument("--loss", type=float, default=0.0, help="Packet loss, 0-1")
+    parser.add_argument("--loss-burst", type=float, default=1.0, help="Mean loss burst length")
+    parser.add_argument(
+        "--retransmit-ms",
+        type=float,
+        default=0.0,
+        help="Extra delay of a lost TCP segment (default: one round trip, as fast retransmit)",
+    )
+    parser.add_argument("--queue-kb", type=float, default=256.0)
+    parser.add_argument("--script", help="Timed impairment changes (see module docstring)")
+    parser.add_argument("--seed", type=int, help="Random seed for repeatable runs")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    impairment = Impairment(
+        delay_ms=args.delay_ms,
+        jitter_ms=args.jitter_ms,
+        rate_kbps=args.rate_kbps,
+        loss=args.loss,
+        loss_burst=args.loss_burst,
+        retransmit_ms=args.retransmit_ms,
+        queue_kb=args.queue_kb,
+    )
+    events = []
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            events = parse_script(f.read())
+
+    async def run():
+        proxy = ImpairmentProxy(
+            args.listen_host,
+            args.listen_port,
+            args.target_host,
+            args.target_port,
+            args.count,
+            impairment,
+        )
+        await proxy.start()
+        try:
+            if events:
+                await proxy.run_script(events)
+            await asyncio.Event().wait()
+        finally:
+            await proxy.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+
+
+if __name__ == "__main__":
+    main()
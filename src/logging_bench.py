@@ -0,0 +1,108 @@
+"""
+Logging Benchmark
+Measures what logging costs the streaming loop per frame: the old setup
+(root at DEBUG with a synchronous FileHandler, eager f-strings) against
+the queued one from server.logconfig (background writer thread, rate
+limiting of opted-in hot call sites, lazy formatting).
+
+Two per-frame patterns are timed on the calling thread: a DEBUG line on
+every frame (like the audio-shape line send_audio_frame used to log) and a
+WARNING flood (like an output rejecting every frame).
+
+Usage:
+    python logging_bench.py --frames 20000
+
+Requirements:
+    pip install numpy
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from server.logconfig import LOG_FORMAT, configure_logging, rate_limited, shutdown_logging
+
+logger = logging.getLogger("server.outputs")
+
+
+def legacy_setup(log_file: Path, devnull):
+    """What vs_server_gui.setup_logging used to install"""
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+        old.close()
+    console = logging.StreamHandler(devnull)
+    console.setLevel(logging.INFO)
+    handlers = [logging.FileHandler(log_file, encoding="utf-8"), console]
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+
+
+def debug_eager(pcm: np.ndarray, frame: int):
+    logger.debug(f"Audio shape {pcm.shape} is already planar (channels, samples)")
+
+
+def debug_lazy(pcm: np.ndarray, frame: int):
+    logger.debug("Audio shape %s is already planar (channels, samples)", pcm.shape)
+
+
+def warning_flood(pcm: np.ndarray, frame: int):
+    logger.warning("⚠️ OMT rejected frame %d (error code: %d)", frame, -1, extra=rate_limited(1))
+
+
+def measure(frame, count: int) -> list[float]:
+    """Per-frame cost in microseconds"""
+    pcm = np.zeros((2, 1024), dtype=np.float32)
+    costs = []
+    for i in range(count):
+        start = time.perf_counter()
+        frame(pcm, i)
+        costs.append((time.perf_counter() - start) * 1e6)
+    return costs
+
+
+def report(name: str, costs: list[float], lines: int):
+    costs = sorted(costs)
+    print(
+        f"{name:<28} mean {statistics.fmean(costs):7.2f} µs  "
+        f"p50 {costs[len(costs) // 2]:7.2f} µs  "
+        f"p99 {costs[int(len(costs) * 0.99)]:8.2f} µs  "
+        f"max {costs[-1]:9.1f} µs  ({lines} lines written)"
+    )
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Per-frame logging cost benchmark")
+    parser.add_argument("--frames", type=int, default=20000, help="Simulated frames per setup")
+    args = parser.parse_args()
+
+    runs = [
+        ("sync file, debug f-string", False, debug_eager),
+        ("queued, debug lazy", True, debug_lazy),
+        ("sync file, warning flood", False, warning_flood),
+        ("queued, warning flood", True, warning_flood),
+    ]
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        for i, (name, queued, frame) in enumerate(runs):
+            log_file = Path(tmp) / f"run{i}.log"
+            if queued:
+                configure_logging(logging.DEBUG, log_file, logging.INFO, devnull)
+            else:
+                legacy_setup(log_file, devnull)
+            costs = measure(frame, args.frames)
+            shutdown_logging()
+            lines = sum(1 for _ in open(log_file, encoding="utf-8"))
+            report(name, costs, lines)
+
+
+if __name__ == "__main__":
+    main()
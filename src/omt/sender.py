@@ -4,15 +4,10 @@ from pathlib import Path
 import logging
 
 from omt.types import (
-    OMTMediaFrame, OMTFrameType, OMTCodec, OMTQuality, OMTVideoFlags, OMTColorSpace
+    OMTMediaFrame, OMTFrameType, OMTCodec, OMTQuality, OMTVideoFlags, OMTColorSpace, OMTTally
 )
 from constants import get_resource_path
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
 logger = logging.getLogger(__name__)
 
 class OMTSender:
@@ -53,6 +48,14 @@ class OMTSender:
         self.lib.omt_send_getaddress.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
         self.lib.omt_send_getaddress.restype = ctypes.c_int
         
+        # Tally is optional (older libomt builds don't export it)
+        try:
+            self.lib.omt_send_gettally.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(OMTTally)]
+            self.lib.omt_send_gettally.restype = ctypes.c_int
+            self.tally_supported = True
+        except AttributeError:
+            self.tally_supported = False
+        
         self.sender = None
         logger.info(f"OMT library loaded from: {lib_path_obj}")
         logger.info(f"Library search path includes: {lib_dir}")
@@ -123,6 +126,19 @@ class OMTSender:
             logger.error(f"Error sending video frame: {e}")
             return False
     
+    def get_tally(self, timeout_ms: int = 0) -> tuple[bool, bool] | None:
+        """Get (preview, program) tally state, or None if unavailable"""
+        if not self.sender or not self.tally_supported:
+            return None
+        
+        try:
+            tally = OMTTally()
+            self.lib.omt_send_gettally(self.sender, timeout_ms, ctypes.byref(tally))
+            return bool(tally.preview), bool(tally.program)
+        except Exception as e:
+            logger.debug(f"Error reading OMT tally: {e}")
+            return None
+    
     def destroy(self):
         """Destroy OMT sender"""
         if self.sender:
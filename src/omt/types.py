@@ -31,6 +31,12 @@ class OMTVideoFlags(ctypes.c_int):
     Interlaced = 1
     Alpha = 2
 
+class OMTTally(ctypes.Structure):
+    _fields_ = [
+        ("preview", ctypes.c_int),
+        ("program", ctypes.c_int),
+    ]
+
 class OMTMediaFrame(ctypes.Structure):
     _fields_ = [
         ("Type", ctypes.c_int),
@@ -13,21 +13,56 @@ Also needs:
 import argparse
 import asyncio
 import logging
+import signal
 import sys
 
 from constants import get_resource_path
 from server.bridge import OMTBridgeServer
-
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from server.flightrecorder import dump_all
+from server.handover import DEFAULT_HANDOVER_PATH
+from server.logconfig import configure_logging
 
 logger = logging.getLogger(__name__)
 
 
+def find_omt_library() -> str | None:
+    """Path of the bundled OMT library, or None (logged) when it is missing"""
+    lib_file = "libomt.dll" if sys.platform == "win32" else "libomt.so"
+
+    # Look for library in the libraries folder
+    lib_path = get_resource_path(f"libraries/{lib_file}")
+
+    if not lib_path.exists():
+        logger.error(f"OMT library not found: {lib_path}")
+        logger.error(f"Please ensure {lib_file} is in the libraries/ folder")
+        return None
+
+    return str(lib_path)
+
+
+def install_signal_handlers(server: OMTBridgeServer, profile_rate: float):
+    """Wire the trace and profiler signals into the running loop"""
+
+    def toggle_profiling():
+        if server.profiler and server.profiler.running:
+            server.stop_profiling()
+        else:
+            server.start_profiling(profile_rate)
+
+    loop = asyncio.get_running_loop()
+    if server.tracer and hasattr(signal, "SIGUSR1"):
+        # kill -USR1 <pid> dumps the frame trace on demand
+        loop.add_signal_handler(signal.SIGUSR1, server.dump_trace)
+    if hasattr(signal, "SIGUSR2"):
+        # kill -USR2 <pid> starts profiling; the next one stops and writes the profile
+        loop.add_signal_handler(signal.SIGUSR2, toggle_profiling)
+
+
 def main():
     """Main entry point"""
+    # Log writing happens on a background thread, rate limited per call site
+    configure_logging()
+
     parser = argparse.ArgumentParser(
         description="Mobile Camera Bridge - OMT/Native Camera Streaming"
     )
@@ -42,40 +77,98 @@ def main():
     parser.add_argument(
         "--bind-ip",
         type=str,
-        help="Specific IP address to bind to (e.g., 192.168.1.100)",
+        help="Specific IP address to bind to, or several comma-separated (e.g., 192.168.1.100)",
     )
     parser.add_argument(
         "--camera-count",
         type=int,
         default=4,
-        help="Number of cameras, up to 8 (e.g., 4)",
+        help="Number of cameras, up to 8, or more with --single-port (e.g., 4)",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        help="Event loop threads to spread cameras over (default: 1 for up to 8 cameras, more above)",
+    )
+    parser.add_argument(
+        "--single-port",
+        action="store_true",
+        help="Accept all cameras on port 5000; phones pick a slot in the handshake",
+    )
+    parser.add_argument(
+        "--udp",
+        action="store_true",
+        help="Also accept the UDP transport (FEC + retransmission) on the camera ports",
+    )
+    parser.add_argument(
+        "--multi-nic",
+        action="store_true",
+        help="Also listen on every other usable interface so phones can fail over",
+    )
+    parser.add_argument(
+        "--handover",
+        nargs="?",
+        const=DEFAULT_HANDOVER_PATH,
+        metavar="PATH",
+        help="Zero-downtime upgrade: take over the sockets and phones of the server "
+        "waiting on this Unix socket, then wait there in turn; its directory must be "
+        f"private to this user (default {DEFAULT_HANDOVER_PATH})",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on /metrics and a health check on /healthz",
+    )
+    parser.add_argument(
+        "--metrics-bind",
+        default="127.0.0.1",
+        help="Address for the metrics endpoint (default: local only; the /profile "
+        "control routes are refused unless it is a loopback address)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Trace each frame's stages; dumps a Chrome/Perfetto trace on latency "
+        "spikes and on SIGUSR1",
+    )
+    parser.add_argument(
+        "--trace-spike-ms",
+        type=float,
+        default=100.0,
+        help="Received-to-sent latency that triggers an automatic trace dump",
+    )
+    parser.add_argument(
+        "--profile-rate",
+        type=float,
+        default=100.0,
+        help="Sampling profiler rate in Hz; SIGUSR2 starts the profiler and writes a "
+        "speedscope profile on the next one",
     )
     args = parser.parse_args()
 
     output_type = "native" if args.native_camera else "omt"
 
+    lib_path_full = ""
     if output_type == "omt":
-        if sys.platform == "win32":
-            lib_file = "libomt.dll"
-        else:
-            lib_file = "libomt.so"
-
-        # Look for library in the libraries folder
-        lib_path = get_resource_path(f"libraries/{lib_file}")
-
-        if not lib_path.exists():
-            logger.error(f"OMT library not found: {lib_path}")
-            logger.error(f"Please ensure {lib_file} is in the libraries/ folder")
+        lib_path_full = find_omt_library()
+        if lib_path_full is None:
             return
 
-        lib_path_full = str(lib_path)
-    else:
-        lib_path_full = ""
-
     server = OMTBridgeServer(
         output_type=output_type,
         omt_lib_path=lib_path_full,
         bind_ip=args.bind_ip,  # Allow specifying bind IP
+        single_port=args.single_port,
+        shards=args.shards,
+        udp=args.udp,
+        multi_nic=args.multi_nic,
+        handover=args.handover,
+        metrics_port=args.metrics_port,
+        metrics_bind=args.metrics_bind,
+        trace=args.trace,
+        trace_spike_ms=args.trace_spike_ms,
     )
 
     from server.config import StreamConfig
@@ -92,10 +185,17 @@ def main():
         )
         server.configs.append(config)
 
+    async def run():
+        install_signal_handlers(server, args.profile_rate)
+        await server.start()
+
     try:
-        asyncio.run(server.start())
+        asyncio.run(run())
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
+    except Exception:
+        dump_all("crash")
+        raise
 
 
 if __name__ == "__main__":
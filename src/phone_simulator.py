@@ -0,0 +1,546 @@
+"""
+Phone Simulator
+Streams a synthetic H.264 test pattern (and optionally an AAC tone, on the
+shared connection or a separate audio lane) to the bridge server using the
+phone protocol, for local testing without a device.
+
+Implements the phone side of the downstream control channel: answers clock
+sync pings (so glass-to-glass latency can be measured), logs bitrate and
+slot messages, and keeps the session token so --reconnect-every can test
+session resumption and --failover can move to another server path.
+
+Requirements:
+    pip install av numpy
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import struct
+import time
+
+import av
+import numpy as np
+from av.video.frame import PictureType
+
+from server.udp import (
+    KIND_NACK,
+    UdpPacket,
+    UdpPacketizer,
+    UdpReassembler,
+    encode_nack,
+    set_receive_buffer,
+)
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+FRAME_TYPE_VIDEO = 0x01
+FRAME_TYPE_AUDIO = 0x02
+FRAME_TYPE_CONFIG = 0x03
+FRAME_TYPE_METADATA = 0x04
+
+FLAG_KEY_FRAME = 0x1
+FLAG_CODEC_CONFIG = 0x2
+
+AUDIO_SAMPLE_RATE = 48000
+AAC_FRAME_SAMPLES = 1024
+
+TICKS_PER_SECOND = 1_000_000  # Capture timestamps in microseconds, like Android PTS
+
+
+class UdpPhoneTransport(asyncio.DatagramProtocol):
+    """Phone side of the UDP transport, with optional random packet loss"""
+
+    def __init__(self, loss: float = 0.0):
+        self.loss = loss
+        self.packetizer = UdpPacketizer()
+        self.reassembler = UdpReassembler()
+        self.reader = asyncio.StreamReader()  # Server → phone raw stream bytes
+        self.transport: asyncio.DatagramTransport | None = None
+        self.dropped = 0
+        self._ticker: asyncio.Task | None = None
+
+    def connection_made(self, transport):
+        self.transport = transport  # type: ignore
+        set_receive_buffer(transport)
+        self._ticker = asyncio.get_running_loop().create_task(self._tick())
+
+    def connection_lost(self, exc):
+        self.reader.feed_eof()
+
+    def _send(self, packet: bytes):
+        if self.loss and random.random() < self.loss:
+            self.dropped += 1
+            return
+        self.transport.sendto(packet)  # type: ignore
+
+    def send_frame(
+        self, frame_type: int, flags: int, timestamp: int, payload: bytes, copies: int = 1
+    ):
+        packets = self.packetizer.packetize(frame_type, flags, timestamp, payload)
+        for _ in range(copies):
+            for packet in packets:
+                self._send(packet)
+
+    def datagram_received(self, data: bytes, addr):
+        if self.loss and random.random() < self.loss:
+            self.dropped += 1
+            return
+        packet = UdpPacket.parse(data)
+        if packet is not None and packet.kind == KIND_NACK:
+            count = len(packet.payload) // 4
+            seqs = struct.unpack(f">{count}I", packet.payload[: count * 4])
+            for resend in self.packetizer.retransmit(list(seqs)):
+                self._send(resend)
+            return
+        self.reassembler.on_datagram(data, time.time())
+        self._pump()
+
+    def _pump(self):
+        frames, nacks = self.reassembler.poll(time.time())
+        for frame in frames:
+            self.reader.feed_data(frame.payload)
+        if nacks:
+            self._send(encode_nack(nacks))
+
+    async def _tick(self):
+        while True:
+            await asyncio.sleep(0.02)
+            self._pump()
+
+    def close(self):
+        if self._ticker:
+            self._ticker.cancel()
+        if self.transport:
+            self.transport.close()
+
+
+class SimulatedPhone:
+    """One simulated camera: config handshake, paced video, control replies"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.writer: asyncio.StreamWriter | None = None
+        self.audio_writer: asyncio.StreamWriter | None = None  # Separate lane, once open
+        self.udp: UdpPhoneTransport | None = None
+        self.frames_sent = 0
+        self.bitrate = args.bitrate
+        self.reader: asyncio.StreamReader | None = None  # Current control stream
+        self.session_token: str | None = None
+        self.host = args.host  # Current server path
+        self.server_paths: list[str] = []  # Alternatives offered by the server
+        self.force_keyframe = False
+        self._reconnected_at: float | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._control_done: asyncio.Future | None = None  # Current connection ended
+        self._abandoned: list[asyncio.StreamWriter] = []
+
+    def now_ticks(self) -> int:
+        """Phone clock: wall clock shifted by --clock-offset"""
+        return int((time.time() + self.args.clock_offset) * TICKS_PER_SECOND)
+
+    def write_frame(
+        self,
+        frame_type: int,
+        payload: bytes,
+        flags: int = 0,
+        timestamp: int | None = None,
+        writer: asyncio.StreamWriter | None = None,
+    ):
+        timestamp = self.now_ticks() if timestamp is None else timestamp
+        if self.udp:
+            self.udp.send_frame(frame_type, flags, timestamp, payload)
+            return
+
+        writer = writer or self.writer
+        if writer is None or writer.is_closing():
+            return  # Between paths (failing over) or closed; the frame is lost
+        header = bytes([frame_type]) + struct.pack(">IIQ", len(payload), flags, timestamp)
+        writer.write(header + payload)
+
+    def config_json(self) -> bytes:
+        config = {
+            "video": {
+                "width": self.args.width,
+                "height": self.args.height,
+                "fps": self.args.fps,
+                "bitrate": self.bitrate,
+            },
+            "audio": {
+                "enabled": self.args.audio,
+                "sampleRate": AUDIO_SAMPLE_RATE,
+                "channels": 2,
+                "bitrate": 128000,
+                "lane": "separate"
+                if self.args.audio_lane and not self.args.udp
+                else "shared",
+            },
+            "device": {
+                "model": "Simulator",
+                "id": self.args.device_id,
+                "batteryPercent": 100,
+            },
+        }
+        if self.args.slot:
+            config["slot"] = self.args.slot
+        if self.session_token:
+            config["resume"] = self.session_token
+
+        return json.dumps(config).encode("utf-8")
+
+    def create_encoder(self) -> av.CodecContext:
+        encoder = av.CodecContext.create("libx264", "w")
+        encoder.width = self.args.width
+        encoder.height = self.args.height
+        encoder.pix_fmt = "yuv420p"
+        encoder.framerate = self.args.fps
+        encoder.bit_rate = self.bitrate
+        encoder.gop_size = self.args.fps * 2
+        encoder.options = {"preset": "ultrafast", "tune": "zerolatency"}
+        return encoder
+
+    def test_pattern(self, index: int) -> av.VideoFrame:
+        """Moving gradient with a frame-counter bar, cheap to generate"""
+        h, w = self.args.height, self.args.width
+        x = (np.arange(w, dtype=np.uint16) + index * 4) % 256
+        image = np.empty((h, w, 3), dtype=np.uint8)
+        image[:, :, 0] = x[None, :]
+        image[:, :, 1] = (np.arange(h, dtype=np.uint16)[:, None] + index) % 256
+        image[:, :, 2] = 128
+        bar = (index * 8) % w
+        image[h // 2 - 8 : h // 2 + 8, bar : bar + 16] = 255
+        return av.VideoFrame.from_ndarray(image, format="rgb24")
+
+    def watch_control(self, reader: asyncio.StreamReader):
+        """Read control messages; only the current connection ending ends the run"""
+        task = asyncio.create_task(self.read_control(reader))
+        self._tasks.add(task)
+
+        def finished(task: asyncio.Task):
+            self._tasks.discard(task)
+            error = None if task.cancelled() else task.exception()
+            done = self._control_done
+            if task.cancelled() or reader is not self.reader or not done or done.done():
+                return  # Abandoned connection closed by the server; expected
+            if error and self.args.failover and self.session_token and not self.udp:
+                self.writer = None
+                failover = asyncio.create_task(self.fail_over(error))
+                self._tasks.add(failover)
+                failover.add_done_callback(self._tasks.discard)
+                return
+            if error:
+                done.set_exception(error)
+            else:
+                done.set_result(None)
+
+        task.add_done_callback(finished)
+
+    async def read_control(self, reader: asyncio.StreamReader):
+        """Handle server → phone messages"""
+        while True:
+            header = await reader.readexactly(17)
+            if header.startswith(b"ERROR"):
+                rest = await reader.readline()
+                logger.error(f"Server rejected us: {(header + rest).decode().strip()}")
+                return
+
+            frame_type = header[0]
+            size, _, _ = struct.unpack(">IIQ", header[1:])
+            payload = await reader.readexactly(size)
+            if frame_type != FRAME_TYPE_METADATA:
+                continue
+
+            t1 = self.now_ticks()
+            self.handle_control(json.loads(payload.decode("utf-8")), t1)
+
+    def handle_control(self, message: dict, t1: int):
+        """Act on one control message; t1 is when it arrived"""
+        kind = message.get("type")
+
+        if kind == "ping":
+            pong = {
+                "type": "pong",
+                "id": message.get("id"),
+                "t1": t1,
+                "t2": self.now_ticks(),
+                "ticksPerSecond": TICKS_PER_SECOND,
+            }
+            self.write_frame(FRAME_TYPE_METADATA, json.dumps(pong).encode("utf-8"))
+        elif kind == "setBitrate":
+            self.bitrate = int(message.get("bitrate", self.bitrate))
+            logger.info(f"📶 Server requested {self.bitrate / 1_000_000:.1f} Mbps")
+        elif kind == "audioLane":
+            asyncio.create_task(self.open_audio_lane(message.get("token")))
+        elif kind == "requestKeyframe":
+            self.force_keyframe = True
+            logger.info("🔑 Server requested a keyframe")
+        elif kind == "portChanged":
+            # Our camera moved; the next (re)connection goes to the new port
+            self.args.port = int(message.get("port", self.args.port))
+            logger.info(f"🔀 Server moved this camera to port {self.args.port}")
+        elif kind == "slotAssigned":
+            logger.info(f"🎰 Assigned camera slot {message.get('slot')}")
+        elif kind == "session":
+            self.on_session(message)
+        else:
+            logger.info(f"Control message: {message}")
+
+    def on_session(self, message: dict):
+        """Remember the session token and report how fast a reconnection resumed"""
+        self.session_token = message.get("token")
+        self.server_paths = message.get("paths", self.server_paths)
+        if self._reconnected_at is not None:
+            elapsed = (time.perf_counter() - self._reconnected_at) * 1000
+            logger.info(
+                f"{'♻️ Session resumed' if message.get('resumed') else '🆕 New session'}"
+                f" {elapsed:.0f}ms after reconnecting"
+            )
+            self._reconnected_at = None
+
+    async def open_audio_lane(self, token: str):
+        """Second connection carrying only audio, bound by the server's token"""
+        _, writer = await asyncio.open_connection(self.host, self.args.port)
+        payload = json.dumps({"lane": "audio", "token": token}).encode("utf-8")
+        writer.write(bytes([FRAME_TYPE_CONFIG]) + struct.pack(">I", len(payload)) + payload)
+        await writer.drain()
+        self.audio_writer = writer
+        logger.info("🎧 Audio lane open")
+
+    async def stream_audio(self):
+        """440 Hz AAC tone, one frame every 1024 samples"""
+        encoder = av.CodecContext.create("aac", "w")
+        encoder.sample_rate = AUDIO_SAMPLE_RATE
+        encoder.layout = "stereo"
+        encoder.format = "fltp"
+        encoder.bit_rate = 128000
+        encoder.open()
+        self.write_frame(FRAME_TYPE_AUDIO, bytes(encoder.extradata), FLAG_CODEC_CONFIG)
+
+        interval = AAC_FRAME_SAMPLES / AUDIO_SAMPLE_RATE
+        start = time.perf_counter()
+        index = 0
+        while True:
+            capture_ticks = self.now_ticks()
+            t = (np.arange(AAC_FRAME_SAMPLES) + index * AAC_FRAME_SAMPLES) / AUDIO_SAMPLE_RATE
+            tone = (0.2 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+            frame = av.AudioFrame.from_ndarray(
+                np.stack([tone, tone]), format="fltp", layout="stereo"
+            )
+            frame.sample_rate = AUDIO_SAMPLE_RATE
+            frame.pts = index * AAC_FRAME_SAMPLES
+
+            for packet in encoder.encode(frame):
+                self.write_frame(
+                    FRAME_TYPE_AUDIO,
+                    bytes(packet),
+                    timestamp=capture_ticks,
+                    writer=self.audio_writer,
+                )
+
+            index += 1
+            delay = start + index * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def stream_video(self):
+        encoder = self.create_encoder()
+        interval = 1.0 / self.args.fps
+        start = time.perf_counter()
+        index = 0
+
+        while self.args.duration <= 0 or index < self.args.duration * self.args.fps:
+            # Capture timestamp is taken before encoding, like a real camera
+            capture_ticks = self.now_ticks()
+            frame = self.test_pattern(index)
+            frame.pts = index
+            if self.force_keyframe:
+                # The tail of the old connection may be lost; restart the GOP
+                frame.pict_type = PictureType.I
+                self.force_keyframe = False
+
+            for packet in encoder.encode(frame):
+                payload = bytes(packet)
+                flags = FLAG_KEY_FRAME if packet.is_keyframe else 0
+                self.write_frame(FRAME_TYPE_VIDEO, payload, flags, capture_ticks)
+                self.frames_sent += 1
+
+            if self.writer:
+                try:
+                    await self.writer.drain()
+                except ConnectionError:
+                    pass  # Reported by the control reader
+
+            if self.frames_sent and self.frames_sent % (self.args.fps * 5) == 0:
+                logger.info(f"📤 Sent {self.frames_sent} frames")
+
+            index += 1
+            delay = start + index * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def connect(self) -> asyncio.StreamReader:
+        config = self.config_json()
+
+        if self.args.udp:
+            _, self.udp = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: UdpPhoneTransport(self.args.loss),
+                remote_addr=(self.host, self.args.port),
+            )
+            # Sent twice: the server can't NACK a session that doesn't exist yet
+            self.udp.send_frame(FRAME_TYPE_CONFIG, 0, 0, config, copies=2)
+            return self.udp.reader
+
+        reader, self.writer = await asyncio.open_connection(self.host, self.args.port)
+        self.writer.write(
+            bytes([FRAME_TYPE_CONFIG]) + struct.pack(">I", len(config)) + config
+        )
+        await self.writer.drain()
+        self.reader = reader
+        return reader
+
+    async def fail_over(self, error: BaseException, attempts: int = 10):
+        """Resume the session on another server path (or this one, once it's back)"""
+        candidates = [path for path in self.server_paths if path != self.host]
+        candidates.append(self.host)
+        logger.warning(f"📵 Connection via {self.host} lost; trying {', '.join(candidates)}")
+
+        self._reconnected_at = time.perf_counter()
+        for _ in range(attempts):
+            for host in candidates:
+                try:
+                    self.host = host
+                    reader = await asyncio.wait_for(self.connect(), timeout=2.0)
+                except (OSError, asyncio.TimeoutError):
+                    continue
+                self.force_keyframe = True
+                self.watch_control(reader)
+                logger.info(f"🔀 Failed over to {host}")
+                return
+            await asyncio.sleep(0.5)
+
+        if self._control_done and not self._control_done.done():
+            self._control_done.set_exception(error)
+
+    async def reconnect_periodically(self):
+        """
+        Simulate a Wi-Fi roam: open a new connection presenting the session
+        token and abandon the old one without closing it, like a phone whose
+        old path silently died. The server should take over at once.
+        """
+        while True:
+            await asyncio.sleep(self.args.reconnect_every)
+            self._abandoned.append(self.writer)  # type: ignore
+            self._reconnected_at = time.perf_counter()
+            reader = await self.connect()
+            self.force_keyframe = True
+            self.watch_control(reader)
+            logger.info(
+                f"🔁 Reconnected (resume token {'sent' if self.session_token else 'missing'}); "
+                f"old connection left open"
+            )
+
+    async def run(self):
+        reader = await self.connect()
+        logger.info(
+            f"📱 Connected to {self.host}:{self.args.port} over "
+            f"{'UDP' if self.udp else 'TCP'} "
+            f"({self.args.width}x{self.args.height}@{self.args.fps}fps)"
+        )
+
+        self._control_done = asyncio.get_running_loop().create_future()
+        self.watch_control(reader)
+        tasks = [self._control_done, asyncio.create_task(self.stream_video())]
+        if self.args.audio:
+            tasks.append(asyncio.create_task(self.stream_audio()))
+        if self.args.reconnect_every and not self.udp:
+            tasks.append(asyncio.create_task(self.reconnect_periodically()))
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.info("📵 Server closed the connection")
+        finally:
+            for task in [*tasks, *self._tasks]:
+                task.cancel()
+            for writer in self._abandoned:
+                writer.close()
+            if self.audio_writer:
+                self.audio_writer.close()
+            if self.udp:
+                logger.info(
+                    f"📦 UDP: {self.udp.dropped} packets lost (simulated), "
+                    f"{self.udp.packetizer.retransmitted} retransmitted"
+                )
+                self.udp.close()
+            else:
+                self.writer.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Simulated phone camera")
+    parser.add_argument("--host", default="127.0.0.1", help="Bridge server address")
+    parser.add_argument("--port", type=int, default=5000, help="Camera port")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--bitrate", type=int, default=4_000_000)
+    parser.add_argument(
+        "--duration", type=float, default=0, help="Seconds to stream (0 = forever)"
+    )
+    parser.add_argument(
+        "--clock-offset",
+        type=float,
+        default=0.0,
+        help="Seconds added to the simulated phone clock (tests clock sync)",
+    )
+    parser.add_argument("--slot", type=int, default=0, help="Camera slot (single-port)")
+    parser.add_argument("--device-id", default="simulator-1")
+    parser.add_argument("--audio", action="store_true", help="Also send an AAC tone")
+    parser.add_argument(
+        "--audio-lane",
+        action="store_true",
+        help="Ask for a separate audio connection (with --audio)",
+    )
+    parser.add_argument(
+        "--udp", action="store_true", help="Use the UDP transport (FEC + NACK)"
+    )
+    parser.add_argument(
+        "--loss",
+        type=float,
+        default=0.0,
+        help="Random UDP packet loss to inject, 0-1 (with --udp)",
+    )
+    parser.add_argument(
+        "--reconnect-every",
+        type=float,
+        default=0,
+        help="Seconds between simulated roams that reconnect with the session token (TCP)",
+    )
+    parser.add_argument(
+        "--failover",
+        action="store_true",
+        help="On disconnect, resume the session on another server path (TCP)",
+    )
+    return parser
+
+
+def main():
+    """Main entry point"""
+    args = build_parser().parse_args()
+
+    try:
+        asyncio.run(SimulatedPhone(args).run())
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+
+
+if __name__ == "__main__":
+    main()
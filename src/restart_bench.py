@@ -0,0 +1,190 @@
+"""
+Restart Benchmark
+Measures how long the bridge server takes from stop() to listening again
+while simulated phones are connected and streaming, i.e. the dead time a
+"restart server" costs an operator.
+
+The phones run on their own event loop thread so their H.264 encoding
+doesn't skew the server's timings. Uses the native output, so no OMT
+library is needed.
+
+Usage:
+    python restart_bench.py --phones 8 --rounds 5
+
+Requirements:
+    pip install av numpy
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import logging
+import statistics
+import threading
+import time
+
+from phone_simulator import SimulatedPhone, build_parser
+from server.bridge import OMTBridgeServer
+from server.config import StreamConfig
+from server.logconfig import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+class PhoneFleet:
+    """Simulated phones on a separate event loop thread"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="phones", daemon=True
+        )
+        self.runs: list[concurrent.futures.Future] = []
+
+    def start(self):
+        self.thread.start()
+
+    def connect(self):
+        """Start one phone per camera; they run until the server drops them"""
+        for i in range(self.args.phones):
+            port = self.args.port if self.args.single_port else self.args.port + i
+            phone_args = build_parser().parse_args(
+                [
+                    "--host", self.args.host,
+                    "--port", str(port),
+                    "--slot", str(i + 1 if self.args.single_port else 0),
+                    "--device-id", f"bench-{i + 1}",
+                    "--width", str(self.args.width),
+                    "--height", str(self.args.height),
+                    "--fps", str(self.args.fps),
+                    "--bitrate", "1000000",
+                ]
+            )
+            self.runs.append(
+                asyncio.run_coroutine_threadsafe(self._run(phone_args), self.loop)
+            )
+
+    async def _run(self, phone_args: argparse.Namespace):
+        try:
+            await SimulatedPhone(phone_args).run()
+        except Exception as e:
+            logger.debug(f"Phone {phone_args.device_id} ended: {e}")
+
+    def wait_disconnected(self, timeout: float = 5.0):
+        concurrent.futures.wait(self.runs, timeout=timeout)
+        self.runs.clear()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2.0)
+
+
+def make_server(args: argparse.Namespace) -> OMTBridgeServer:
+    server = OMTBridgeServer(
+        "native", bind_ip=args.host, single_port=args.single_port, shards=args.shards
+    )
+    server.configs = [
+        StreamConfig(
+            i + 1, args.port + i, f"Bench Camera {i + 1}", args.width, args.height, args.fps
+        )
+        for i in range(args.phones)
+    ]
+    return server
+
+
+async def start_server(args: argparse.Namespace) -> tuple[OMTBridgeServer, asyncio.Task]:
+    server = make_server(args)
+    task = asyncio.create_task(server.start())
+    await server.listening.wait()
+    return server, task
+
+
+async def wait_streaming(server: OMTBridgeServer, phones: int, timeout: float = 15.0):
+    """Until every camera has a connection that is delivering video"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        handlers = list(server.active_handlers.values())
+        if len(handlers) == phones and all(h.bytes_received > 0 for h in handlers):
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError(
+        f"only {len(server.active_handlers)}/{phones} phones streaming after {timeout:.0f} s"
+    )
+
+
+async def bench(args: argparse.Namespace, fleet: PhoneFleet) -> list[tuple[float, float]]:
+    results = []
+    server, task = await start_server(args)
+    try:
+        for round_number in range(1, args.rounds + 1):
+            fleet.connect()
+            await wait_streaming(server, args.phones)
+            await asyncio.sleep(args.stream_seconds)
+
+            began = time.perf_counter()
+            await server.stop()
+            await task
+            stopped = time.perf_counter()
+            server, task = await start_server(args)
+            listening = time.perf_counter()
+
+            stop_ms = (stopped - began) * 1000
+            restart_ms = (listening - began) * 1000
+            results.append((stop_ms, restart_ms))
+            logger.warning(
+                f"⏱️ Round {round_number}: stopped in {stop_ms:.1f} ms, "
+                f"listening again after {restart_ms:.1f} ms"
+            )
+            await asyncio.to_thread(fleet.wait_disconnected)
+    finally:
+        await server.stop()
+        await task
+    return results
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Bridge server restart benchmark")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind and connect")
+    parser.add_argument("--port", type=int, default=5600, help="First camera port")
+    parser.add_argument("--phones", type=int, default=8, help="Simulated phones")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument(
+        "--stream-seconds", type=float, default=1.0, help="Streaming time before each stop"
+    )
+    parser.add_argument("--single-port", action="store_true")
+    parser.add_argument("--shards", type=int, default=1, help="Server loop shards")
+    parser.add_argument(
+        "--budget-ms", type=float, default=100.0, help="Fail if any restart takes longer"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Keep server/phone logs")
+    args = parser.parse_args()
+
+    # Per-connection logging would dominate the numbers unless asked for
+    level = logging.INFO if args.verbose else logging.WARNING
+    configure_logging(level, console_level=level)
+
+    fleet = PhoneFleet(args)
+    fleet.start()
+    try:
+        results = asyncio.run(bench(args, fleet))
+    finally:
+        fleet.stop()
+
+    restarts = sorted(restart_ms for _, restart_ms in results)
+    stops = sorted(stop_ms for stop_ms, _ in results)
+    print(
+        f"{args.phones} phones, {len(results)} rounds: "
+        f"stop median {statistics.median(stops):.1f} ms, "
+        f"stop → listening median {statistics.median(restarts):.1f} ms, "
+        f"max {restarts[-1]:.1f} ms (budget {args.budget_ms:.0f} ms)"
+    )
+    raise SystemExit(0 if restarts[-1] <= args.budget_ms else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import logging
+import secrets
+from collections import deque
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Config JSON value for audio.lane requesting a dedicated audio connection
+AUDIO_LANE_SEPARATE = "separate"
+
+
+def new_lane_token() -> str:
+    """Token the phone presents on its audio connection to bind it to a camera"""
+    return secrets.token_hex(8)
+
+
+@dataclass
+class _BufferedAudio:
+    data: bytes
+    flags: int
+    timestamp: int
+    arrival: float
+    play_at: float
+
+
+class AudioJitterBuffer:
+    """
+    Small playout buffer for the audio lane.
+
+    Frames are released ``target_delay`` after the time their sender
+    timestamp says they should arrive, measured from the first frame, so
+    short bursts come out evenly spaced. The delay adapts to the observed
+    lateness (about 2x smoothed jitter, clamped). Frames that come in after
+    their playout time go straight out, and the buffer never holds more than
+    ``max_frames``.
+    """
+
+    def __init__(
+        self,
+        min_delay: float = 0.02,
+        max_delay: float = 0.2,
+        max_frames: int = 50,
+    ):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_frames = max_frames
+
+        self.target_delay = min_delay
+        self.jitter = 0.0
+        self.late = 0
+        self.dropped = 0
+
+        self._frames: deque[_BufferedAudio] = deque()
+        self._base: tuple[int, float] | None = None  # (sender ts, arrival)
+        self._ticks_per_second: float | None = None
+
+    def set_clock(self, ticks_per_second: float | None):
+        """Sender timestamp unit (from frame telemetry); until known, pass-through"""
+        self._ticks_per_second = ticks_per_second
+
+    def reset(self):
+        self._frames.clear()
+        self._base = None
+        self.target_delay = self.min_delay
+        self.jitter = 0.0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def push(self, data: bytes, flags: int, timestamp: int, arrival: float):
+        play_at = arrival
+        tps = self._ticks_per_second
+
+        if tps and timestamp > 0 and not flags & 0x2:
+            if self._base is None:
+                self._base = (timestamp, arrival)
+            expected = self._base[1] + (timestamp - self._base[0]) / tps
+
+            # Lateness vs. the earliest path we've seen; re-anchor if earlier
+            lateness = arrival - expected
+            if lateness < 0:
+                self._base = (timestamp, arrival)
+                lateness = 0.0
+                expected = arrival
+            else:
+                # Creep the anchor forward so sender clock drift doesn't read as jitter
+                self._base = (self._base[0], self._base[1] + lateness / 1024)
+            self.jitter += (lateness - self.jitter) / 16  # RFC 3550 smoothing
+            self.target_delay = min(
+                max(2 * self.jitter, self.min_delay), self.max_delay
+            )
+            play_at = expected + self.target_delay
+            if play_at < arrival:
+                self.late += 1
+                play_at = arrival
+
+        self._frames.append(_BufferedAudio(data, flags, timestamp, arrival, play_at))
+        while len(self._frames) > self.max_frames:
+            self._frames.popleft()
+            self.dropped += 1
+
+    def next_due(self) -> float | None:
+        return self._frames[0].play_at if self._frames else None
+
+    def pop_ready(self, now: float) -> list[_BufferedAudio]:
+        """Frames whose playout time has come, in arrival order"""
+        ready = []
+        while self._frames and self._frames[0].play_at <= now:
+            ready.append(self._frames.popleft())
+        return ready
@@ -0,0 +1,365 @@
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# H.264 NAL unit types (ITU-T H.264 Table 7-1)
+NAL_SLICE = 1
+NAL_IDR = 5
+NAL_SEI = 6
+NAL_SPS = 7
+NAL_PPS = 8
+NAL_AUD = 9
+
+NAL_TYPE_NAMES = {
+    NAL_SLICE: "non-IDR",
+    NAL_IDR: "IDR",
+    NAL_SEI: "SEI",
+    NAL_SPS: "SPS",
+    NAL_PPS: "PPS",
+    NAL_AUD: "AUD",
+}
+
+PROFILE_NAMES = {
+    66: "Baseline",
+    77: "Main",
+    88: "Extended",
+    100: "High",
+    110: "High 10",
+    122: "High 4:2:2",
+    244: "High 4:4:4",
+}
+
+# Profiles that carry chroma_format_idc / bit depth / scaling lists in the SPS
+_HIGH_PROFILES = {100, 110, 122, 244, 44, 83, 86, 118, 128, 138, 139, 134, 135}
+
+
+@dataclass
+class SPSInfo:
+    """Fields parsed from a sequence parameter set"""
+
+    profile_idc: int
+    level_idc: int
+    width: int
+    height: int
+    chroma_format_idc: int = 1
+
+    @property
+    def profile_name(self) -> str:
+        return PROFILE_NAMES.get(self.profile_idc, f"Profile {self.profile_idc}")
+
+    @property
+    def level(self) -> float:
+        return self.level_idc / 10
+
+
+@dataclass
+class AccessUnitInfo:
+    """Classification of a single video payload"""
+
+    nal_types: list[int] = field(default_factory=list)
+    size: int = 0
+    is_idr: bool = False
+    has_sps: bool = False
+    has_pps: bool = False
+    has_sei: bool = False
+    max_ref_idc: int = 0  # Highest nal_ref_idc among slice NAL units
+
+    @property
+    def is_reference(self) -> bool:
+        return self.max_ref_idc > 0
+
+    @property
+    def is_droppable(self) -> bool:
+        """True for non-reference slices that no other frame depends on"""
+        return (
+            not self.is_reference and not self.is_idr and not self.is_config_only
+        ) and any(t in (NAL_SLICE, NAL_IDR) for t in self.nal_types)
+
+    @property
+    def is_config_only(self) -> bool:
+        return bool(self.nal_types) and all(
+            t in (NAL_SPS, NAL_PPS, NAL_SEI, NAL_AUD) for t in self.nal_types
+        )
+
+
+@dataclass
+class GOPStats:
+    """Summary of a closed group of pictures"""
+
+    frames: int
+    bytes: int
+    bitrate: float  # bits per second, derived from frame count and fps
+
+
+class _BitReader:
+    """Minimal MSB-first bit reader with Exp-Golomb support"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def u(self, n: int) -> int:
+        value = 0
+        for _ in range(n):
+            byte = self.data[self.pos >> 3]
+            value = (value << 1) | ((byte >> (7 - (self.pos & 7))) & 1)
+            self.pos += 1
+        return value
+
+    def ue(self) -> int:
+        zeros = 0
+        while self.u(1) == 0:
+            zeros += 1
+            if zeros > 31:
+                raise ValueError("Invalid Exp-Golomb code")
+        return (1 << zeros) - 1 + self.u(zeros)
+
+    def se(self) -> int:
+        k = self.ue()
+        return (k + 1) // 2 if k & 1 else -(k // 2)
+
+
+def find_start_codes(buf: np.ndarray) -> np.ndarray:
+    """Return offsets of the first NAL header byte after each 00 00 01 start code"""
+    if buf.size < 4:
+        return np.empty(0, dtype=np.intp)
+
+    # Look for the 0x01 first (rare in compressed data), then confirm the zeros
+    ones = np.flatnonzero(buf[2:] == 1)
+    if ones.size == 0:
+        return ones
+    mask = (buf[ones] == 0) & (buf[ones + 1] == 0)
+    return ones[mask] + 3
+
+
+def split_nal_units(data: bytes) -> list[tuple[int, int]]:
+    """Split an Annex-B or AVCC payload into (offset, length) NAL unit spans"""
+    # A 4-byte start code can't be a sane AVCC length; anything else might be
+    if not data.startswith(b"\x00\x00\x00\x01"):
+        spans = _split_avcc(data)
+        if spans:
+            return spans
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts = find_start_codes(buf)
+    if starts.size == 0 or starts[0] > 4:
+        return []
+
+    # Annex-B: each NAL runs up to the next start code
+    spans = []
+    ends = (starts[1:] - 3).tolist() + [buf.size]
+    for start, end in zip(starts.tolist(), ends):
+        # Drop the extra zero of a 4-byte start code and any trailing zero bytes
+        while end > start and buf[end - 1] == 0:
+            end -= 1
+        if end > start:
+            spans.append((start, end - start))
+    return spans
+
+
+def _split_avcc(data: bytes) -> list[tuple[int, int]]:
+    """Split 4-byte length-prefixed NAL units, or return [] if the framing is invalid"""
+    spans = []
+    pos = 0
+    while pos + 4 <= len(data):
+        length = int.from_bytes(data[pos : pos + 4], "big")
+        pos += 4
+        if length == 0 or pos + length > len(data):
+            return []
+        spans.append((pos, length))
+        pos += length
+    return spans if pos == len(data) else []
+
+
+def remove_emulation_prevention(nal: bytes) -> bytes:
+    """Strip 0x03 emulation prevention bytes from a NAL unit payload"""
+    if b"\x00\x00\x03" not in nal:
+        return nal
+    return nal.replace(b"\x00\x00\x03", b"\x00\x00")
+
+
+def parse_sps(nal: bytes) -> SPSInfo | None:
+    """Parse profile, level and cropped resolution from an SPS NAL unit"""
+    try:
+        rbsp = remove_emulation_prevention(nal[1:])  # Skip NAL header
+        r = _BitReader(rbsp)
+
+        profile_idc = r.u(8)
+        r.u(8)  # constraint flags + reserved
+        level_idc = r.u(8)
+        r.ue()  # seq_parameter_set_id
+
+        chroma_format_idc = 1
+        separate_colour_plane = 0
+        if profile_idc in _HIGH_PROFILES:
+            chroma_format_idc, separate_colour_plane = _read_high_profile_fields(r)
+
+        r.ue()  # log2_max_frame_num_minus4
+        _skip_pic_order_cnt(r)
+
+        r.ue()  # max_num_ref_frames
+        r.u(1)  # gaps_in_frame_num_value_allowed_flag
+        pic_width_in_mbs = r.ue() + 1
+        pic_height_in_map_units = r.ue() + 1
+        frame_mbs_only_flag = r.u(1)
+        if not frame_mbs_only_flag:
+            r.u(1)  # mb_adaptive_frame_field_flag
+        r.u(1)  # direct_8x8_inference_flag
+
+        width = pic_width_in_mbs * 16
+        height = (2 - frame_mbs_only_flag) * pic_height_in_map_units * 16
+
+        if r.u(1):  # frame_cropping_flag
+            crop_left, crop_right = r.ue(), r.ue()
+            crop_top, crop_bottom = r.ue(), r.ue()
+            crop_unit_x, crop_unit_y = _crop_units(
+                chroma_format_idc, separate_colour_plane, frame_mbs_only_flag
+            )
+            width -= (crop_left + crop_right) * crop_unit_x
+            height -= (crop_top + crop_bottom) * crop_unit_y
+
+        return SPSInfo(profile_idc, level_idc, width, height, chroma_format_idc)
+
+    except (IndexError, ValueError) as e:
+        logger.debug(f"SPS parse failed: {e}")
+        return None
+
+
+def _read_high_profile_fields(r: _BitReader) -> tuple[int, int]:
+    """(chroma_format_idc, separate_colour_plane_flag); skips bit depths and scaling lists"""
+    chroma_format_idc = r.ue()
+    separate_colour_plane = r.u(1) if chroma_format_idc == 3 else 0
+    r.ue()  # bit_depth_luma_minus8
+    r.ue()  # bit_depth_chroma_minus8
+    r.u(1)  # qpprime_y_zero_transform_bypass_flag
+    if r.u(1):  # seq_scaling_matrix_present_flag
+        for i in range(8 if chroma_format_idc != 3 else 12):
+            if r.u(1):  # seq_scaling_list_present_flag
+                _skip_scaling_list(r, 16 if i < 6 else 64)
+    return chroma_format_idc, separate_colour_plane
+
+
+def _skip_scaling_list(r: _BitReader, size: int):
+    last, nxt = 8, 8
+    for _ in range(size):
+        if nxt != 0:
+            nxt = (last + r.se() + 256) % 256
+        last = nxt if nxt != 0 else last
+
+
+def _skip_pic_order_cnt(r: _BitReader):
+    pic_order_cnt_type = r.ue()
+    if pic_order_cnt_type == 0:
+        r.ue()  # log2_max_pic_order_cnt_lsb_minus4
+    elif pic_order_cnt_type == 1:
+        r.u(1)  # delta_pic_order_always_zero_flag
+        r.se()  # offset_for_non_ref_pic
+        r.se()  # offset_for_top_to_bottom_field
+        for _ in range(r.ue()):
+            r.se()
+
+
+def _crop_units(
+    chroma_format_idc: int, separate_colour_plane: int, frame_mbs_only_flag: int
+) -> tuple[int, int]:
+    """Luma samples per frame_crop_*_offset unit, horizontally and vertically"""
+    if chroma_format_idc == 0 or separate_colour_plane:
+        return 1, 2 - frame_mbs_only_flag
+    sub_width = 1 if chroma_format_idc == 3 else 2
+    sub_height = 2 if chroma_format_idc == 1 else 1
+    return sub_width, sub_height * (2 - frame_mbs_only_flag)
+
+
+class BitstreamInspector:
+    """Per-camera H.264 NAL scanner tracking SPS info and GOP statistics"""
+
+    def __init__(self, fps: int = 30, history: int = 10):
+        self.fps = fps
+        self.sps: SPSInfo | None = None
+        self.recent_gops: deque[GOPStats] = deque(maxlen=history)
+
+        self.idr_count = 0
+        self.frame_count = 0
+
+        # Currently open GOP
+        self._gop_frames = 0
+        self._gop_bytes = 0
+
+    def inspect(self, data: bytes) -> AccessUnitInfo:
+        """Classify a video payload and update GOP accounting"""
+        info = AccessUnitInfo(size=len(data))
+
+        for offset, length in split_nal_units(data):
+            nal_type = data[offset] & 0x1F
+            info.nal_types.append(nal_type)
+
+            if nal_type in (NAL_SLICE, NAL_IDR):
+                info.max_ref_idc = max(info.max_ref_idc, (data[offset] >> 5) & 0x3)
+
+            if nal_type == NAL_IDR:
+                info.is_idr = True
+            elif nal_type == NAL_SPS:
+                info.has_sps = True
+                sps = parse_sps(data[offset : offset + length])
+                if sps and sps != self.sps:
+                    logger.info(
+                        f"🧬 SPS: {sps.profile_name}@L{sps.level:.1f}, {sps.width}x{sps.height}"
+                    )
+                    self.sps = sps
+            elif nal_type == NAL_PPS:
+                info.has_pps = True
+            elif nal_type == NAL_SEI:
+                info.has_sei = True
+
+        if info.is_config_only:
+            return info
+
+        if info.is_idr:
+            self._close_gop()
+            self.idr_count += 1
+
+        self.frame_count += 1
+        self._gop_frames += 1
+        self._gop_bytes += info.size
+
+        return info
+
+    def _close_gop(self):
+        if self._gop_frames == 0:
+            return
+
+        duration = self._gop_frames / max(self.fps, 1)
+        self.recent_gops.append(
+            GOPStats(
+                frames=self._gop_frames,
+                bytes=self._gop_bytes,
+                bitrate=self._gop_bytes * 8 / duration,
+            )
+        )
+        self._gop_frames = 0
+        self._gop_bytes = 0
+
+    def reset(self):
+        """Forget GOP state (e.g. after a decoder reset or reconnect)"""
+        self._gop_frames = 0
+        self._gop_bytes = 0
+
+    @property
+    def last_gop(self) -> GOPStats | None:
+        return self.recent_gops[-1] if self.recent_gops else None
+
+    @property
+    def average_gop_length(self) -> float:
+        if not self.recent_gops:
+            return 0.0
+        return sum(g.frames for g in self.recent_gops) / len(self.recent_gops)
+
+    @property
+    def average_bitrate(self) -> float:
+        if not self.recent_gops:
+            return 0.0
+        return sum(g.bitrate for g in self.recent_gops) / len(self.recent_gops)
@@ -1,21 +1,37 @@
 import asyncio
+import base64
+import concurrent.futures
 import logging
+import os
+import socket
+import threading
+import time
 from collections import deque
 from typing import Any
 
 import netifaces
 
-from server.config import StreamConfig
+from server.config import CameraPriority, StreamConfig
 
-from .handler import PhoneStreamHandler
+from .handler import PhoneStreamHandler, encode_control
+from .flightrecorder import dump_recorders
+from .handover import HandoverChannel, HandoverListener, ListenerKey, request_handover
+from .looplag import LoopLagMonitor
+from .metrics import MetricsServer
+from .tracing import FrameTracer
+from .netwatch import NetlinkWatcher
 from .outputs import NativeWindowsOutput, OMTOutput
-
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from .paths import NetworkPath, usable_interfaces
+from .profiler import SamplingProfiler, loop_camera
+from .resources import ResourceSampler
+from .scheduler import DecodeScheduler
+from .shards import EventLoopShard, ShardPool, default_shard_count
+from .udp import UdpIngestEndpoint, start_udp_server
 
 logger = logging.getLogger(__name__)
 
+REBALANCE_INTERVAL = 30.0  # Seconds between checks for an idle camera to move between shards
+
 
 class OMTBridgeServer:
     """Main server managing multiple phone streams"""
@@ -26,6 +42,16 @@ class OMTBridgeServer:
         omt_lib_path: str = "libomt.dll",
         bind_ip: str | None = None,
         omt_quality: int = 50,
+        single_port: bool = False,
+        mux_port: int | None = None,
+        shards: int = 1,
+        udp: bool = False,
+        multi_nic: bool = False,
+        handover: str | None = None,
+        metrics_port: int | None = None,
+        metrics_bind: str = "127.0.0.1",
+        trace: bool = False,
+        trace_spike_ms: float = 100.0,
     ):
         """
         Initialize bridge server
@@ -33,7 +59,24 @@ class OMTBridgeServer:
         Args:
             output_type: "omt" for vMix OMT protocol, "virtual" for virtual camera/mic
             omt_lib_path: Path to libomt.dll
-            bind_ip: Specific IP to bind to (None = auto-detect)
+            bind_ip: Specific IP to bind to, or several comma-separated
+                (None = auto-detect)
+            single_port: Accept every camera on one listener, routed by the
+                slot/device ID in the config handshake
+            mux_port: Listener port for single-port mode (default: first camera port)
+            shards: Event loop threads to spread cameras over (1 = single loop,
+                0 = pick from the camera count)
+            udp: Also accept the UDP transport (FEC + NACK) on the same ports
+            multi_nic: Also listen on every other usable interface, so a phone
+                can move its session to another path if one goes down
+            handover: Unix socket path for zero-downtime upgrades: take over
+                listeners and live phones from a server running there, then
+                wait there for our own successor (Linux/macOS)
+            metrics_port: Serve /metrics (Prometheus text) and /healthz over
+                HTTP on this port; None to disable
+            metrics_bind: Address for the metrics endpoint (local by default)
+            trace: Record per-frame stage spans for Chrome/Perfetto traces
+            trace_spike_ms: Received-to-sent latency that dumps the trace
         """
         self.output_type = output_type.lower()
         self.omt_lib_path = omt_lib_path
@@ -51,12 +94,90 @@ class OMTBridgeServer:
 
         # Track active connections per port to prevent duplicates
         self.port_connections = {}  # port -> handler mapping
-        self.connection_lock = asyncio.Lock()  # Lock for thread-safe access
+        self.connection_lock = threading.Lock()  # Shared by all loop shards
+        # phone_id -> resolves once the current connection has fully released
+        self._connection_done: dict[int, concurrent.futures.Future] = {}
+
+        # Single-port (multiplexed) listener
+        self.single_port = single_port
+        self._mux_port = mux_port
+        self.mux_server = None
+        self._free_slots: dict[int, None] = {}  # Insertion-ordered set of free slots
+        self.device_slots: dict[str, int] = {}  # device ID -> last slot (sticky)
+
+        # Sharded mode: cameras spread over several event loop threads
+        self.shards = shards
+        self.shard_pool: ShardPool | None = None
+        self.rebalance_task: asyncio.Task | None = None
+        self.shard_servers: list[tuple[EventLoopShard, asyncio.AbstractServer]] = []
+        self._stopped: asyncio.Event | None = None
+        self._stop_task: asyncio.Future | None = None
+        self.listening = asyncio.Event()  # Set once start() has opened its listeners
+
+        # UDP ingest (packetized frames with FEC/NACK), alongside TCP
+        self.udp = udp
+        self.udp_endpoints: list[tuple[EventLoopShard | None, UdpIngestEndpoint]] = []
+        # Endpoints left on a camera's old port until their sessions end (port moves)
+        self._draining_udp: list[tuple[EventLoopShard | None, UdpIngestEndpoint]] = []
+
+        # Network paths: every local address listened on, with per-path stats
+        self.multi_nic = multi_nic
+        self.bind_addresses: list[str] = []
+        self.paths: dict[str, NetworkPath] = {}
+        # phone_id -> (port, client callback, shard), opened on every path
+        self._listeners: dict[int, tuple[int, Any, EventLoopShard | None]] = {}
+        # phone_id (None = mux) -> open (shard, TCP server or UDP endpoint) pairs
+        self._open_listeners: dict[int | None, list[tuple[EventLoopShard | None, Any]]] = {}
+
+        # Process handover (SCM_RIGHTS): sockets inherited from the previous
+        # process, and the listener a successor connects to
+        self.handover_path = handover
+        self.handed_over = False
+        self._inherited: dict[ListenerKey, list[socket.socket]] = {}
+        self._handover_channel: HandoverChannel | None = None
+        self._handover_listener: HandoverListener | None = None
+        self._handover_callback: Any | None = None
+        self._adopted_tasks: set[asyncio.Future | concurrent.futures.Future] = set()
+
+        # HTTP metrics and health endpoint
+        self.metrics_port = metrics_port
+        self.metrics_bind = metrics_bind
+        self.metrics_server: MetricsServer | None = None
+
+        # Frame lifecycle tracing (off unless asked for)
+        self.tracer = FrameTracer(spike_threshold=trace_spike_ms / 1000) if trace else None
+
+        # Event loop heartbeats; stacks of whatever blocks a loop for 50ms+
+        self.lag_monitor = LoopLagMonitor()
+
+        # One sampler for process/thread CPU, memory, loop lag and system load
+        self.resource_sampler = ResourceSampler(
+            camera_cpu=self._decode_cpu_seconds, loop_lag=self.lag_monitor.lag_percentiles
+        )
+
+        # On-demand sampling profiler (GUI button, /profile/start, SIGUSR2)
+        self.profiler: SamplingProfiler | None = None
+        self._loop_threads: dict[int, asyncio.AbstractEventLoop] = {}  # Thread id -> loop
 
         # Network monitoring
         self.current_bind_ip = None
         self.network_monitor_task = None
 
+        # Shared earliest-deadline-first decode scheduler for all cameras
+        self.decode_scheduler = DecodeScheduler()
+
+        # Camera priority: manual overrides win, otherwise follow OMT tally
+        self.follow_tally = True
+        self.manual_priorities: dict[int, CameraPriority] = {}
+        self.tally_monitor_task = None
+        self._priority_callback: Any | None = None
+
+    @property
+    def mux_port(self) -> int:
+        if self._mux_port is not None:
+            return self._mux_port
+        return self.configs[0].port if self.configs else 5000
+
     def get_local_ip_addresses(self):
         """Get all local IP addresses from all network interfaces"""
         ip_addresses = []
@@ -116,117 +237,111 @@ class OMTBridgeServer:
         logger.info(f"🚀 Bridge Server Starting ({self.output_type.upper()})...")
         logger.info("=" * 60)
 
-        # Determine which IP to bind to
-        if self.bind_ip:
-            bind_address = self.bind_ip
-            logger.info(f"📡 Using specified bind address: {bind_address}")
-        else:
-            # Auto-detect network interfaces
-            ip_addresses = self.get_local_ip_addresses()
-
-            if ip_addresses:
-                logger.info("📡 Available network interfaces:")
-                for addr_info in ip_addresses:
-                    logger.info(
-                        f"   - {addr_info['interface']}: {addr_info['ip']}/{addr_info['netmask']}"
-                    )
-
-                # Select best interface
-                bind_address = self.select_best_interface(ip_addresses)
-            else:
-                logger.warning(
-                    "⚠️ No network interfaces found, binding to all (0.0.0.0)"
-                )
-                bind_address = "0.0.0.0"
+        # Determine which IP(s) to bind to
+        ip_addresses = self.get_local_ip_addresses()
+        bind_addresses = self._choose_bind_addresses(ip_addresses)
 
         # Store the bind address for monitoring
+        bind_address = bind_addresses[0]
         self.current_bind_ip = bind_address
+        self.bind_addresses = bind_addresses
+        interfaces = {addr_info["ip"]: addr_info["interface"] for addr_info in ip_addresses}
+        self.paths = {
+            address: NetworkPath(address, interfaces.get(address, "unknown"))
+            for address in bind_addresses
+        }
+
+        shard_count = self.shards or default_shard_count(len(self.configs))
+        if shard_count > 1:
+            self.shard_pool = ShardPool(shard_count)
+            self.shard_pool.start()
+        self._stopped = asyncio.Event()
+        self._stop_task = None
+
+        if self.handover_path:
+            await self._receive_listeners()
 
         # Create servers for each phone
-        for config in self.configs:
-            try:
-                # Create output based on selected type
-                if self.output_type == "native":
-                    output = NativeWindowsOutput(
-                        config.width, config.height, config.fps, config.phone_id
-                    )
-                else:  # Default to OMT
-                    output = OMTOutput(config.name, self.omt_lib_path, self.omt_quality)
-
-                handler = PhoneStreamHandler(config, output)
-                self.streams[config.phone_id] = handler
-                self.outputs[config.phone_id] = output  # Track for cleanup
-
-                def make_handler(handler, phone_id, port_number):
-                    async def client_handler_wrapper(reader, writer):
-                        addr = writer.get_extra_info("peername")
-
-                        # Check if this port already has an active connection
-                        async with self.connection_lock:
-                            if port_number in self.port_connections:
-                                existing_handler = self.port_connections[port_number]
-                                if existing_handler and existing_handler.running:
-                                    logger.error(
-                                        f"❌ REJECTED: Phone trying to connect to port {port_number} "
-                                        f"which already has an active connection from {existing_handler.writer.get_extra_info('peername') if existing_handler.writer else 'unknown'}"
-                                    )
-                                    logger.error(
-                                        f"   New connection from {addr[0]}:{addr[1]} was DENIED"
-                                    )
-
-                                    # Send rejection message and close
-                                    try:
-                                        writer.write(b"ERROR: Port already in use\n")
-                                        await writer.drain()
-                                        writer.close()
-                                        await writer.wait_closed()
-                                    except Exception as e:
-                                        logger.error(f"Error sending rejection: {e}")
-
-                                    return
-
-                            # Register this connection
-                            self.port_connections[port_number] = handler
-                            logger.info(
-                                f"✅ Port {port_number} assigned to connection from {addr[0]}:{addr[1]}"
-                            )
-
-                        # Register active handler
-                        self.active_handlers[phone_id] = handler
-                        try:
-                            await handler.handle_client(reader, writer)
-                        finally:
-                            # Unregister when done
-                            self.active_handlers.pop(phone_id, None)
-
-                            # Clear port assignment
-                            async with self.connection_lock:
-                                if self.port_connections.get(port_number) == handler:
-                                    self.port_connections.pop(port_number, None)
-                                    logger.info(f"🔓 Port {port_number} released")
-
-                    return client_handler_wrapper
-
-                # Bind to specific IP or all interfaces
-                server = await asyncio.start_server(
-                    make_handler(handler, config.phone_id, config.port),
-                    bind_address,  # Use selected IP instead of '0.0.0.0'
-                    config.port,
-                    reuse_address=True,  # Allow quick restart
-                )
-                self.servers.append(server)
-
-                # Get actual listening address
-                addr = server.sockets[0].getsockname()
-                logger.info(f"📱 Phone {config.phone_id} → {addr[0]}:{addr[1]}")
-            except Exception as e:
-                logger.error(
-                    f"❌ Failed to create output for Phone {config.phone_id}: {e}"
-                )
+        for config in list(self.configs):
+            await self._open_camera(config)
+
+        if self.single_port:
+            self._free_slots = {phone_id: None for phone_id in sorted(self.streams)}
+            for address in self.bind_addresses:
+                await self._start_mux_listener(address)
+
+        if self.handover_path:
+            await self._adopt_clients()
+            self._handover_listener = HandoverListener(
+                self.handover_path, self._hand_over
+            )
+            await self._handover_listener.start()
 
         # Start network monitoring AFTER servers are created
         self.network_monitor_task = asyncio.create_task(self.monitor_network())
+        self.tally_monitor_task = asyncio.create_task(self.monitor_tally())
+        if self.shard_pool and not self.single_port:
+            # Single-port cameras live wherever the kernel hands over their connection
+            self.rebalance_task = asyncio.create_task(self.monitor_shard_balance())
+        self.listening.set()
 
+        await self._start_observability()
+        self._log_ready(bind_address)
+
+        try:
+            # Listeners serve on their loops until stop(); cameras come and go meanwhile
+            await self._stopped.wait()
+        except KeyboardInterrupt:
+            logger.info("\n👋 Shutting down...")
+        finally:
+            await self.stop()
+
+    def _choose_bind_addresses(self, ip_addresses: list[dict]) -> list[str]:
+        """The configured address(es), else the best interface; plus backups with multi-NIC"""
+        if self.bind_ip:
+            bind_addresses = [ip.strip() for ip in self.bind_ip.split(",") if ip.strip()]
+            logger.info(f"📡 Using specified bind address: {', '.join(bind_addresses)}")
+        elif ip_addresses:
+            # Auto-detect network interfaces
+            logger.info("📡 Available network interfaces:")
+            for addr_info in ip_addresses:
+                logger.info(
+                    f"   - {addr_info['interface']}: {addr_info['ip']}/{addr_info['netmask']}"
+                )
+
+            # Select best interface
+            bind_addresses = [self.select_best_interface(ip_addresses)]
+        else:
+            logger.warning(
+                "⚠️ No network interfaces found, binding to all (0.0.0.0)"
+            )
+            bind_addresses = ["0.0.0.0"]
+
+        if self.multi_nic and "0.0.0.0" not in bind_addresses:
+            # The chosen address stays primary; every other real interface is a backup path
+            for addr_info in usable_interfaces(ip_addresses):
+                if addr_info["ip"] not in bind_addresses:
+                    bind_addresses.append(addr_info["ip"])
+            logger.info(f"🔀 Multi-NIC: listening on {', '.join(bind_addresses)}")
+        return bind_addresses
+
+    async def _start_observability(self):
+        """Loop lag monitor, resource sampler and the optional metrics endpoint"""
+        self.lag_monitor.watch_loop("main", asyncio.get_running_loop())
+        self._loop_threads = {threading.get_ident(): asyncio.get_running_loop()}
+        if self.shard_pool:
+            for shard in self.shard_pool.shards:
+                self.lag_monitor.watch_loop(f"shard-{shard.index}", shard.loop)
+                if shard.thread_id:
+                    self._loop_threads[shard.thread_id] = shard.loop
+        self.lag_monitor.start()
+        self.resource_sampler.start()
+
+        if self.metrics_port:
+            self.metrics_server = MetricsServer(self, self.metrics_bind, self.metrics_port)
+            await self.metrics_server.start()
+
+    def _log_ready(self, bind_address: str):
         logger.info("=" * 60)
         if self.output_type == "native":
             logger.info("✅ Bridge ready! Native Windows camera integration:")
@@ -255,12 +370,792 @@ class OMTBridgeServer:
 
         logger.info("=" * 60)
 
+    async def _open_camera(self, config: StreamConfig) -> bool:
+        """Create a camera's output and handler, and listen on its port"""
         try:
-            await asyncio.gather(*[server.serve_forever() for server in self.servers])
-        except KeyboardInterrupt:
-            logger.info("\n👋 Shutting down...")
+            # Create output based on selected type
+            if self.output_type == "native":
+                output = NativeWindowsOutput(
+                    config.width, config.height, config.fps, config.phone_id
+                )
+            else:  # Default to OMT
+                output = OMTOutput(config.name, self.omt_lib_path, self.omt_quality)
+
+            handler = PhoneStreamHandler(config, output)
+            handler._path_move_callback = self._on_path_move
+            handler.tracer = self.tracer
+            handler.resources = self.resource_sampler
+            shard = None
+            if self.shard_pool:
+                shard = self.shard_pool.assign(
+                    config.phone_id, self._camera_cost(config)
+                )
+                handler.decode_scheduler = shard.scheduler
+            else:
+                handler.decode_scheduler = self.decode_scheduler
+            handler.decode_scheduler.set_priority(config.phone_id, config.priority)
+            self.streams[config.phone_id] = handler
+            self.outputs[config.phone_id] = output  # Track for cleanup
+
+            # In single-port mode the multiplexed listener routes to handlers
+            if self.single_port:
+                return True
+
+            def make_handler(handler, phone_id):
+                async def client_handler_wrapper(reader, writer):
+                    # Read the port per connection, it changes with move_camera()
+                    await self._serve_client(
+                        handler, phone_id, handler.config.port, reader, writer
+                    )
+
+                return client_handler_wrapper
+
+            client_cb = make_handler(handler, config.phone_id)
+            self._listeners[config.phone_id] = (config.port, client_cb, shard)
+            for address in self.bind_addresses:
+                await self._listen(config.phone_id, address, config.port, client_cb, shard)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to create output for Phone {config.phone_id}: {e}")
+            return False
+
+    async def add_camera(self, config: StreamConfig) -> bool:
+        """
+        Add a camera slot while the server runs
+
+        Creates its output and opens its listener(s); cameras already
+        streaming are not touched.
+        """
+        if config.phone_id in self.streams:
+            logger.warning(f"⚠️ Phone {config.phone_id} already exists")
+            return False
+
+        logger.info(f"➕ Adding Phone {config.phone_id} on port {config.port}...")
+        self.configs.append(config)
+        if not await self._open_camera(config):
+            # Undo whatever was set up before the failure (e.g. port in use)
+            if config.phone_id in self.streams:
+                await self.remove_camera(config.phone_id)
+            elif config in self.configs:
+                self.configs.remove(config)
+            return False
+
+        if self.single_port:
+            with self.connection_lock:
+                self._free_slots[config.phone_id] = None
+        logger.info(f"✅ Phone {config.phone_id} added")
+        return True
+
+    async def remove_camera(self, phone_id: int) -> bool:
+        """
+        Remove a camera slot while the server runs
+
+        Closes its listener(s), disconnects its phone for good and destroys
+        its output; other cameras keep streaming.
+        """
+        handler = self.streams.get(phone_id)
+        if handler is None:
+            logger.warning(f"Cannot remove: no camera {phone_id}")
+            return False
+
+        logger.info(f"➖ Removing Phone {phone_id}...")
+        with self.connection_lock:
+            # Gone from streams first, so a closing connection can't free the slot again
+            self.streams.pop(phone_id)
+            self._free_slots.pop(phone_id, None)
+            self._listeners.pop(phone_id, None)
+        await self._close_listeners(self._open_listeners.pop(phone_id, []))
+
+        if handler.running:
+            await self._run_on_camera_loop(phone_id, handler.force_disconnect())
+            done = self._connection_done.get(phone_id)
+            if done:
+                try:
+                    await asyncio.wait_for(asyncio.wrap_future(done), timeout=3.0)
+                except asyncio.TimeoutError:
+                    logger.warning(f"⚠️ Phone {phone_id}: Connection did not close in time")
+        handler.session_token = None  # Nothing left to resume into
+
+        self._connection_done.pop(phone_id, None)
+        handler.decode_scheduler.forget(phone_id)
+        if self.shard_pool:
+            self.shard_pool.release(phone_id)
+        self.manual_priorities.pop(phone_id, None)
+        self.configs = [c for c in self.configs if c.phone_id != phone_id]
+
+        output = self.outputs.pop(phone_id, None)
+        if output:
+            try:
+                output.destroy()
+            except Exception as e:
+                logger.error(f"Error destroying output for Phone {phone_id}: {e}")
+
+        logger.info(f"✅ Phone {phone_id} removed")
+        return True
+
+    async def move_camera(self, phone_id: int, port: int) -> bool:
+        """
+        Listen for a camera on a different port while the server runs
+
+        A phone already connected stays connected; new connections (and
+        resumes) use the new port. A UDP phone keeps its old endpoint until
+        it leaves, unless another camera moves onto that port first: then
+        it is told the new port (``portChanged``) and the endpoint closes.
+        """
+        handler = self.streams.get(phone_id)
+        if handler is None:
+            logger.warning(f"Cannot move: no camera {phone_id}")
+            return False
+        if port == handler.config.port:
+            return True
+
+        await self._close_listeners(self._open_listeners.pop(phone_id, []), drain=True)
+        return await self._reopen_camera(phone_id, port)
+
+    async def _reopen_camera(self, phone_id: int, port: int) -> bool:
+        """Open a camera's listeners on ``port`` (back on the old one if that fails)"""
+        handler = self.streams[phone_id]
+        old_port = handler.config.port
+        handler.config.port = port
+        if self.single_port:
+            return True  # Slots share the mux listener; the port is only a key
+
+        _, client_cb, shard = self._listeners[phone_id]
+        try:
+            for address in self.bind_addresses:
+                await self._listen(phone_id, address, port, client_cb, shard)
+        except OSError as e:
+            logger.error(f"❌ Phone {phone_id}: Could not listen on port {port}: {e}")
+            await self._close_listeners(self._open_listeners.pop(phone_id, []))
+            if port != old_port:
+                await self._reopen_camera(phone_id, old_port)
+            return False
+
+        self._listeners[phone_id] = (port, client_cb, shard)
+        if port != old_port:
+            logger.info(f"🔀 Phone {phone_id}: Port {old_port} → {port}")
+        return True
+
+    async def monitor_shard_balance(self):
+        """Move idle cameras off the busiest shard as measured decode load diverges"""
+        while True:
+            await asyncio.sleep(REBALANCE_INTERVAL)
+            try:
+                await self.rebalance_shards()
+            except Exception as e:
+                logger.error(f"Shard rebalancing error: {e}")
+
+    async def rebalance_shards(self) -> bool:
+        """Move one idle camera to the least-loaded shard if that evens out load"""
+        if not self.shard_pool or self.single_port:
+            return False
+        move = self.shard_pool.rebalance_move(self._idle_cameras())
+        if move is None:
+            return False
+        phone_id, shard = move
+        return await self._move_to_shard(phone_id, shard)
+
+    def _idle_cameras(self) -> set[int]:
+        with self.connection_lock:
+            return {
+                phone_id
+                for phone_id, handler in self.streams.items()
+                if not handler.running and phone_id not in self.active_handlers
+            }
+
+    async def _move_to_shard(self, phone_id: int, shard: EventLoopShard) -> bool:
+        """Reopen an idle camera's listeners on another shard (same port)"""
+        port, _, previous = self._listeners[phone_id]
+        await self._close_listeners(self._open_listeners.pop(phone_id, []))
+        if phone_id not in self._idle_cameras():
+            # A phone got in before the listener closed: stay put
+            await self._reopen_camera(phone_id, port)
+            return False
+
+        self._set_shard(phone_id, shard)
+        if not await self._reopen_camera(phone_id, port):
+            self._set_shard(phone_id, previous)  # Back where it was
+            await self._reopen_camera(phone_id, port)
+            return False
+        logger.info(
+            f"⚖️ Phone {phone_id}: Idle, moved from shard {previous.index} to shard {shard.index} "
+            f"to even out decode load"
+        )
+        return True
+
+    def _set_shard(self, phone_id: int, shard: EventLoopShard):
+        handler = self.streams[phone_id]
+        port, client_cb, _ = self._listeners[phone_id]
+        self._listeners[phone_id] = (port, client_cb, shard)
+        self.shard_pool.bind(phone_id, shard, self._camera_cost(handler.config))  # type: ignore
+        handler.decode_scheduler = shard.scheduler
+        shard.scheduler.set_priority(phone_id, handler.priority)
+
+    async def move_mux_listener(self, port: int) -> bool:
+        """Reopen the single-port listener on a different port"""
+        old_port = self.mux_port
+        if port == old_port:
+            return True
+
+        await self._close_listeners(self._open_listeners.pop(None, []), drain=True)
+        self._mux_port = port
+        try:
+            for address in self.bind_addresses:
+                await self._start_mux_listener(address)
+        except OSError as e:
+            logger.error(f"❌ Could not listen on port {port}: {e}")
+            await self._close_listeners(self._open_listeners.pop(None, []))
+            self._mux_port = old_port
+            for address in self.bind_addresses:
+                await self._start_mux_listener(address)
+            return False
+        return True
+
+    async def apply_camera_layout(
+        self, count: int, start_port: int, config_factory=None
+    ) -> bool:
+        """
+        Grow, shrink or re-port the camera slots without a restart
+
+        Args:
+            count: Cameras wanted, numbered 1..count on start_port + i
+                (all behind start_port in single-port mode)
+            start_port: First camera port
+            config_factory: Callable (phone_id, port) -> StreamConfig for new
+                cameras (default: 1280x720 at 30 fps)
+        """
+        ok = True
+        for phone_id in sorted(self.streams, reverse=True):
+            if phone_id > count:
+                ok = await self.remove_camera(phone_id) and ok
+
+        if self.single_port:
+            # Before the slots re-port: the default mux port follows camera 1
+            ok = await self.move_mux_listener(start_port) and ok
+
+        # Close every listener that moves before opening any, so ports can shift.
+        # Reopen against the direction of the shift: a camera then only takes
+        # a port whose previous owner already knows its own new one.
+        moving = [
+            phone_id
+            for phone_id, handler in sorted(self.streams.items())
+            if handler.config.port != start_port + phone_id - 1
+        ]
+        if any(self.streams[p].config.port < start_port + p - 1 for p in moving):
+            moving.reverse()
+        for phone_id in moving:
+            await self._close_listeners(self._open_listeners.pop(phone_id, []), drain=True)
+        for phone_id in moving:
+            ok = await self._reopen_camera(phone_id, start_port + phone_id - 1) and ok
+
+        for phone_id in range(1, count + 1):
+            if phone_id in self.streams:
+                continue
+            port = start_port + phone_id - 1
+            if config_factory:
+                config = config_factory(phone_id, port)
+            else:
+                config = StreamConfig(phone_id, port, f"Camera {phone_id}")
+            ok = await self.add_camera(config) and ok
+        return ok
+
+    async def _close_listeners(
+        self, listeners: list[tuple[EventLoopShard | None, Any]], drain: bool = False
+    ):
+        """
+        Stop accepting on some listeners; connections they already accepted
+        are left running (no wait_closed, which waits for those too).
+
+        UDP sessions live on their endpoint's socket, so closing one ends
+        them. With ``drain`` (port moves) a UDP endpoint only stops taking
+        new phones instead, and closes after its last session.
+        """
+        closing = []
+        for shard, server in listeners:
+            self.servers = [s for s in self.servers if s is not server]
+            self.shard_servers = [
+                entry for entry in self.shard_servers if entry[1] is not server
+            ]
+            self.udp_endpoints = [
+                entry for entry in self.udp_endpoints if entry[1] is not server
+            ]
+            stop = server.close
+            if drain and isinstance(server, UdpIngestEndpoint):
+                self._draining_udp.append((shard, server))
+                stop = server.stop_accepting
+            if shard:
+                closing.append(shard.run(self._stop_accepting(stop)))
+            else:
+                stop()
+
+        for result in await asyncio.gather(*closing, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error closing listener: {result}")
+
+    @staticmethod
+    async def _stop_accepting(stop):
+        stop()  # On the listener's own loop
+
+    async def _evict_draining_udp(self, address: str, port: int):
+        """Free ``address:port`` if a draining endpoint still holds it for its phones"""
+        self._draining_udp = [entry for entry in self._draining_udp if not entry[1].closed]
+        for shard, endpoint in list(self._draining_udp):
+            sockets = endpoint.sockets
+            if not sockets or sockets[0].getsockname()[:2] != (address, port):
+                continue
+            self._draining_udp.remove((shard, endpoint))
+            coro = self._close_draining_udp(endpoint)
+            await (shard.run(coro) if shard else coro)
+
+    async def _close_draining_udp(self, endpoint: UdpIngestEndpoint):
+        """On the endpoint's loop: tell its phones where their camera went, then close"""
+        writers = {session.writer for session in endpoint.sessions.values()}
+        for phone_id, handler in list(self.active_handlers.items()):
+            if handler.writer in writers:
+                port = self.mux_port if self.single_port else handler.config.port
+                logger.warning(
+                    f"⚠️ Phone {phone_id}: UDP port {endpoint.sockets[0].getsockname()[1]} "
+                    f"is needed by another camera; moving this phone to {port}"
+                )
+                handler.send_control({"type": "portChanged", "port": port})
+        endpoint.close()
+        await endpoint.wait_closed()
+
+    async def _serve_client(
+        self,
+        handler: PhoneStreamHandler,
+        phone_id: int,
+        port_number: int,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        """Register a connection for a camera slot and run its handler"""
+        addr = writer.get_extra_info("peername")
+
+        # Check if this port already has an active connection
+        with self.connection_lock:
+            existing_handler = self.port_connections.get(port_number)
+            if existing_handler is None and handler.running:
+                existing_handler = handler  # Still streaming from before a port move
+            busy = bool(existing_handler and existing_handler.running)
+            if not busy:
+                done = self._register_connection(handler, phone_id, port_number)
+
+        if busy:
+            done = await self._serve_busy_port(
+                handler, phone_id, port_number, existing_handler, reader, writer
+            )
+            if done is None:
+                return
+
+        logger.info(
+            f"✅ Port {port_number} assigned to connection from {addr[0]}:{addr[1]}"
+        )
+
+        local = writer.get_extra_info("sockname")
+        if local:
+            self._path(local[0]).connections += 1
+        handler.server_paths = self._offered_paths()
+
+        # Register active handler
+        self.active_handlers[phone_id] = handler
+        try:
+            await handler.handle_client(reader, writer)
         finally:
-            await self.stop()
+            # Unregister when done
+            self.active_handlers.pop(phone_id, None)
+
+            # Clear port assignment
+            with self.connection_lock:
+                released = self.port_connections.get(port_number) == handler
+                if released:
+                    self.port_connections.pop(port_number, None)
+            if self.single_port:
+                self._release_slot(phone_id)
+            done.set_result(None)
+            if released:
+                logger.info(f"🔓 Port {port_number} released")
+
+    def _register_connection(
+        self, handler: PhoneStreamHandler, phone_id: int, port_number: int
+    ) -> concurrent.futures.Future:
+        """Give the port to ``handler`` (connection_lock held); resolves when it's done"""
+        self.port_connections[port_number] = handler
+        done = self._connection_done[phone_id] = concurrent.futures.Future()
+        return done
+
+    async def _serve_busy_port(
+        self,
+        handler: PhoneStreamHandler,
+        phone_id: int,
+        port_number: int,
+        existing_handler: PhoneStreamHandler,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> concurrent.futures.Future | None:
+        """
+        A connection for a slot that is in use. The camera's audio lane or a
+        session resume gets through (returns the slot's done future, as
+        registered); anything else is turned away (None).
+        """
+        stale_peer = (
+            existing_handler.writer.get_extra_info("peername")
+            if existing_handler.writer
+            else "unknown"
+        )
+        # A busy port still accepts that camera's audio lane or a resume
+        try:
+            config_json = await PhoneStreamHandler.read_config_packet(reader)
+        except Exception:
+            config_json = None
+
+        if config_json and config_json.get("lane") == "audio":
+            await self._attach_audio_lane(config_json, reader, writer)
+            return None
+
+        done = None
+        if (
+            config_json
+            and handler.can_resume(config_json.get("resume"))
+            and await self._supersede(handler, phone_id)
+        ):
+            with self.connection_lock:
+                if self.port_connections.get(port_number) is None:
+                    done = self._register_connection(handler, phone_id, port_number)
+
+        if done is None:
+            await self._turn_away(phone_id, port_number, stale_peer, writer)
+            return None
+
+        handler._pending_config = config_json
+        return done
+
+    async def _turn_away(
+        self,
+        phone_id: int,
+        port_number: int,
+        stale_peer,
+        writer: asyncio.StreamWriter,
+    ):
+        addr = writer.get_extra_info("peername")
+        logger.error(
+            f"❌ REJECTED: Phone trying to connect to port {port_number} "
+            f"which already has an active connection from {stale_peer}"
+        )
+        logger.error(f"   New connection from {addr[0]}:{addr[1]} was DENIED")
+
+        if self.single_port:
+            self._release_slot(phone_id)
+        await self._reject_client(writer, "Port already in use")
+
+    def _path(self, address: str) -> NetworkPath:
+        """Stats entry for a local address (created on first use when bound to all)"""
+        path = self.paths.get(address)
+        if path is None:
+            interface = next(
+                (
+                    addr_info["interface"]
+                    for addr_info in self.get_local_ip_addresses()
+                    if addr_info["ip"] == address
+                ),
+                "unknown",
+            )
+            path = self.paths.setdefault(address, NetworkPath(address, interface))
+        return path
+
+    def _offered_paths(self) -> list[str]:
+        """Addresses a phone may resume on if its current path dies"""
+        if "0.0.0.0" in self.bind_addresses:
+            return [addr_info["ip"] for addr_info in self.get_local_ip_addresses()]
+        return [address for address in self.bind_addresses if self.paths[address].up]
+
+    def _on_path_move(self, phone_id: int, old_address: str, new_address: str):
+        self._path(new_address).moves_in += 1
+
+    async def _supersede(self, handler: PhoneStreamHandler, phone_id: int) -> bool:
+        """End a camera's stale connection and wait until it has released"""
+        addr = handler.writer.get_extra_info("peername") if handler.writer else None
+        logger.info(
+            f"♻️ Phone {phone_id}: Resume token presented, replacing stale connection"
+            f"{f' from {addr[0]}:{addr[1]}' if addr else ''}"
+        )
+        handler.supersede()
+
+        done = self._connection_done.get(phone_id)
+        if done is None:
+            return True
+        try:
+            # Possibly another shard's loop, hence the concurrent future
+            await asyncio.wait_for(asyncio.wrap_future(done), timeout=3.0)
+            return True
+        except asyncio.TimeoutError:
+            logger.error(f"❌ Phone {phone_id}: Stale connection did not release in time")
+            return False
+
+    async def _attach_audio_lane(
+        self,
+        config_json: dict,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> bool:
+        """Bind an audio connection to the camera that issued its token"""
+        token = config_json.get("token")
+        handler = next(
+            (
+                h
+                for h in self.streams.values()
+                if token and h.audio_lane_token == token and h.running
+            ),
+            None,
+        )
+        if handler is None:
+            addr = writer.get_extra_info("peername")
+            logger.warning(f"⚠️ Audio lane from {addr[0]}:{addr[1]} has an unknown token")
+            await self._reject_client(writer, "Unknown audio lane token")
+            return True
+
+        await handler.serve_audio_lane(reader, writer)
+        return True
+
+    async def _reject_client(self, writer: asyncio.StreamWriter, reason: str):
+        """Send a rejection message and close"""
+        try:
+            writer.write(f"ERROR: {reason}\n".encode("utf-8"))
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except Exception as e:
+            logger.error(f"Error sending rejection: {e}")
+
+    async def _listen(
+        self,
+        phone_id: int,
+        address: str,
+        port: int,
+        client_cb,
+        shard: EventLoopShard | None,
+    ):
+        """Open one camera's TCP (and UDP) listener on one path"""
+        if self.udp:
+            await self._start_udp_endpoint(phone_id, client_cb, address, port, shard)
+
+        inherited = self._take_inherited("tcp", address, port)
+        if inherited:
+            listen = asyncio.start_server(client_cb, sock=inherited)
+        else:
+            # Bind to specific IP or all interfaces
+            listen = asyncio.start_server(
+                client_cb,
+                address,  # Use selected IP instead of '0.0.0.0'
+                port,
+                reuse_address=True,  # Allow quick restart
+            )
+        if shard:
+            # Listen on the camera's own loop so its I/O stays there
+            server = await shard.run(listen)
+            self.shard_servers.append((shard, server))
+        else:
+            server = await listen
+            self.servers.append(server)
+        self._open_listeners.setdefault(phone_id, []).append((shard, server))
+
+        # Get actual listening address
+        addr = server.sockets[0].getsockname()
+        shard_note = f" (loop shard {shard.index})" if shard else ""
+        logger.info(f"📱 Phone {phone_id} → {addr[0]}:{addr[1]}{shard_note}")
+
+    async def _open_path(self, address: str, interface: str):
+        """Start listening on a newly appeared interface (multi-NIC mode)"""
+        self.bind_addresses.append(address)
+        self.paths[address] = NetworkPath(address, interface)
+        try:
+            for phone_id, (port, client_cb, shard) in list(self._listeners.items()):
+                await self._listen(phone_id, address, port, client_cb, shard)
+            if self.single_port:
+                await self._start_mux_listener(address)
+            logger.info(f"🔀 New path {address} ({interface}) is now accepting phones")
+        except OSError as e:
+            logger.error(f"❌ Could not listen on new path {address}: {e}")
+
+    async def _start_mux_listener(self, bind_address: str):
+        """Open the single multiplexed listener used in single-port mode"""
+        if self.shard_pool:
+            # Every shard accepts on the shared port; the kernel spreads connections
+            reuse_port = hasattr(socket, "SO_REUSEPORT")
+            shards = self.shard_pool.shards if reuse_port else self.shard_pool.shards[:1]
+            for shard in shards:
+                inherited = self._take_inherited("tcp", bind_address, self.mux_port)
+                server = await shard.run(
+                    asyncio.start_server(
+                        lambda r, w, shard=shard: self._mux_client_handler(r, w, shard),
+                        **(
+                            {"sock": inherited}
+                            if inherited
+                            else {
+                                "host": bind_address,
+                                "port": self.mux_port,
+                                "reuse_address": True,
+                                "reuse_port": reuse_port or None,
+                            }
+                        ),
+                    )
+                )
+                self.shard_servers.append((shard, server))
+                self._open_listeners.setdefault(None, []).append((shard, server))
+            self.mux_server = self.shard_servers[-1][1]
+        else:
+            inherited = self._take_inherited("tcp", bind_address, self.mux_port)
+            if inherited:
+                self.mux_server = await asyncio.start_server(
+                    self._mux_client_handler, sock=inherited
+                )
+            else:
+                self.mux_server = await asyncio.start_server(
+                    self._mux_client_handler,
+                    bind_address,
+                    self.mux_port,
+                    reuse_address=True,
+                )
+            self.servers.append(self.mux_server)
+            self._open_listeners.setdefault(None, []).append((None, self.mux_server))
+
+        addr = self.mux_server.sockets[0].getsockname()
+        logger.info(
+            f"📱 Single-port mode: {len(self.streams)} camera slots → {addr[0]}:{addr[1]}"
+        )
+
+        if self.udp:
+            shard = self.shard_pool.shards[0] if self.shard_pool else None
+            await self._start_udp_endpoint(
+                None,
+                lambda r, w: self._mux_client_handler(r, w, shard),
+                bind_address,
+                self.mux_port,
+                shard,
+            )
+
+    async def _start_udp_endpoint(
+        self,
+        phone_id: int | None,
+        client_cb,
+        bind_address: str,
+        port: int,
+        shard: EventLoopShard | None,
+    ):
+        """Accept the UDP transport on ``port``, feeding the same client callback"""
+        await self._evict_draining_udp(bind_address, port)
+        try:
+            inherited = self._take_inherited("udp", bind_address, port)
+            start = start_udp_server(client_cb, bind_address, port, sock=inherited)
+            endpoint = await (shard.run(start) if shard else start)
+        except OSError as e:
+            logger.error(f"❌ Could not open UDP port {port}: {e}")
+            return
+        self.udp_endpoints.append((shard, endpoint))
+        self._open_listeners.setdefault(phone_id, []).append((shard, endpoint))
+        logger.info(f"📡 UDP ingest (FEC + NACK) on {bind_address}:{port}")
+
+    def _assign_slot(self, config_json: dict) -> int | None:
+        """
+        Pick a camera slot for a new multiplexed connection in O(1)
+
+        Order: explicit slot/camera ID, then the slot last used by this
+        device ID, then any free slot.
+        """
+        device_cfg = config_json.get("device", {})
+        requested = config_json.get("slot", config_json.get("cameraId"))
+        device_id = device_cfg.get("id") or device_cfg.get("deviceId")
+
+        with self.connection_lock:
+            return self._take_slot(requested, device_id)
+
+    def _take_slot(self, requested: Any, device_id: str | None) -> int | None:
+        if requested is not None:
+            try:
+                requested = int(requested)
+            except (TypeError, ValueError):
+                return None
+            if requested not in self._free_slots:
+                return None  # Unknown or busy slot
+            phone_id = requested
+        elif device_id and self.device_slots.get(device_id) in self._free_slots:
+            phone_id = self.device_slots[device_id]
+        elif self._free_slots:
+            phone_id = next(iter(self._free_slots))
+        else:
+            return None
+
+        del self._free_slots[phone_id]
+        if device_id:
+            self.device_slots[device_id] = phone_id
+        return phone_id
+
+    def _release_slot(self, phone_id: int):
+        if phone_id in self.streams:
+            with self.connection_lock:
+                self._free_slots[phone_id] = None
+
+    async def _mux_client_handler(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        shard: EventLoopShard | None = None,
+    ):
+        """Read the config handshake, then route to the matching camera slot"""
+        addr = writer.get_extra_info("peername")
+
+        try:
+            config_json = await PhoneStreamHandler.read_config_packet(reader)
+        except Exception as e:
+            logger.warning(f"⚠️ {addr[0]}:{addr[1]}: No valid config handshake ({e})")
+            config_json = None
+
+        if config_json is None:
+            await self._reject_client(writer, "Config handshake required")
+            return
+
+        if config_json.get("lane") == "audio":
+            await self._attach_audio_lane(config_json, reader, writer)
+            return
+
+        phone_id = await self._resume_slot(config_json)
+        if phone_id is None:
+            phone_id = self._assign_slot(config_json)
+        if phone_id is None:
+            logger.error(
+                f"❌ REJECTED: No free camera slot for {addr[0]}:{addr[1]} "
+                f"(requested slot: {config_json.get('slot', config_json.get('cameraId', 'any'))})"
+            )
+            await self._reject_client(writer, "No free camera slot")
+            return
+
+        handler = self.streams[phone_id]
+        handler._pending_config = config_json
+        if shard and self.shard_pool:
+            # The camera lives wherever the kernel handed us its connection
+            self.shard_pool.bind(phone_id, shard, self._camera_cost(handler.config))
+            handler.decode_scheduler = shard.scheduler
+            shard.scheduler.set_priority(phone_id, handler.priority)
+        writer.write(encode_control({"type": "slotAssigned", "slot": phone_id}))
+
+        # Releases the slot when the connection ends
+        await self._serve_client(handler, phone_id, handler.config.port, reader, writer)
+
+    async def _resume_slot(self, config_json: dict) -> int | None:
+        """Slot of the session this handshake resumes, freed from any stale connection"""
+        token = config_json.get("resume")
+        handler = next((h for h in self.streams.values() if h.can_resume(token)), None)
+        if handler is None:
+            return None
+
+        phone_id = handler.config.phone_id
+        if handler.running and not await self._supersede(handler, phone_id):
+            return None
+        with self.connection_lock:
+            if phone_id not in self._free_slots:
+                return None
+            del self._free_slots[phone_id]
+        return phone_id
 
     def update_omt_quality(self, quality_value: int):
         """Update OMT quality for all outputs"""
@@ -272,135 +1167,144 @@ class OMTBridgeServer:
                 except Exception as e:
                     logger.error(f"Failed to update quality for phone {phone_id}: {e}")
 
-    async def monitor_network(self):
-        """Monitor network availability"""
-        last_status = True
-        consecutive_failures = 0
-        max_failures = 2
-        check_interval = 1.0  # Check every 1 second for faster detection
-        quality_samples = deque(maxlen=10)  # Track connection quality
+    def set_camera_priority(
+        self, phone_id: int, priority: CameraPriority | None, manual: bool = True
+    ) -> bool:
+        """
+        Set a camera's resource priority
+
+        Args:
+            phone_id: Camera to change
+            priority: New priority, or None to clear a manual override
+            manual: False when driven by tally (manual overrides are kept)
+        """
+        handler = self.streams.get(phone_id)
+        if not handler:
+            logger.warning(f"Cannot set priority: no camera {phone_id}")
+            return False
+
+        if manual:
+            if priority is None:
+                self.manual_priorities.pop(phone_id, None)
+                priority = CameraPriority.PREVIEW
+            else:
+                self.manual_priorities[phone_id] = priority
+        elif phone_id in self.manual_priorities:
+            return False
 
-        logger.info(f"🔍 Network monitoring started for {self.current_bind_ip}")
+        if priority == handler.priority:
+            return True
 
-        while True:
+        self._call_on_camera_loop(phone_id, handler.set_priority, priority)
+
+        if self._priority_callback:
             try:
+                self._priority_callback(phone_id, int(priority))
+            except Exception as e:
+                logger.error(f"Error in priority callback: {e}")
+
+        return True
+
+    @staticmethod
+    def _camera_cost(config: StreamConfig) -> float:
+        """Pixels per second: a camera's placement weight until its decode CPU is measured"""
+        return float(config.width * config.height * config.fps)
+
+    def _call_on_camera_loop(self, phone_id: int, fn, *args):
+        """Run a handler callback on the event loop that owns the camera"""
+        shard = self.shard_pool.shard_for(phone_id) if self.shard_pool else None
+        if shard:
+            shard.call_soon(fn, *args)
+        else:
+            fn(*args)
+
+    async def _run_on_camera_loop(self, phone_id: int, coro):
+        """Await a handler coroutine on the event loop that owns the camera"""
+        shard = self.shard_pool.shard_for(phone_id) if self.shard_pool else None
+        if shard:
+            return await shard.run(coro)
+        return await coro
+
+    def get_camera_priorities(self) -> dict[int, CameraPriority]:
+        return {phone_id: h.priority for phone_id, h in self.streams.items()}
+
+    async def monitor_tally(self):
+        """Derive camera priorities from OMT tally (program/preview) if available"""
+        check_interval = 0.25
+
+        try:
+            while True:
                 await asyncio.sleep(check_interval)
+                if self.follow_tally:
+                    self._apply_tally()
 
-                # Check if our bind IP is still available
-                if self.current_bind_ip and self.current_bind_ip != "0.0.0.0":
-                    current_ips = self.get_local_ip_addresses()
-                    ip_still_exists = any(
-                        addr["ip"] == self.current_bind_ip for addr in current_ips
-                    )
+        except asyncio.CancelledError:
+            logger.debug("Tally monitoring cancelled")
+
+    def _apply_tally(self):
+        tallies = {}
+        for phone_id, output in self.outputs.items():
+            tally = output.get_tally()
+            if tally is not None:
+                tallies[phone_id] = tally
 
-                    # Also check if we can still bind to the port
-                    if ip_still_exists:
-                        # Try to verify the network is actually working
-                        try:
-                            import socket
+        if not tallies:
+            return  # No tally support; leave priorities alone
 
-                            test_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                            test_sock.setsockopt(
-                                socket.SOL_SOCKET, socket.SO_REUSEADDR, 1
-                            )
-                            test_sock.bind(
-                                (self.current_bind_ip, 0)
-                            )  # Bind to any free port
-                            test_sock.close()
-                            consecutive_failures = 0  # Reset on success
-
-                            # Calculate connection quality
-                            if self.active_handlers:
-                                total_latency = 0
-                                handler_count = 0
-
-                                for phone_id, handler in self.active_handlers.items():
-                                    if (
-                                        hasattr(handler, "average_latency")
-                                        and handler.average_latency > 0
-                                    ):
-                                        total_latency += handler.average_latency
-                                        handler_count += 1
-
-                                if handler_count > 0:
-                                    avg_latency = total_latency / handler_count
-                                    quality_samples.append(avg_latency)
-
-                                    # Warn if quality degrades
-                                    if len(quality_samples) >= 5:
-                                        recent_avg = sum(quality_samples) / len(
-                                            quality_samples
-                                        )
-                                        if recent_avg > 0.2:  # > 200ms average
-                                            logger.warning(
-                                                f"⚠️ Network quality degraded: {recent_avg * 1000:.0f}ms avg latency"
-                                            )
-                        except OSError:
-                            ip_still_exists = False
-                            logger.warning(
-                                f"Cannot bind to {self.current_bind_ip} - network may be down"
-                            )
+        # Only demote to ISO when the switcher is actually using tally
+        any_program = any(program for _, program in tallies.values())
 
-                    if not ip_still_exists:
-                        consecutive_failures += 1  # Increment failure counter
-                        logger.debug(
-                            f"Network check failed ({consecutive_failures}/{max_failures})"
-                        )
-                    else:
-                        consecutive_failures = 0  # Reset on success
-
-                        # Network is up - check if we need to restore
-                        if not last_status:
-                            logger.info(f"✅ Network {self.current_bind_ip} restored!")
-                            last_status = True
-
-                            if self._network_status_callback:
-                                try:
-                                    logger.info("📡 Notifying GUI: Network UP")
-                                    self._network_status_callback(
-                                        True, self.current_bind_ip
-                                    )
-                                except Exception as e:
-                                    logger.error(
-                                        f"Error in network status callback: {e}"
-                                    )
-
-                    # Network went down
-                    if (
-                        not ip_still_exists
-                        and consecutive_failures >= max_failures
-                        and last_status
-                    ):
-                        logger.error(
-                            f"❌ Network interface {self.current_bind_ip} is no longer available!"
-                        )
-
-                        last_status = False  # Mark as down
-
-                        if self._network_status_callback:
-                            try:
-                                logger.info("📡 Notifying GUI: Network DOWN")
-                                self._network_status_callback(
-                                    False, self.current_bind_ip
-                                )
-                            except Exception as e:
-                                logger.error(f"Error in network status callback: {e}")
-
-                        # Disconnect all clients
-                        if self.active_handlers:
-                            logger.info(
-                                f"📴 Disconnecting {len(self.active_handlers)} client(s)..."
-                            )
-                            disconnect_tasks = []
-                            for phone_id, handler in list(self.active_handlers.items()):
-                                disconnect_tasks.append(handler.force_disconnect())
+        for phone_id, (preview, program) in tallies.items():
+            if program:
+                priority = CameraPriority.PROGRAM
+            elif preview or not any_program:
+                priority = CameraPriority.PREVIEW
+            else:
+                priority = CameraPriority.ISO
+            self.set_camera_priority(phone_id, priority, manual=False)
+
+    async def monitor_network(self):
+        """Monitor availability of every network path we listen on"""
+        last_status = True
+        consecutive_failures: dict[str, int] = {}
+        quality_samples = deque(maxlen=10)  # Track connection quality
+
+        # Prefer netlink notifications; poll once a second where unavailable
+        watcher = NetlinkWatcher()
+        event_driven = watcher.start()
+        if event_driven:
+            check_interval = 5.0  # Safety net + latency sampling only
+            max_failures = 1  # Events are real changes, no need to debounce twice
+        else:
+            check_interval = 1.0  # Check every 1 second for faster detection
+            max_failures = 2
+
+        logger.info(
+            f"🔍 Network monitoring started for {', '.join(self.bind_addresses) or self.current_bind_ip} "
+            f"({'netlink events' if event_driven else 'polling'})"
+        )
+
+        while True:
+            try:
+                await self._wait_for_network_change(watcher, event_driven, check_interval)
+
+                # Check if our bind IPs are still available
+                watched = self._watched_paths()
+                if not watched:
+                    continue
 
-                            if disconnect_tasks:
-                                await asyncio.gather(
-                                    *disconnect_tasks, return_exceptions=True
-                                )
+                current_ips = await self._current_addresses()
+                for path in watched:
+                    await self._check_path(
+                        path, watched, current_ips, consecutive_failures, max_failures
+                    )
 
-                            logger.info("✅ All clients disconnected")
+                up = any(path.up for path in watched)  # Down: every path went down
+                if up:
+                    self._sample_quality(quality_samples)
+                if up != last_status:
+                    last_status = up
+                    await self._network_status_changed(up)
 
             except asyncio.CancelledError:
                 logger.debug("Network monitoring cancelled")
@@ -409,83 +1313,424 @@ class OMTBridgeServer:
                 logger.error(f"Network monitoring error: {e}")
                 await asyncio.sleep(5)
 
-    async def stop(self):
-        """Stop the server gracefully and disconnect all clients"""
-        logger.info("\nStopping Bridge Server...")
+        watcher.stop()
 
-        # Cancel network monitoring
-        if self.network_monitor_task:
-            self.network_monitor_task.cancel()
-            try:
-                await self.network_monitor_task
-            except asyncio.CancelledError:
-                pass
+    @staticmethod
+    async def _wait_for_network_change(
+        watcher: NetlinkWatcher, event_driven: bool, timeout: float
+    ):
+        """Until a netlink event arrives (or the safety-net timeout); a plain sleep when polling"""
+        if not event_driven:
+            await asyncio.sleep(timeout)
+            return
+        for event in await watcher.wait(timeout) or []:
+            logger.debug(
+                f"Netlink: {event.name} (if {event.if_index}"
+                f"{', ' + event.address if event.address else ''})"
+            )
 
-        # Emit disconnect signals for GUI BEFORE closing connections
-        if self._disconnect_signal_callback:
-            logger.info("📡 Notifying GUI of disconnections...")
-            for phone_id in list(self.active_handlers.keys()):
-                try:
-                    self._disconnect_signal_callback(phone_id, False, {})
-                    logger.debug(f"  Sent disconnect signal for phone {phone_id}")
-                except Exception as e:
-                    logger.error(
-                        f"  Error sending disconnect signal for phone {phone_id}: {e}"
-                    )
+    def _watched_paths(self) -> list[NetworkPath]:
+        """Paths on specific addresses (a 0.0.0.0 listener can't go away)"""
+        return [
+            self.paths[address]
+            for address in self.bind_addresses
+            if address != "0.0.0.0"
+        ]
+
+    async def _current_addresses(self) -> set[str]:
+        """Local addresses right now; with multi-NIC, also listen on any new interface"""
+        local_ips = self.get_local_ip_addresses()
+        if self.multi_nic:
+            for addr_info in usable_interfaces(local_ips):
+                if addr_info["ip"] not in self.paths:
+                    await self._open_path(addr_info["ip"], addr_info["interface"])
+        return {addr["ip"] for addr in local_ips}
+
+    async def _check_path(
+        self,
+        path: NetworkPath,
+        watched: list[NetworkPath],
+        current_ips: set[str],
+        consecutive_failures: dict[str, int],
+        max_failures: int,
+    ):
+        """Mark one path up or down; a path going down while others are up fails over"""
+        if self._path_available(path.address, current_ips):
+            consecutive_failures[path.address] = 0  # Reset on success
+            if path.set_up(True) and len(watched) > 1:
+                logger.info(f"✅ Path {path.address} ({path.interface}) restored")
+            return
+
+        failures = consecutive_failures.get(path.address, 0) + 1
+        consecutive_failures[path.address] = failures
+        logger.debug(
+            f"Network check for {path.address} failed ({failures}/{max_failures})"
+        )
+        if failures >= max_failures and path.set_up(False):
+            logger.error(
+                f"❌ Network interface {path.address} is no longer available!"
+            )
+            if any(other.up for other in watched):
+                self.dump_flight_recorders(
+                    f"path-down-{path.address}",
+                    [
+                        phone_id
+                        for phone_id, handler in self.active_handlers.items()
+                        if handler.local_address == path.address
+                    ],
+                )
+                await self._fail_over(path)
 
-        # Force disconnect all active phone connections
-        if self.active_handlers:
-            logger.info(
-                f"📴 Disconnecting {len(self.active_handlers)} active phone(s)..."
+    async def _network_status_changed(self, up: bool):
+        if up:
+            logger.info(f"✅ Network {self.current_bind_ip} restored!")
+        self._notify_network_status(up)
+        if not up:
+            await self._disconnect_all_clients()
+
+    def _notify_network_status(self, up: bool):
+        if self._network_status_callback:
+            try:
+                logger.info(f"📡 Notifying GUI: Network {'UP' if up else 'DOWN'}")
+                self._network_status_callback(up, self.current_bind_ip)
+            except Exception as e:
+                logger.error(f"Error in network status callback: {e}")
+
+    async def _disconnect_all_clients(self):
+        """Every path is down: drop the connections (phones reconnect when it's back)"""
+        if not self.active_handlers:
+            return
+        self.dump_flight_recorders("network-down")
+        logger.info(
+            f"📴 Disconnecting {len(self.active_handlers)} client(s)..."
+        )
+        disconnect_tasks = []
+        for phone_id, handler in list(self.active_handlers.items()):
+            disconnect_tasks.append(
+                self._run_on_camera_loop(
+                    phone_id, handler.force_disconnect()
+                )
             )
 
-            # Create tasks to disconnect all handlers concurrently
-            disconnect_tasks = []
-            for phone_id, handler in list(self.active_handlers.items()):
-                logger.debug(f"  Disconnecting phone {phone_id}...")
-                disconnect_tasks.append(handler.force_disconnect())
+        if disconnect_tasks:
+            await asyncio.gather(*disconnect_tasks, return_exceptions=True)
 
-            if disconnect_tasks:
-                # Wait for all disconnections (with timeout)
-                try:
-                    await asyncio.wait_for(
-                        asyncio.gather(*disconnect_tasks, return_exceptions=True),
-                        timeout=3.0,
-                    )
-                    logger.info("✅ All phones disconnected")
-                except asyncio.TimeoutError:
+        logger.info("✅ All clients disconnected")
+
+    @staticmethod
+    def _path_available(address: str, current_ips: set[str]) -> bool:
+        """The address still exists and can be bound"""
+        if address not in current_ips:
+            return False
+        try:
+            test_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            test_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            test_sock.bind((address, 0))  # Bind to any free port
+            test_sock.close()
+            return True
+        except OSError:
+            logger.warning(f"Cannot bind to {address} - network may be down")
+            return False
+
+    async def _fail_over(self, path: NetworkPath):
+        """
+        One of several paths died: drop the cameras on it but keep their
+        sessions, so they resume on a surviving path with their token
+        """
+        stranded = [
+            (phone_id, handler)
+            for phone_id, handler in list(self.active_handlers.items())
+            if handler.local_address == path.address
+        ]
+        survivors = ", ".join(p.address for p in self.paths.values() if p.up)
+        logger.warning(
+            f"🔀 Path {path.address} ({path.interface}) down; "
+            f"{len(stranded)} camera(s) can resume via {survivors}"
+        )
+        await asyncio.gather(
+            *[
+                self._run_on_camera_loop(
+                    phone_id, handler.force_disconnect(keep_session=True)
+                )
+                for phone_id, handler in stranded
+            ],
+            return_exceptions=True,
+        )
+
+    def _sample_quality(self, quality_samples: deque):
+        """Warn when average phone latency stays high"""
+        if not self.active_handlers:
+            return
+
+        total_latency = 0
+        handler_count = 0
+        for phone_id, handler in list(self.active_handlers.items()):
+            processing = handler.processing_latency
+            if processing:
+                total_latency += processing[50]
+                handler_count += 1
+
+        if handler_count > 0:
+            avg_latency = total_latency / handler_count
+            quality_samples.append(avg_latency)
+
+            # Warn if quality degrades
+            if len(quality_samples) >= 5:
+                recent_avg = sum(quality_samples) / len(quality_samples)
+                if recent_avg > 0.2:  # > 200ms average
                     logger.warning(
-                        "⚠️  Phone disconnection timeout (some may still be active)"
+                        f"⚠️ Network quality degraded: {recent_avg * 1000:.0f}ms avg latency"
                     )
 
-        # Close all server sockets
-        logger.info("🔒 Closing server sockets...")
-        for i, server in enumerate(self.servers):
+    def _take_inherited(self, kind: str, address: str, port: int) -> socket.socket | None:
+        """A listening socket handed over by the previous process, if it had this one"""
+        sockets = self._inherited.get((kind, address, port))
+        return sockets.pop(0) if sockets else None
+
+    async def _receive_listeners(self):
+        """Take over the listening sockets of a server already running (handover)"""
+        try:
+            channel = await request_handover(self.handover_path)
+            if channel is None:
+                return
+            message, sockets = await channel.receive("listeners")
+        except (OSError, ConnectionError, ValueError) as e:
+            logger.error(f"❌ Handover: could not take over listeners: {e}")
+            return
+
+        for entry, sock in zip(message["listeners"], sockets):
+            key = (entry["kind"], entry["address"], entry["port"])
+            self._inherited.setdefault(key, []).append(sock)
+        self._handover_channel = channel
+        logger.info(f"🔁 Took over {len(sockets)} listening socket(s) from the running server")
+
+    async def _adopt_clients(self):
+        """Once listening, take over the previous process's phone connections"""
+        channel, self._handover_channel = self._handover_channel, None
+        try:
+            if channel:
+                await channel.send({"type": "listening", "pid": os.getpid()})
+                message, sockets = await channel.receive("cameras")
+                adopted = 0
+                for state, sock in zip(message["cameras"], sockets):
+                    adopted += self._adopt_client(state, sock)
+                await channel.send({"type": "adopted", "count": adopted})
+                logger.info(f"🔁 Adopted {adopted} live phone connection(s)")
+        except (OSError, ConnectionError, ValueError) as e:
+            logger.error(f"❌ Handover: could not adopt phone connections: {e}")
+        finally:
+            if channel:
+                channel.close()
+            # Sockets we had no listener for (camera layout changed in between)
+            for sockets in self._inherited.values():
+                for sock in sockets:
+                    sock.close()
+            self._inherited.clear()
+
+    def _adopt_client(self, state: dict, sock: socket.socket) -> bool:
+        """Serve a connection handed over mid-stream, without a new handshake"""
+        phone_id = state.get("phoneId")
+        handler = self.streams.get(phone_id)
+        if handler is None or handler.running:
+            logger.warning(f"⚠️ Handover: no free camera slot {phone_id}, dropping its phone")
+            sock.close()
+            return False
+        if state.get("name") != handler.config.name:
+            logger.warning(
+                f"⚠️ Handover: Phone {phone_id} was '{state.get('name')}', "
+                f"continues as '{handler.config.name}'"
+            )
+
+        if self.single_port:
+            with self.connection_lock:
+                self._free_slots.pop(phone_id, None)
+        handler.adopt(state)
+        pending = base64.b64decode(state.get("pending") or "")
+
+        shard = self.shard_pool.shard_for(phone_id) if self.shard_pool else None
+        serve = self._serve_adopted(handler, phone_id, sock, pending)
+        future = shard.submit(serve) if shard else asyncio.ensure_future(serve)
+        self._adopted_tasks.add(future)
+        future.add_done_callback(self._adopted_tasks.discard)
+        return True
+
+    async def _serve_adopted(
+        self, handler: PhoneStreamHandler, phone_id: int, sock: socket.socket, pending: bytes
+    ):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        # Bytes the previous process had read but not parsed come first
+        reader.feed_data(pending)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        transport, _ = await loop.connect_accepted_socket(lambda: protocol, sock=sock)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        await self._serve_client(handler, phone_id, handler.config.port, reader, writer)
+
+    async def _hand_over(self, channel: HandoverChannel):
+        """
+        Give our listening sockets and live phone connections to a successor
+        process, then stop. Phones keep their TCP connection throughout.
+
+        Our listeners stay open until the successor confirms ``adopted``, so
+        a successor that dies early leaves phones something to reconnect to.
+        Failing before any phone is detached raises (we keep serving and the
+        listener waits for another successor); failing after that stops this
+        process, since its phones are already gone.
+        """
+        listeners = [
+            entry for entries in self._open_listeners.values() for entry in entries
+        ]
+        described, fds = [], []
+        for _, server in listeners:
+            if isinstance(server, UdpIngestEndpoint):
+                kind, sockets = "udp", [server.transport.get_extra_info("socket")]
+            else:
+                kind, sockets = "tcp", server.sockets
+            for sock in sockets:
+                address, port = sock.getsockname()[:2]
+                described.append({"kind": kind, "address": address, "port": port})
+                fds.append(sock.fileno())
+        await channel.send({"type": "listeners", "listeners": described}, fds)
+
+        # Both processes accept until the successor reports it is listening
+        await channel.receive("listening")
+        if self.metrics_server:
+            # Free the port for the successor, which opens it once it has our phones
+            await self.metrics_server.close()
+            self.metrics_server = None
+
+        try:
+            adopted, total = await self._send_phones(channel)
+        except Exception as e:
+            logger.error(f"❌ Handover failed after detaching phones, stopping: {e}")
+            await self._finish_handover()
+            return
+
+        logger.info(f"🔁 Handed over to the new server process: {adopted}/{total} phone(s) adopted")
+        self.handed_over = True
+        await self._finish_handover()
+
+    async def _send_phones(self, channel: HandoverChannel) -> tuple[int, int]:
+        """Detach every TCP phone and pass it to the successor; (adopted, sent)"""
+        # Every TCP phone stops at a frame boundary and leaves with its state
+        handlers = list(self.active_handlers.items())
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(self._run_on_camera_loop(phone_id, handler.detach()), 2.0)
+                for phone_id, handler in handlers
+            ),
+            return_exceptions=True,
+        )
+        states, fds = [], []
+        for (phone_id, _), result in zip(handlers, results):
+            if isinstance(result, tuple):
+                states.append(result[0])
+                fds.append(result[1])
+            elif isinstance(result, Exception):
+                logger.error(f"❌ Phone {phone_id}: Could not detach for handover: {result}")
+        try:
+            await channel.send({"type": "cameras", "cameras": states}, fds)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+        message, _ = await channel.receive("adopted")
+        return message.get("count", 0), len(states)
+
+    async def _finish_handover(self):
+        """Close our listeners (the successor holds them now), tell the owner, stop"""
+        listeners = [
+            entry for entries in self._open_listeners.values() for entry in entries
+        ]
+        self._open_listeners.clear()
+        await self._close_listeners(listeners)
+        if self._handover_callback:
             try:
-                server.close()
-                await asyncio.wait_for(server.wait_closed(), timeout=2.0)
-                logger.debug(f"  Server {i + 1} closed")
-            except asyncio.TimeoutError:
-                logger.warning(f"  Server {i + 1} close timeout")
+                self._handover_callback()
             except Exception as e:
-                logger.error(f"  Error closing server {i + 1}: {e}")
+                logger.error(f"Error in handover callback: {e}")
+        # UDP phones (sockets now with the successor) resume there
+        asyncio.ensure_future(self.stop())
+
+    async def stop(self):
+        """Stop the server and disconnect all clients (safe to call twice)"""
+        if self._stop_task is None:
+            self._stop_task = asyncio.ensure_future(self._stop())
+        await asyncio.shield(self._stop_task)
+
+    async def _stop(self):
+        """
+        Teardown, concurrent and event-driven: stop accepting everywhere,
+        disconnect every phone at once, and return as soon as each
+        connection reports it has released (bounded by one timeout)
+        """
+        logger.info("\nStopping Bridge Server...")
+        started = time.perf_counter()
+
+        # Cancel network and tally monitoring
+        monitors = [
+            task
+            for task in (self.network_monitor_task, self.tally_monitor_task, self.rebalance_task)
+            if task
+        ]
+        for task in monitors:
+            task.cancel()
+        if self._handover_listener:
+            await self._handover_listener.close()
+            self._handover_listener = None
+        await self._stop_observability()
 
-        # Clear the servers list
-        self.servers.clear()
+        # Emit disconnect signals for GUI BEFORE closing connections
+        self._signal_disconnects()
 
-        # Give OS time to release ports
-        logger.info("⏳ Waiting for port release...")
-        await asyncio.sleep(1.0)
+        # Stop accepting first, so no phone connects into a server going away.
+        # Listening sockets close right away; SO_REUSEADDR lets them rebind.
+        logger.info("🔒 Closing server sockets...")
+        udp_endpoints = list(self.udp_endpoints) + self._draining_udp
+        listeners = [
+            entry for entries in self._open_listeners.values() for entry in entries
+        ] + self._draining_udp
+        self._open_listeners.clear()
+        self._draining_udp = []
+        await self._close_listeners(listeners)
 
-        # Give handlers time to finish cleaning up
-        logger.debug("⏳ Waiting for handlers to finish...")
-        await asyncio.sleep(0.5)
+        if self.active_handlers:
+            await self._disconnect_phones()
+
+        # UDP sockets close on their loop's next pass; wait so the ports are free
+        if udp_endpoints:
+            await asyncio.wait(
+                [
+                    asyncio.ensure_future(
+                        shard.run(endpoint.wait_closed())
+                        if shard
+                        else endpoint.wait_closed()
+                    )
+                    for shard, endpoint in udp_endpoints
+                ],
+                timeout=1.0,
+            )
+        await asyncio.gather(*monitors, return_exceptions=True)
 
         # Stop all streams (mark as not running)
-        for phone_id in list(self.streams.keys()):
-            handler = self.streams[phone_id]
+        for handler in self.streams.values():
             handler.running = False  # Signal handler to stop
 
+        # Stop decode workers before the outputs they send to go away
+        self.decode_scheduler.shutdown()
+        if self.shard_pool:
+            await asyncio.to_thread(self.shard_pool.stop)
+            self.shard_pool = None
+
+        self._destroy_outputs()
+
+        if self._stopped:
+            self._stopped.set()
+        logger.info(
+            f"✅ Server stopped successfully ({(time.perf_counter() - started) * 1000:.0f} ms)"
+        )
+
+    def _destroy_outputs(self):
         # Destroy all outputs (DirectShow or OMT)
         for phone_id, output in self.outputs.items():
             try:
@@ -493,4 +1738,155 @@ class OMTBridgeServer:
             except Exception as e:
                 logger.error(f"Error destroying output for Phone {phone_id}: {e}")
 
-        logger.info("✅ Server stopped successfully")
+    async def _stop_observability(self):
+        if self.metrics_server:
+            await self.metrics_server.close()
+            self.metrics_server = None
+        await asyncio.to_thread(self.resource_sampler.stop)
+        await asyncio.to_thread(self.lag_monitor.stop)
+        if self.profiler and self.profiler.running:
+            await asyncio.to_thread(self.stop_profiling)
+
+    def _signal_disconnects(self):
+        if self._disconnect_signal_callback:
+            logger.info("📡 Notifying GUI of disconnections...")
+            for phone_id in list(self.active_handlers.keys()):
+                try:
+                    self._disconnect_signal_callback(phone_id, False, {})
+                    logger.debug(f"  Sent disconnect signal for phone {phone_id}")
+                except Exception as e:
+                    logger.error(
+                        f"  Error sending disconnect signal for phone {phone_id}: {e}"
+                    )
+
+    async def _disconnect_phones(self):
+        """Force disconnect all phones at once; each resolves its own done future"""
+        logger.info(
+            f"📴 Disconnecting {len(self.active_handlers)} active phone(s)..."
+        )
+        waiting = [
+            asyncio.ensure_future(
+                self._run_on_camera_loop(phone_id, handler.force_disconnect())
+            )
+            for phone_id, handler in list(self.active_handlers.items())
+        ]
+        waiting += [
+            asyncio.wrap_future(done)
+            for done in list(self._connection_done.values())
+            if not done.done()
+        ]
+        _, late = await asyncio.wait(waiting, timeout=2.0)
+        for future in late:
+            future.cancel()
+        if late:
+            logger.warning("⚠️  Phone disconnection timeout (some may still be active)")
+        else:
+            logger.info("✅ All phones disconnected")
+
+    def _decode_cpu_seconds(self) -> dict[int, float]:
+        """Cumulative decode worker CPU time per camera (for the resource sampler)"""
+        return {
+            phone_id: handler.decode_scheduler.cpu_seconds(phone_id)
+            for phone_id, handler in list(self.streams.items())
+            if handler.decode_scheduler
+        }
+
+    def get_deadline_stats(self) -> dict[int, dict[str, Any]]:
+        """Per-camera decode deadline counters (scheduled, shed, missed)"""
+        if not self.shard_pool:
+            return self.decode_scheduler.get_stats()
+        # Only the shard serving a camera has its live counters
+        stats = {}
+        for shard in self.shard_pool.shards:
+            for phone_id, entry in shard.scheduler.get_stats().items():
+                if self.shard_pool.shard_for(phone_id) is shard:
+                    stats[phone_id] = entry
+        return stats
+
+    def dump_trace(self, reason: str = "manual") -> str | None:
+        """Write the frame trace ring to a Chrome/Perfetto JSON file; its path"""
+        if not self.tracer:
+            logger.warning("⚠️ Frame tracing is off (start with trace=True / --trace)")
+            return None
+        return self.tracer.dump(reason)
+
+    def start_profiling(self, rate: float = 100.0) -> bool:
+        """Start sampling every thread's stack at ``rate`` Hz (False if already running)"""
+        if self.profiler and self.profiler.running:
+            return False
+        self.profiler = SamplingProfiler(rate, thread_camera=self._thread_camera)
+        self.profiler.start()
+        return True
+
+    def stop_profiling(self, fmt: str = "speedscope") -> str | None:
+        """Stop the profiler and write its samples (``speedscope`` or ``folded``); the file path"""
+        if not (self.profiler and self.profiler.running):
+            logger.warning("⚠️ Profiler is not running")
+            return None
+        self.profiler.stop()
+        return self.profiler.dump(fmt)
+
+    def _thread_camera(self, thread_id: int) -> int | None:
+        """Camera a thread is working for right now (profiler sampling thread)"""
+        loop = self._loop_threads.get(thread_id)
+        if loop is not None:
+            return loop_camera(loop)
+        schedulers = [self.decode_scheduler]
+        if self.shard_pool:
+            schedulers += [shard.scheduler for shard in self.shard_pool.shards]
+        for scheduler in schedulers:
+            camera = scheduler.running.get(thread_id)
+            if camera is not None:
+                return camera
+        return None
+
+    def dump_flight_recorders(
+        self, reason: str, phone_ids: list[int] | None = None
+    ) -> str | None:
+        """Write the connected cameras' (or ``phone_ids``') recent frame events; the file path"""
+        handlers = [
+            handler
+            for phone_id, handler in list(self.active_handlers.items())
+            if phone_ids is None or phone_id in phone_ids
+        ]
+        path = dump_recorders([handler.flight_recorder for handler in handlers], reason)
+        return str(path) if path else None
+
+    def get_latency_stats(self, window: float | None = 10.0) -> dict[int, dict[str, dict[int, float]]]:
+        """Per-camera, per-stage latency percentiles {50, 95, 99} over ``window`` seconds"""
+        return {
+            phone_id: handler.latency.summary(window)
+            for phone_id, handler in list(self.streams.items())
+        }
+
+    def get_network_quality(self) -> dict[int, dict[str, float]]:
+        """Per-camera link quality (goodput, jitter, queueing delay, drift)"""
+        return {
+            phone_id: handler.network_quality.as_dict()
+            for phone_id, handler in list(self.active_handlers.items())
+        }
+
+    def get_path_stats(self) -> dict[str, dict[str, Any]]:
+        """Per network path: state, counters, and the cameras using it now"""
+        stats = {
+            address: {**path.as_dict(), "cameras": [], "goodput_bps": 0.0}
+            for address, path in list(self.paths.items())
+        }
+        for phone_id, handler in list(self.active_handlers.items()):
+            if handler.local_address not in stats:
+                continue
+            entry = stats[handler.local_address]
+            entry["cameras"].append(phone_id)
+            entry["goodput_bps"] += handler.network_quality.goodput_bps
+        return stats
+
+    def get_shard_stats(self) -> list[dict[str, Any]]:
+        """Aggregated per-shard view: cameras, load and active connections"""
+        if not self.shard_pool:
+            return []
+        stats = self.shard_pool.get_stats()
+        for entry in stats:
+            entry["active"] = [
+                phone_id for phone_id in entry["cameras"] if phone_id in self.active_handlers
+            ]
+        return stats
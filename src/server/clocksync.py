@@ -0,0 +1,128 @@
+import itertools
+import logging
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClockSample:
+    """One ping/pong exchange (seconds; offset = phone clock - server clock)"""
+
+    offset: float
+    round_trip: float
+
+
+class ClockSync:
+    """
+    NTP-style offset estimate between the phone's capture clock and ours.
+
+    The server sends ``{"type": "ping", "id", "t0"}``; the phone answers with
+    ``{"type": "pong", "id", "t1", "t2"}`` where t1/t2 are its receive and send
+    times in the same clock and unit as the frame header timestamps. As in
+    NTP's clock filter, the offset comes from the exchange with the smallest
+    round trip among the recent ones, since queueing only adds error.
+    """
+
+    def __init__(
+        self, history: int = 8, fast_interval: float = 1.0, slow_interval: float = 5.0
+    ):
+        self.samples: deque[ClockSample] = deque(maxlen=history)
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+
+        self._ids = itertools.count(1)
+        self._outstanding: dict[int, float] = {}  # ping id -> t0 (server time)
+        self.unanswered = 0
+
+        # Capture-to-output latency, seconds
+        self.latencies: deque[float] = deque(maxlen=600)
+
+    def reset(self):
+        self.samples.clear()
+        self._outstanding.clear()
+        self.unanswered = 0
+        self.latencies.clear()
+
+    @property
+    def synced(self) -> bool:
+        return bool(self.samples)
+
+    @property
+    def offset(self) -> float | None:
+        if not self.samples:
+            return None
+        return min(self.samples, key=lambda s: s.round_trip).offset
+
+    @property
+    def round_trip(self) -> float | None:
+        if not self.samples:
+            return None
+        return min(s.round_trip for s in self.samples)
+
+    @property
+    def ping_interval(self) -> float:
+        """Ping often until the filter is full, then just track drift"""
+        if self.unanswered >= 5 and not self.samples:
+            return 30.0  # Phone doesn't speak ping; stay quiet
+        if len(self.samples) < self.samples.maxlen:  # type: ignore
+            return self.fast_interval
+        return self.slow_interval
+
+    def make_ping(self, now: float) -> dict:
+        ping_id = next(self._ids)
+        self._outstanding[ping_id] = now
+        self.unanswered += 1
+
+        # Forget pings that will never be answered
+        if len(self._outstanding) > 16:
+            self._outstanding.pop(next(iter(self._outstanding)))
+
+        return {"type": "ping", "id": ping_id, "t0": now}
+
+    def handle_pong(
+        self, message: dict, t3: float, ticks_per_second: float | None
+    ) -> ClockSample | None:
+        """Add a pong received at server time ``t3``; None if unusable"""
+        t0 = self._outstanding.pop(message.get("id"), None)  # type: ignore
+        if t0 is None:
+            return None
+        self.unanswered = 0
+
+        tps = message.get("ticksPerSecond") or ticks_per_second
+        if not tps:
+            return None  # Phone clock unit unknown until frames arrive
+
+        try:
+            t1 = float(message["t1"]) / tps
+            t2 = float(message["t2"]) / tps
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        round_trip = (t3 - t0) - (t2 - t1)
+        if round_trip < 0:
+            return None
+
+        sample = ClockSample(offset=((t1 - t0) + (t2 - t3)) / 2, round_trip=round_trip)
+        self.samples.append(sample)
+        return sample
+
+    def to_server_time(self, timestamp: int, ticks_per_second: float) -> float | None:
+        """Convert a phone timestamp to server time, if synced"""
+        offset = self.offset
+        if offset is None or timestamp <= 0:
+            return None
+        return timestamp / ticks_per_second - offset
+
+    def record_latency(self, latency: float):
+        self.latencies.append(latency)
+
+    def percentiles(self, points=(50, 95, 99)) -> dict[int, float] | None:
+        """Capture-to-output latency percentiles (seconds)"""
+        if not self.latencies:
+            return None
+        values = np.percentile(np.fromiter(self.latencies, dtype=np.float64), points)
+        return dict(zip(points, values.tolist()))
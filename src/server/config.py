@@ -1,4 +1,28 @@
 from dataclasses import dataclass
+from enum import IntEnum
+
+
+class CameraPriority(IntEnum):
+    """Resource priority for a camera (lower value = more important)"""
+    PROGRAM = 0  # On air: never shed, most decode threads, full bitrate
+    PREVIEW = 1  # Default: current behaviour
+    ISO = 2      # Recording/spare angle: degrade first under load
+
+
+@dataclass(frozen=True)
+class PriorityProfile:
+    """Resources granted to a camera at a given priority"""
+    decode_threads: int
+    preview_every: int    # Emit every Nth decoded frame to the GUI preview
+    bitrate_scale: float  # Fraction of the negotiated bitrate to request
+    sheddable: bool       # Whether the decode scheduler may drop/skip frames
+
+
+PRIORITY_PROFILES = {
+    CameraPriority.PROGRAM: PriorityProfile(4, 1, 1.0, False),
+    CameraPriority.PREVIEW: PriorityProfile(2, 1, 1.0, True),
+    CameraPriority.ISO: PriorityProfile(1, 3, 0.5, True),
+}
 
 @dataclass
 class StreamConfig:
@@ -16,4 +40,5 @@ class StreamConfig:
     audio_bitrate: int = 128_000    # Audio bitrate in bps
     device_model: str = "Unknown"
     battery_percent: int = -1
-    cpu_temperature_celsius: float = -1.0
\ No newline at end of file
+    cpu_temperature_celsius: float = -1.0
+    priority: CameraPriority = CameraPriority.PREVIEW
\ No newline at end of file
@@ -0,0 +1,158 @@
+import logging
+import time
+
+from .bitstream import AccessUnitInfo
+
+logger = logging.getLogger(__name__)
+
+# Decode tiers, lightest first: (name, PyAV skip_frame value)
+DECODE_MODES = [
+    ("FULL", "DEFAULT"),
+    ("BIDIR", "BIDIR"),  # Skip B-frames
+    ("NONREF", "NONREF"),  # Skip all non-reference frames
+    ("NONKEY", "NONKEY"),  # Keyframes only (phones rarely send non-ref frames)
+]
+
+
+class DecodeLoadController:
+    """
+    Per-camera degraded decode mode driven by decode time vs frame interval.
+
+    Steps one tier down (skip more) when the smoothed decode time stays above
+    ``high`` of the frame interval for ``up_hold`` seconds, and back up when it
+    stays below ``low`` for ``down_hold`` seconds. The asymmetric hold keeps a
+    camera from flapping between tiers.
+
+    Only frames that were actually decoded are fed in, so skipped frames
+    can't drag the average down. Going back to a tier that skips less waits
+    for the next IDR (``at_access_unit``). Switching mid-GOP would decode P
+    frames whose references were skipped.
+    """
+
+    def __init__(
+        self,
+        fps: int = 30,
+        high: float = 0.85,
+        low: float = 0.35,
+        up_hold: float = 0.5,
+        down_hold: float = 3.0,
+        alpha: float = 0.1,
+    ):
+        self.fps = fps
+        self.high = high
+        self.low = low
+        self.up_hold = up_hold
+        self.down_hold = down_hold
+        self.alpha = alpha
+
+        self.enabled = True
+        self.level = 0
+        self.ewma = 0.0
+        self.apply_pending = True
+        self.restore_level: int | None = None  # Lighter tier waiting for an IDR
+
+        self._over_since: float | None = None
+        self._under_since: float | None = None
+
+    @property
+    def mode(self) -> str:
+        return DECODE_MODES[self.level][0]
+
+    @property
+    def degraded(self) -> bool:
+        return self.level > 0
+
+    @property
+    def frame_interval(self) -> float:
+        return 1.0 / max(self.fps, 1)
+
+    def set_enabled(self, enabled: bool):
+        """Disable (e.g. for the program camera) to force full decode from the next IDR"""
+        self.enabled = enabled
+        if not enabled and self.level:
+            self.restore_level = 0
+
+    def reset(self):
+        """Back to full decode right away (new connection or decoder: it starts at an IDR)"""
+        self.ewma = 0.0
+        self._over_since = None
+        self._under_since = None
+        self.restore_level = None
+        if self.level:
+            self._set_level(0)
+        self.apply_pending = True
+
+    def apply(self, codec_context):
+        """Push the current tier onto a PyAV codec context"""
+        try:
+            codec_context.skip_frame = DECODE_MODES[self.level][1]
+        except Exception as e:
+            logger.debug(f"Could not set skip_frame: {e}")
+        self.apply_pending = False
+
+    def expects_skip(self, au: AccessUnitInfo | None) -> bool:
+        """True if the current tier makes the decoder drop this access unit"""
+        if not self.level or au is None:
+            return False
+        if self.mode == "NONKEY":
+            return not au.is_idr
+        return au.is_droppable
+
+    def at_access_unit(self, au: AccessUnitInfo | None) -> bool:
+        """Before decoding ``au``: take a pending lighter tier if it's an IDR; True if changed"""
+        if self.restore_level is None or au is None or not au.is_idr:
+            return False
+        self._set_level(self.restore_level)
+        return True
+
+    def record(self, decode_time: float, now: float | None = None) -> bool:
+        """
+        Feed the decode time of one decoded frame. Returns True if the tier
+        changed (to skip more; skipping less is only scheduled, see
+        ``at_access_unit``)
+        """
+        if not self.enabled:
+            return False
+
+        now = time.time() if now is None else now
+        self.ewma = (
+            decode_time
+            if self.ewma == 0.0
+            else self.ewma + self.alpha * (decode_time - self.ewma)
+        )
+        ratio = self.ewma / self.frame_interval
+
+        if ratio > self.high:
+            self._under_since = None
+            self.restore_level = None  # Still overloaded: stay where we are
+            if self._over_since is None:
+                self._over_since = now
+            elif (
+                now - self._over_since >= self.up_hold
+                and self.level < len(DECODE_MODES) - 1
+            ):
+                self._set_level(self.level + 1)
+                return True
+        elif ratio < self.low:
+            self._over_since = None
+            if self._under_since is None:
+                self._under_since = now
+            elif (
+                now - self._under_since >= self.down_hold
+                and self.level > 0
+                and self.restore_level is None
+            ):
+                self.restore_level = self.level - 1
+                self._under_since = None
+        else:
+            self._over_since = None
+            self._under_since = None
+
+        return False
+
+    def _set_level(self, level: int):
+        self.level = level
+        self.restore_level = None
+        self.apply_pending = True
+        self._over_since = None
+        self._under_since = None
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from .tracing import diagnostics_dir
+
+logger = logging.getLogger(__name__)
+
+# What became of a frame
+NOT_DECODED = -1  # Metadata/config, audio while disabled, or still in flight
+FAILED = 0
+DECODED = 1
+SHED = 2  # Dropped by the decode scheduler to meet deadlines
+
+# One record per frame read from the phone
+EVENT_DTYPE = np.dtype(
+    [
+        ("time", "f8"),  # Wall clock when the header arrived
+        ("frame", "u4"),  # Frame number on this connection
+        ("type", "u1"),  # Header frame type (video/audio/config/metadata)
+        ("flags", "u4"),  # Header flags (keyframe, codec config)
+        ("size", "u4"),  # Payload bytes
+        ("timestamp", "u8"),  # Header timestamp (phone clock)
+        ("read_ms", "f4"),  # Payload arrival after the header
+        ("decode_ms", "f4"),
+        ("process_ms", "f4"),  # Received → handled (decoded and sent for video)
+        ("result", "i1"),
+        ("decode_queue", "u2"),  # Jobs waiting in the decode scheduler
+        ("audio_buffer", "u2"),  # Packets held in the audio jitter buffer
+    ]
+)
+
+DUMP_SECONDS = 30.0
+
+# Every live recorder, so a crash handler can dump them without a server reference
+_recorders: "weakref.WeakSet[FlightRecorder]" = weakref.WeakSet()
+
+
+class FlightRecorder:
+    """
+    Always-on ring of the last few thousand frame events for one camera.
+
+    Records are fixed-size rows of a numpy structured array (about 48 bytes
+    each), written in place: no strings, no allocation per frame. The ring
+    only reaches disk when something goes wrong (watchdog trip, decoder
+    reset, network loss, crash), as the last ``DUMP_SECONDS`` leading up
+    to it.
+    """
+
+    def __init__(self, camera_id: int, capacity: int = 8192, min_dump_interval: float = 10.0):
+        """
+        Args:
+            camera_id: Camera the events belong to
+            capacity: Events kept (video + audio + metadata is ~80/s at 30fps)
+            min_dump_interval: Seconds between dumps for the same reason
+        """
+        self.camera_id = camera_id
+        self.capacity = capacity
+        self.min_dump_interval = min_dump_interval
+        self.events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.count = 0  # Events recorded
+
+        # Field views for finish(), which updates a record after decoding
+        self._decode_ms = self.events["decode_ms"]
+        self._process_ms = self.events["process_ms"]
+        self._result = self.events["result"]
+
+        self._last_dump: dict[str, float] = {}
+        _recorders.add(self)
+
+    def record(
+        self,
+        receive_time: float,
+        frame: int,
+        frame_type: int,
+        flags: int,
+        size: int,
+        timestamp: int,
+        read_time: float,
+        decode_queue: int = 0,
+        audio_buffer: int = 0,
+    ) -> int:
+        """Store a frame as it arrives; returns its slot for finish()"""
+        i = self.count % self.capacity
+        self.events[i] = (
+            receive_time,
+            frame,
+            frame_type,
+            flags,
+            size,
+            timestamp,
+            read_time * 1000,
+            0.0,
+            0.0,
+            NOT_DECODED,
+            min(decode_queue, 0xFFFF),
+            min(audio_buffer, 0xFFFF),
+        )
+        self.count += 1
+        return i
+
+    def finish(self, slot: int, result: int, decode_time: float, process_time: float):
+        """Fill in how a recorded frame was handled"""
+        self._decode_ms[slot] = decode_time * 1000
+        self._process_ms[slot] = process_time * 1000
+        self._result[slot] = result
+
+    def snapshot(self, seconds: float | None = DUMP_SECONDS) -> np.ndarray:
+        """Copy of the events from the last ``seconds`` (None: all), oldest first"""
+        count = min(self.count, self.capacity)
+        order = np.arange(count)
+        if self.count > self.capacity:
+            order = (order + self.count) % self.capacity
+        events = self.events[order]
+        if seconds is not None:
+            events = events[events["time"] >= time.time() - seconds]
+        return events
+
+    def dump(self, reason: str) -> Path | None:
+        """Write this camera's recent events, unless the same reason dumped just now"""
+        now = time.monotonic()
+        if now - self._last_dump.get(reason, -float("inf")) < self.min_dump_interval:
+            return None
+        self._last_dump[reason] = now
+        return dump_recorders([self], f"{reason}-cam{self.camera_id}")
+
+
+def dump_recorders(
+    recorders: list[FlightRecorder],
+    reason: str,
+    seconds: float | None = DUMP_SECONDS,
+    dump_dir: Path | None = None,
+    background: bool = True,
+) -> Path | None:
+    """
+    Write the recorders' recent events to one .npz (an array per camera,
+    ``camera_<id>``, plus an ``info`` JSON string); returns its path.
+
+    The rings are copied right away; compressing and writing (tens of ms
+    per camera) happen on a background thread, so the camera loop that hit
+    the failure keeps serving its neighbours. ``background=False`` writes
+    before returning, for crash handlers where the process is about to die.
+
+    Load with ``np.load(path)["camera_1"]``.
+    """
+    recorders = [r for r in recorders if r.count]
+    if not recorders:
+        return None
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = (dump_dir or diagnostics_dir("flight")) / f"flight_{stamp}_{reason}.npz"
+    arrays = {f"camera_{r.camera_id}": r.snapshot(seconds) for r in recorders}
+    info = {
+        "reason": reason,
+        "time": time.time(),
+        "pid": os.getpid(),
+        "seconds": seconds,
+        "events": {name: len(events) for name, events in arrays.items()},
+    }
+
+    def write():
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez_compressed(path, info=np.array(json.dumps(info)), **arrays)
+        except OSError as e:
+            logger.error(f"❌ Could not write flight recorder dump {path}: {e}")
+            return
+        logger.warning(
+            f"🛩️ Flight recorder dump ({reason}): {path} "
+            f"({sum(info['events'].values())} events, {len(arrays)} camera(s))"
+        )
+
+    if background:
+        threading.Thread(target=write, name="flight-dump", daemon=True).start()
+    else:
+        write()
+    return path
+
+
+def dump_all(reason: str) -> Path | None:
+    """Dump every live recorder in the process, synchronously (crash handlers)"""
+    return dump_recorders(list(_recorders), reason, background=False)
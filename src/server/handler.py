@@ -1,15 +1,17 @@
 import asyncio
+import base64
 import gc
 import json
 import logging
+import os
+import secrets
+import socket
 import struct
 import time
-from collections import deque
 
 import av
 import cv2
 import numpy as np
-import psutil
 
 from omt.types import (
     FRAME_TYPE_AUDIO,
@@ -18,15 +20,33 @@ from omt.types import (
     FRAME_TYPE_VIDEO,
 )
 
-from .config import StreamConfig
+from .audiolane import AUDIO_LANE_SEPARATE, AudioJitterBuffer, new_lane_token
+from .bitstream import BitstreamInspector
+from .clocksync import ClockSync
+from .config import PRIORITY_PROFILES, CameraPriority, StreamConfig
+from .degradation import DecodeLoadController
+from .flightrecorder import DECODED, FAILED, SHED, FlightRecorder
+from .latency import StageLatency
+from .logconfig import rate_limited
+from .tracing import CONVERT, DECODE, PREVIEW, QUEUE, READ, SEND
+from .metrics import CameraMetrics
 from .outputs import FrameOutput, OMTOutput
-
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from .profiler import camera_task_name
+from .telemetry import NetworkQuality, NetworkTelemetry
 
 logger = logging.getLogger(__name__)
 
+MAX_DECODE_FAILURES = 30  # In a row (1 second at 30fps) before the decoder is replaced
+
+
+def encode_control(message: dict) -> bytes:
+    """Frame a server → phone JSON control message (metadata frame, 17-byte header)"""
+    payload = json.dumps(message).encode("utf-8")
+    header = bytes([FRAME_TYPE_METADATA]) + struct.pack(
+        ">IIQ", len(payload), 0, int(time.time() * 1000)
+    )
+    return header + payload
+
 
 class PhoneStreamHandler:
     """Handles a single phone's H.264 + AAC stream"""
@@ -69,11 +89,206 @@ class PhoneStreamHandler:
         self.aac_sample_rate_index = 3  # 48000 Hz
         self.aac_channel_config = 2  # Stereo
 
-        # Latency tracking
-        self.latency_samples = deque(maxlen=30)
-        self.average_latency = 0.0
+        # Per-stage latency histograms (read, decode, convert, send, preview, process)
+        self.latency = StageLatency()
+
+        # Optional frame lifecycle tracer (FrameTracer, shared by all cameras)
+        self.tracer = None
+        self._trace_frame = 0  # Connection frame number of the frame in flight
+        self._queued_at = 0.0  # When it was handed to the decode scheduler
+        self._decode_time = 0.0  # Decode time of the frame in flight
         self.bytes_received = 0
 
+        # Last frame events, written to disk on watchdog trips, decoder resets, crashes
+        self.flight_recorder = FlightRecorder(config.phone_id)
+
+        # Server-wide resource sampler (ResourceSampler, set by OMTBridgeServer)
+        self.resources = None
+
+        # Counters and stage histograms for the metrics endpoint
+        self.metrics = CameraMetrics()
+
+        # H.264 bitstream inspection (NAL types, SPS, GOP stats)
+        self.bitstream = BitstreamInspector(config.fps)
+        self.last_access_unit = None
+
+        # Link quality from header timestamps vs arrival (jitter, delay, drift)
+        self.telemetry = NetworkTelemetry()
+
+        # Phone clock offset (ping/pong) for capture-to-output latency
+        self.clock_sync = ClockSync()
+        self._next_ping = 0.0
+        self._frame_timestamp = 0  # Header timestamp of the frame being processed
+
+        # Optional separate audio connection (no head-of-line blocking behind IDRs)
+        self.audio_lane_token: str | None = None
+        self.audio_lane_connected = False
+        self.audio_telemetry = NetworkTelemetry(capacity=512)  # Audio arrival jitter
+        self.audio_jitter = AudioJitterBuffer()
+        self.lane_audio_decoded = 0
+        self._audio_lane: tuple[asyncio.AbstractEventLoop, asyncio.StreamWriter] | None = None
+        self._audio_wakeup: asyncio.Event | None = None
+        self._playout_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        # Current connection's frame counts (the periodic log line)
+        self.video_frames_decoded = 0
+        self.audio_frames_decoded = 0  # Arriving on the main connection
+        self._decode_failures = 0  # Consecutive, reset on success
+
+        # Shared EDF decode scheduler (set by OMTBridgeServer; None = decode inline)
+        self.decode_scheduler = None
+        self.frame_shed = False  # Last video frame was dropped to meet deadlines
+
+        # Resource priority (program/preview/ISO)
+        self.priority = config.priority
+        self.video_bitrate = config.video_bitrate  # Negotiated with the phone
+        self.requested_bitrate = 0  # Last bitrate asked of the phone (0 = none)
+        self._codec_config_data = None  # SPS/PPS, replayed into new decoders
+        self._decoder_rebuild_pending = False
+
+        # Config already read by the single-port listener while routing
+        self._pending_config: dict | None = None
+
+        # Resumable session: a reconnect presenting the token keeps decoder,
+        # output and stats, and may replace a stale connection at once
+        self.session_token: str | None = None
+        self.resume_window = 15.0  # Seconds a dropped session stays resumable
+        self.resumed = False  # Current connection resumed a session
+        self.resume_count = 0
+        self.superseded = False  # Current connection is being replaced
+        self._session_expires = 0.0
+
+        # Network path (local address) the phone reached us on; a resume may
+        # arrive on another one, e.g. USB tether after Wi-Fi drops
+        self.local_address: str | None = None
+        self.server_paths: list[str] = []  # Offered to the phone for failover
+        self.path_moves = 0
+        self._path_move_callback = None
+
+        # Process handover: the phone's config handshake, kept so a successor
+        # process can adopt the connection without another one
+        self.config_json: dict | None = None
+        self.detaching = False  # Current connection is leaving for another process
+        self._detached: asyncio.Future | None = None
+        self._handler_task: asyncio.Task | None = None
+        self._between_frames = False  # Awaiting a frame header (safe to cancel)
+        self._handover: dict | None = None  # State from the previous process
+
+        # Degraded decode (skip_frame tiers) under sustained decode overload
+        self.decode_load = DecodeLoadController(config.fps)
+        self.decode_load.set_enabled(self.priority_profile.sheddable)
+
+    @property
+    def priority_profile(self):
+        return PRIORITY_PROFILES[self.priority]
+
+    @property
+    def processing_latency(self) -> dict[int, float] | None:
+        """Receive-to-output latency percentiles {50, 95, 99} over the last 10 s"""
+        return self.latency.process.percentiles()
+
+    @property
+    def glass_to_glass(self) -> dict[int, float] | None:
+        """Capture-to-output latency percentiles {50, 95, 99} in seconds, once synced"""
+        return self.clock_sync.percentiles()
+
+    def capture_time(self, timestamp: int) -> float | None:
+        """Server-clock capture time of a frame header timestamp, if synced"""
+        tps = self.telemetry.ticks_per_second
+        if not tps:
+            return None
+        return self.clock_sync.to_server_time(timestamp, tps)
+
+    @property
+    def network_quality(self) -> NetworkQuality:
+        """Link quality over the last few seconds"""
+        return self.telemetry.snapshot()
+
+    @property
+    def preview_every(self) -> int:
+        """Emit every Nth decoded frame to the GUI preview"""
+        return self.priority_profile.preview_every
+
+    @property
+    def preview_step(self) -> int:
+        """Pixel decimation for the GUI preview (2 = half resolution)"""
+        return 2 if self.decode_load.degraded else 1
+
+    def set_priority(self, priority: CameraPriority):
+        """Change resource priority; applied to the decoder at the next IDR"""
+        if priority == self.priority:
+            return
+
+        old_threads = self.priority_profile.decode_threads
+        self.priority = priority
+        logger.info(f"🎚️ Phone {self.config.phone_id}: Priority → {priority.name}")
+
+        if self.decode_scheduler:
+            self.decode_scheduler.set_priority(self.config.phone_id, priority)
+
+        self.decode_load.set_enabled(self.priority_profile.sheddable)
+        if self.decode_load.restore_level is not None and self.running:
+            self.send_control({"type": "requestKeyframe"})  # Full decode resumes at the IDR
+
+        if self.priority_profile.decode_threads != old_threads and self.video_decoder:
+            self._decoder_rebuild_pending = True
+
+        if self.running:
+            self.request_bitrate(int(self.video_bitrate * self.priority_profile.bitrate_scale))
+
+    def _create_video_decoder(self):
+        """Create the H.264 decoder sized for the current priority"""
+        self.video_decoder = av.CodecContext.create("h264", "r")
+        self.video_decoder.thread_type = "AUTO"
+        self.video_decoder.thread_count = self.priority_profile.decode_threads
+
+        # Ultra low latency options
+        self.video_decoder.options = {
+            "flags": "low_delay",  # Enable low delay mode
+            "flags2": "fast",  # Fast decoding
+            # "fflags": "nobuffer",  # Don't buffer frames
+            # "analyzeduration": "0",  # Don't analyze stream
+            # "probesize": "32",  # Minimal probe
+            "sync": "ext",  # External sync
+        }
+
+        # A fresh decoder needs SPS/PPS before the next IDR can be decoded
+        if self._codec_config_data:
+            try:
+                list(self.video_decoder.decode(av.Packet(self._codec_config_data)))
+            except Exception as e:
+                logger.debug(f"Codec config replay warning: {e}")
+
+        self._decoder_rebuild_pending = False
+        self.decode_load.apply_pending = True
+
+    def send_control(self, message: dict) -> bool:
+        """Send a JSON control message to the phone (server → phone metadata frame)"""
+        if not self.writer or self.writer.is_closing():
+            return False
+
+        try:
+            self.writer.write(encode_control(message))
+            return True
+        except Exception as e:
+            logger.warning(
+                f"Phone {self.config.phone_id}: Control message failed: {e}",
+                extra=rate_limited(self.config.phone_id),
+            )
+            return False
+
+    def request_bitrate(self, bitrate: int):
+        """Ask the phone's encoder to target ``bitrate`` bits per second"""
+        if bitrate <= 0 or bitrate == self.requested_bitrate:
+            return
+
+        if self.send_control({"type": "setBitrate", "bitrate": bitrate}):
+            self.requested_bitrate = bitrate
+            logger.info(
+                f"📶 Phone {self.config.phone_id}: Requested {bitrate / 1_000_000:.1f} Mbps"
+            )
+
     async def handle_client(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ):
@@ -86,12 +301,90 @@ class PhoneStreamHandler:
         self.writer = writer
         self.reader = reader
         self._force_stop = False
+        self.superseded = False
+        self.detaching = False
+        self.metrics.connections += 1
+        previous_address = self.local_address
+        local = writer.get_extra_info("sockname")
+        self.local_address = local[0] if local else None
+        self._loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        self._handler_task = task
+        if task:
+            task.set_name(camera_task_name(self.config.phone_id))  # Profiler attribution
+
+        self._configure_socket(writer)
+
+        self.running = True
+        self.last_frame_time = time.time()
+
+        # Start connection watchdog
+        self.watchdog_task = asyncio.create_task(
+            self.connection_watchdog(), name=camera_task_name(self.config.phone_id)
+        )
+
+        try:
+            # Wait for configuration packet FIRST
+            config_received = await self.receive_config(reader)
+
+            if self.resumed:
+                self._continue_session(previous_address)
+            else:
+                self._start_session(config_received)
+
+            self._next_ping = 0.0
+            if self.audio_lane_token:
+                self._audio_wakeup = asyncio.Event()
+                self._playout_task = asyncio.create_task(
+                    self._audio_playout(), name=camera_task_name(self.config.phone_id)
+                )
+
+            logger.info(
+                f"⏳ Phone {self.config.phone_id}: Ready for streaming ({self._status_summary()})"
+            )
+
+            await self._stream_frames(reader)
+            self._log_disconnect_reason()
+
+        except asyncio.CancelledError:
+            logger.info(f"🛑 Phone {self.config.phone_id}: Handler cancelled")
+            raise
+        except Exception as e:
+            logger.error(
+                f"❌ Error handling Phone {self.config.phone_id}: {e}", exc_info=True
+            )
+        finally:
+            self.running = False
+            await self._end_session(reader, writer)
+            await self._stop_connection_tasks()
+
+            # Properly close the connection
+            try:
+                if writer and not writer.is_closing() and not self.detaching:
+                    writer.close()
+                    await writer.wait_closed()
+                    logger.debug(f"Phone {self.config.phone_id}: Connection closed")
+            except Exception as e:
+                logger.warning(
+                    f"Error closing writer for phone {self.config.phone_id}: {e}"
+                )
+
+            # Call disconnect callback for GUI update
+            if self._disconnect_callback and not self.superseded and not self.detaching:
+                try:
+                    self._disconnect_callback(self.config.phone_id)
+                except Exception as e:
+                    logger.error(f"Error in disconnect callback: {e}")
+
+            # Clear references
+            self.writer = None
+            self.reader = None
+            logger.info(f"📵 Phone {self.config.phone_id} disconnected")
 
+    def _configure_socket(self, writer: asyncio.StreamWriter):
         sock = writer.get_extra_info("socket")
         if sock:
             try:
-                import socket
-
                 sock.setsockopt(
                     socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024
                 )  # 256KB receive buffer
@@ -104,414 +397,826 @@ class PhoneStreamHandler:
             except Exception as e:
                 logger.warning(f"Could not configure socket: {e}")
 
-        self.running = True
-        self.last_frame_time = time.time()
+    def _continue_session(self, previous_address: str | None):
+        """Same phone, same stream: decoder, OMT sender and stats carry over"""
+        self.resume_count += 1
+        logger.info(
+            f"♻️ Phone {self.config.phone_id}: Session resumed "
+            f"(decoder, output and stats kept, resume #{self.resume_count})"
+        )
+        if self.requested_bitrate:
+            self.send_control(
+                {"type": "setBitrate", "bitrate": self.requested_bitrate}
+            )
+        if previous_address and previous_address != self.local_address:
+            self.path_moves += 1
+            logger.info(
+                f"🔀 Phone {self.config.phone_id}: Session moved from path "
+                f"{previous_address} to {self.local_address}"
+            )
+            if self._path_move_callback:
+                self._path_move_callback(
+                    self.config.phone_id, previous_address, self.local_address
+                )
 
-        # Start connection watchdog
-        self.watchdog_task = asyncio.create_task(self.connection_watchdog())
+    def _start_session(self, config_received: bool):
+        """Fresh stream state for a new session (or one adopted from a handover)"""
+        if config_received:
+            # Reconfigure OMT sender with received settings
+            if isinstance(self.output, OMTOutput):
+                success = self.output.reconfigure(
+                    self.current_width, self.current_height, self.current_fps
+                )
+                if not success:
+                    logger.error(
+                        "❌ Failed to reconfigure OMT, using default settings"
+                    )
+        else:
+            logger.warning(
+                f"⚠️ Phone {self.config.phone_id}: No config received, using defaults"
+            )
 
-        try:
-            # Wait for configuration packet FIRST
-            config_received = await self.receive_config(reader)
+        self.bitstream.fps = self.current_fps
+        self.bitstream.reset()
+        self.decode_load.fps = self.current_fps
+        self.decode_load.reset()
+
+        # Initialize decoders AFTER receiving config
+        handover, self._handover = self._handover, None
+        self._start_decoders(handover or {})
+
+        self.telemetry.reset()
+        self.clock_sync.reset()
+        self.audio_telemetry.reset()
+        self.audio_jitter.reset()
+        self.lane_audio_decoded = 0
+
+    def _start_decoders(self, handover: dict):
+        """Create the decoders; ``handover`` is the previous process's state, if any"""
+        self._codec_config_data = None
+        if handover.get("codecConfig"):
+            # Mid-stream: the SPS/PPS went to the previous process
+            self._codec_config_data = base64.b64decode(handover["codecConfig"])
+        self._create_video_decoder()
+        if handover:
+            self.send_control({"type": "requestKeyframe"})
+
+        # Non-default priorities start from a scaled bitrate
+        if handover.get("requestedBitrate"):
+            self.request_bitrate(handover["requestedBitrate"])
+        elif self.priority_profile.bitrate_scale != 1.0:
+            self.request_bitrate(
+                int(self.video_bitrate * self.priority_profile.bitrate_scale)
+            )
 
-            if config_received:
-                # Reconfigure OMT sender with received settings
-                if isinstance(self.output, OMTOutput):
-                    success = self.output.reconfigure(
-                        self.current_width, self.current_height, self.current_fps
+        if self.audio_enabled:
+            self.audio_decoder = av.CodecContext.create("aac", "r")
+            logger.info(f"🔊 Phone {self.config.phone_id}: Audio enabled")
+        else:
+            logger.info(f"🔇 Phone {self.config.phone_id}: Audio disabled")
+
+    def _temperature_icon(self) -> str:
+        if self.cpu_temperature_celsius < 50:
+            return "❄️"
+        if self.cpu_temperature_celsius < 70:
+            return "🌡️"
+        if self.cpu_temperature_celsius < 85:
+            return "🔥"
+        return "💥"
+
+    def _status_summary(self) -> str:
+        """Device, format, battery and temperature for the ready log line"""
+        status_parts = [
+            f"{self.device_model}",
+            f"{self.current_width}x{self.current_height}@{self.current_fps}fps",
+        ]
+        if self.battery_percent >= 0:
+            status_parts.append(f"🔋{self.battery_percent}%")
+        if self.cpu_temperature_celsius > 0:
+            status_parts.append(
+                f"{self._temperature_icon()}{self.cpu_temperature_celsius:.1f}°C"
+            )
+        return ", ".join(status_parts)
+
+    async def _stream_frames(self, reader: asyncio.StreamReader):
+        """Main streaming loop: read and dispatch frames until the connection ends"""
+        frames_received = 0
+        self.video_frames_decoded = 0
+        self.audio_frames_decoded = 0
+        self._decode_failures = 0
+
+        while self.running and not self._force_stop and not self.detaching:
+            # Update last frame time
+            self.last_frame_time = time.time()
+
+            header = await self._read_frame_header(reader)
+            if header is None:
+                break
+            frame_type, size, flags, timestamp = header
+            if frames_received == 0:
+                self._log_first_frame(frame_type)
+
+            # Mark receive time for latency tracking
+            receive_time = time.time()
+            read_started = time.perf_counter()
+
+            data = await self._read_frame_data(reader, size)
+            if data is None:
+                break
+
+            frames_received += 1
+            event = self._record_frame(frames_received, header, receive_time, read_started)
+
+            # Process based on frame type
+            if frame_type == FRAME_TYPE_VIDEO:
+                await self._receive_video(data, flags, receive_time, event)
+            elif frame_type == FRAME_TYPE_AUDIO and self.audio_enabled:
+                await self._receive_audio(data, flags, timestamp, receive_time, event)
+            elif frame_type == FRAME_TYPE_METADATA and len(data) > 0:
+                self.metrics.metadata_received += 1
+                self._handle_metadata(data, receive_time)
+
+            # Periodic logging (every 3 seconds)
+            if frames_received % 90 == 0:
+                self._log_stream_stats()
+
+                # Force garbage collection every 5 minutes
+                if frames_received % 9000 == 0:  # ~5 minutes at 30fps
+                    gc.collect()
+                    logger.debug(
+                        f"Phone {self.config.phone_id}: Garbage collection triggered"
                     )
-                    if not success:
-                        logger.error(
-                            "❌ Failed to reconfigure OMT, using default settings"
-                        )
+
+    def _log_first_frame(self, frame_type: int):
+        frame_type_str = {
+            FRAME_TYPE_VIDEO: "Video",
+            FRAME_TYPE_AUDIO: "Audio",
+            FRAME_TYPE_CONFIG: "Config",
+            FRAME_TYPE_METADATA: "Metadata",
+        }.get(frame_type, f"Unknown(0x{frame_type:02x})")
+        logger.info(
+            f"🎬 Phone {self.config.phone_id}: First frame! Type: {frame_type_str}"
+        )
+
+    def _record_frame(
+        self,
+        frames_received: int,
+        header: tuple[int, int, int, int],
+        receive_time: float,
+        read_started: float,
+    ):
+        """Read timing, trace, flight recorder and arrival telemetry for a frame just read"""
+        frame_type, size, flags, timestamp = header
+        read_done = time.perf_counter()
+        self.latency.read.observe(read_done - read_started)
+        self._trace_frame = frames_received
+        if self.tracer:
+            self.tracer.span(
+                self.config.phone_id, frames_received, READ, read_started, read_done
+            )
+
+        event = self.flight_recorder.record(
+            receive_time,
+            frames_received,
+            frame_type,
+            flags,
+            size,
+            timestamp,
+            read_done - read_started,
+            self.decode_scheduler.pending if self.decode_scheduler else 0,
+            len(self.audio_jitter),
+        )
+
+        self.bytes_received += size
+        # Audio may be stamped from a different clock; count it for goodput only
+        self.telemetry.record(
+            timestamp, receive_time, size, timed=frame_type == FRAME_TYPE_VIDEO
+        )
+        self._frame_timestamp = timestamp
+
+        if receive_time >= self._next_ping:
+            self.send_control(self.clock_sync.make_ping(receive_time))
+            self._next_ping = receive_time + self.clock_sync.ping_interval
+        return event
+
+    async def _read_frame_header(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[int, int, int, int] | None:
+        """(frame type, size, flags, timestamp) of the next frame; None to stop reading"""
+        try:
+            # A cancelled readexactly() consumes nothing, so detach() can stop here
+            self._between_frames = True
+            header = await asyncio.wait_for(
+                reader.readexactly(17), timeout=10.0  # 1 byte type + 16 bytes header
+            )
+        except asyncio.IncompleteReadError:
+            if self._force_stop:
+                logger.info(
+                    f"🛑 Phone {self.config.phone_id}: Server initiated disconnect"
+                )
             else:
-                logger.warning(
-                    f"⚠️ Phone {self.config.phone_id}: No config received, using defaults"
+                logger.info(
+                    f"📵 Phone {self.config.phone_id}: Connection ended (client disconnect)"
+                )
+            return None
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"⏰ Phone {self.config.phone_id}: No data after 10s"
+            )
+            return None
+        except asyncio.CancelledError:
+            if not self.detaching:  # Otherwise detach() woke us between frames
+                logger.info(
+                    f"🛑 Phone {self.config.phone_id}: Connection cancelled by server"
                 )
+            return None
+        except Exception as e:
+            logger.error(
+                f"❌ Phone {self.config.phone_id}: Error reading header: {e}"
+            )
+            return None
+        finally:
+            self._between_frames = False
+        return self._parse_frame_header(header)
 
-            # Initialize decoders AFTER receiving config
-            self.video_decoder = av.CodecContext.create("h264", "r")
-            self.video_decoder.thread_type = "AUTO"
-            self.video_decoder.thread_count = 2
-
-            # Ultra low latency options
-            self.video_decoder.options = {
-                "flags": "low_delay",  # Enable low delay mode
-                "flags2": "fast",  # Fast decoding
-                # "fflags": "nobuffer",  # Don't buffer frames
-                # "analyzeduration": "0",  # Don't analyze stream
-                # "probesize": "32",  # Minimal probe
-                "sync": "ext",  # External sync
-            }
-
-            if self.audio_enabled:
-                self.audio_decoder = av.CodecContext.create("aac", "r")
-                logger.info(f"🔊 Phone {self.config.phone_id}: Audio enabled")
-            else:
-                logger.info(f"🔇 Phone {self.config.phone_id}: Audio disabled")
-
-            frames_received = 0
-            video_frames_decoded = 0
-            audio_frames_decoded = 0
-
-            # Build status string with device info
-            status_parts = [
-                f"{self.device_model}",
-                f"{self.current_width}x{self.current_height}@{self.current_fps}fps",
-            ]
-            if self.battery_percent >= 0:
-                status_parts.append(f"🔋{self.battery_percent}%")
-            if self.cpu_temperature_celsius > 0:
-                if self.cpu_temperature_celsius < 50:
-                    temp_icon = "❄️"
-                elif self.cpu_temperature_celsius < 70:
-                    temp_icon = "🌡️"
-                elif self.cpu_temperature_celsius < 85:
-                    temp_icon = "🔥"
-                else:
-                    temp_icon = "💥"
-                status_parts.append(f"{temp_icon}{self.cpu_temperature_celsius:.1f}°C")
+    def _parse_frame_header(self, header: bytes) -> tuple[int, int, int, int] | None:
+        # Unpack header with frame type
+        try:
+            frame_type = header[0]
+            size, flags, timestamp = struct.unpack(">IIQ", header[1:])
+        except struct.error as e:
+            logger.error(
+                f"📦 Phone {self.config.phone_id}: Bad header. Error: {e}"
+            )
+            return None
 
+        # Sanity check
+        if size == 0 or size > 10_000_000:
+            logger.error(
+                f"📦 Phone {self.config.phone_id}: Invalid frame size: {size} bytes"
+            )
+            return None
+        return frame_type, size, flags, timestamp
+
+    async def _read_frame_data(
+        self, reader: asyncio.StreamReader, size: int
+    ) -> bytes | None:
+        """A frame's payload; None to stop reading"""
+        try:
+            return await asyncio.wait_for(reader.readexactly(size), timeout=5.0)
+        except asyncio.IncompleteReadError as e:
+            logger.error(
+                f"❌ Phone {self.config.phone_id}: Incomplete frame: {len(e.partial)}/{size} bytes"
+            )
+        except asyncio.TimeoutError:
+            logger.error(
+                f"⏰ Phone {self.config.phone_id}: Timeout reading {size} bytes"
+            )
+        except asyncio.CancelledError:
+            logger.info(f"🛑 Phone {self.config.phone_id}: Read cancelled")
+        except Exception as e:
+            logger.error(f"❌ Phone {self.config.phone_id}: Error: {e}")
+        return None
+
+    async def _receive_video(self, data: bytes, flags: int, receive_time: float, event):
+        """Inspect and decode one video frame, replacing the decoder if it keeps failing"""
+        self.metrics.video_received += 1
+        self.last_access_unit = self.bitstream.inspect(data)
+        sps = self.bitstream.sps
+        if (
+            self.last_access_unit.has_sps
+            and sps
+            and (sps.width, sps.height)
+            != (self.current_width, self.current_height)
+        ):
+            logger.warning(
+                f"⚠️ Phone {self.config.phone_id}: SPS resolution {sps.width}x{sps.height} "
+                f"differs from negotiated {self.current_width}x{self.current_height}",
+                extra=rate_limited(self.config.phone_id),
+            )
+
+        # Apply a pending decoder thread change where no references are lost
+        if self._decoder_rebuild_pending and self.last_access_unit.is_idr:
+            self._create_video_decoder()
             logger.info(
-                f"⏳ Phone {self.config.phone_id}: Ready for streaming ({', '.join(status_parts)})"
+                f"🔁 Phone {self.config.phone_id}: Decoder rebuilt with "
+                f"{self.priority_profile.decode_threads} threads"
             )
 
-            frame_decode_failures = 0
-            max_decode_failures = 30  # (1 second at 30fps)
+        decoded = await self.process_video_frame(data, flags, receive_time)
+        self.flight_recorder.finish(
+            event,
+            DECODED if decoded else SHED if self.frame_shed else FAILED,
+            self._decode_time,
+            time.time() - receive_time,
+        )
+        if decoded:
+            self.video_frames_decoded += 1
+            self.metrics.video_decoded += 1
+            self._decode_failures = 0
+        elif not self.frame_shed:
+            self.metrics.decode_errors += 1
+            self._decode_failures += 1
+            if self._decode_failures >= MAX_DECODE_FAILURES:
+                await self._recover_decoder(self._decode_failures)
+                self._decode_failures = 0  # Also after a failed attempt: no immediate retry
+
+    async def _receive_audio(
+        self, data: bytes, flags: int, timestamp: int, receive_time: float, event
+    ):
+        self.metrics.audio_received += 1
+        self.audio_telemetry.record(timestamp, receive_time, len(data))
+        decoded = await self.process_audio_frame(data, flags, receive_time)
+        self.flight_recorder.finish(
+            event, DECODED if decoded else FAILED, 0.0, time.time() - receive_time
+        )
+        if decoded:
+            self.audio_frames_decoded += 1
+            self.metrics.audio_decoded += 1
+
+    async def _recover_decoder(self, failures: int):
+        """Replace a decoder that keeps failing"""
+        logger.warning(
+            f"⚠️ Phone {self.config.phone_id}: {failures} consecutive decode failures, "
+            f"resetting decoder..."
+        )
+        self.flight_recorder.dump("decoder-reset")
+        try:
+            # Don't try to flush - just abandon and recreate
+            self.video_decoder = None  # Release reference
 
-            # Main streaming loop
-            while self.running and not self._force_stop:
-                # Update last frame time
-                self.last_frame_time = time.time()
+            # Small delay to let things settle
+            await asyncio.sleep(0.1)
 
-                # Read frame header
-                try:
-                    header = await asyncio.wait_for(
-                        reader.readexactly(17),  # 1 byte type + 16 bytes header
-                        timeout=10.0,
-                    )
-                except asyncio.IncompleteReadError:
-                    if self._force_stop:
-                        logger.info(
-                            f"🛑 Phone {self.config.phone_id}: Server initiated disconnect"
-                        )
-                    else:
-                        logger.info(
-                            f"📵 Phone {self.config.phone_id}: Connection ended (client disconnect)"
-                        )
-                    break
-                except asyncio.TimeoutError:
-                    logger.warning(
-                        f"⏰ Phone {self.config.phone_id}: No data after 10s"
-                    )
-                    break
-                except asyncio.CancelledError:
-                    logger.info(
-                        f"🛑 Phone {self.config.phone_id}: Connection cancelled by server"
-                    )
-                    break
-                except Exception as e:
-                    logger.error(
-                        f"❌ Phone {self.config.phone_id}: Error reading header: {e}"
-                    )
-                    break
+            # Create fresh decoder
+            self._create_video_decoder()
 
-                # Unpack header with frame type
-                try:
-                    frame_type = header[0]
-                    size, flags, timestamp = struct.unpack(">IIQ", header[1:])
-                except struct.error as e:
-                    logger.error(
-                        f"📦 Phone {self.config.phone_id}: Bad header. Error: {e}"
-                    )
-                    break
+            self.bitstream.reset()
+            logger.info(
+                f"✅ Phone {self.config.phone_id}: Decoder recreated"
+            )
+        except Exception as e:
+            # Don't stop streaming - it might recover
+            logger.error(f"❌ Failed to recreate decoder: {e}")
 
-                # First frame notification
-                if frames_received == 0:
-                    frame_type_str = {
-                        FRAME_TYPE_VIDEO: "Video",
-                        FRAME_TYPE_AUDIO: "Audio",
-                        FRAME_TYPE_CONFIG: "Config",
-                        FRAME_TYPE_METADATA: "Metadata",
-                    }.get(frame_type, f"Unknown(0x{frame_type:02x})")
+    def _handle_metadata(self, data: bytes, receive_time: float):
+        """Clock sync pongs and battery/temperature reports"""
+        try:
+            metadata = json.loads(data.decode("utf-8"))
+            if metadata.get("type") == "pong":
+                sample = self.clock_sync.handle_pong(
+                    metadata, receive_time, self.telemetry.ticks_per_second
+                )
+                if sample and len(self.clock_sync.samples) == 1:
                     logger.info(
-                        f"🎬 Phone {self.config.phone_id}: First frame! Type: {frame_type_str}"
+                        f"🕰️ Phone {self.config.phone_id}: Clock synced "
+                        f"(offset {sample.offset * 1000:+.1f}ms, RTT {sample.round_trip * 1000:.1f}ms)"
                     )
+            elif metadata.get("type") == "misc":
+                self._update_device_status(metadata)
+        except Exception as e:
+            logger.warning(
+                f"Failed to parse metadata: {e}",
+                extra=rate_limited(self.config.phone_id),
+            )
 
-                # Sanity check
-                if size == 0 or size > 10_000_000:
-                    logger.error(
-                        f"📦 Phone {self.config.phone_id}: Invalid frame size: {size} bytes"
-                    )
-                    break
+    def _update_device_status(self, metadata: dict):
+        self.battery_percent = metadata.get("batteryPercent", -1)
+        self.cpu_temperature_celsius = metadata.get(
+            "cpuTemperatureCelsius",
+            metadata.get("temperatureCelsius", -1.0),
+        )
 
-                # Mark receive time for latency tracking
-                receive_time = time.time()
+        # Log with appropriate icons
+        battery_icon = "🔋" if self.battery_percent > 20 else "🪫"
 
-                # Read frame data
-                try:
-                    data = await asyncio.wait_for(reader.readexactly(size), timeout=5.0)
-                except asyncio.IncompleteReadError as e:
-                    logger.error(
-                        f"❌ Phone {self.config.phone_id}: Incomplete frame: {len(e.partial)}/{size} bytes"
-                    )
-                    break
-                except asyncio.TimeoutError:
-                    logger.error(
-                        f"⏰ Phone {self.config.phone_id}: Timeout reading {size} bytes"
-                    )
-                    break
-                except asyncio.CancelledError:
-                    logger.info(f"🛑 Phone {self.config.phone_id}: Read cancelled")
-                    break
-                except Exception as e:
-                    logger.error(f"❌ Phone {self.config.phone_id}: Error: {e}")
-                    break
+        if self.cpu_temperature_celsius > 0:
+            logger.info(
+                f"{battery_icon} Phone {self.config.phone_id}: Battery {self.battery_percent}%, "
+                f"{self._temperature_icon()} CPU {self.cpu_temperature_celsius:.1f}°C"
+            )
+        else:
+            logger.info(
+                f"{battery_icon} Phone {self.config.phone_id}: Battery {self.battery_percent}%"
+            )
 
-                frames_received += 1
+    def _log_stream_stats(self):
+        """The periodic per-camera summary"""
+        mb = self.bytes_received / 1_000_000
+        processing = self.processing_latency or {50: 0.0, 99: 0.0}
+        av_ratio = (self.audio_frames_decoded + self.lane_audio_decoded) / max(
+            self.video_frames_decoded, 1
+        )
 
-                self.bytes_received += size
+        # Process-wide numbers come from the server's resource sampler
+        resources = self.resources.latest if self.resources else None
+        usage = ""
+        if resources and resources.time:
+            usage = (
+                f", 💾 {resources.rss_mb:.1f} MB, ⚙️ {resources.cpu_percent:.1f}% CPU "
+                f"({resources.camera_decode_cpu.get(self.config.phone_id, 0.0):.1f}% "
+                f"decoding this camera)"
+            )
 
-                # Process based on frame type
-                if frame_type == FRAME_TYPE_VIDEO:
-                    decoded = await self.process_video_frame(data, flags, receive_time)
-                    if decoded:
-                        video_frames_decoded += 1
-                        frame_decode_failures = 0  # reset on success
-                    else:
-                        frame_decode_failures += 1
-
-                        # Decoder recovery
-                        if frame_decode_failures >= max_decode_failures:
-                            logger.warning(
-                                f"⚠️ Phone {self.config.phone_id}: {frame_decode_failures} consecutive decode failures, "
-                                f"resetting decoder..."
-                            )
-                            try:
-                                # Don't try to flush - just abandon and recreate
-                                self.video_decoder = None  # Release reference
-
-                                # Small delay to let things settle
-                                await asyncio.sleep(0.1)
-
-                                # Create fresh decoder
-                                self.video_decoder = av.CodecContext.create("h264", "r")
-                                self.video_decoder.thread_type = "AUTO"
-                                self.video_decoder.thread_count = 2
-                                self.video_decoder.options = {
-                                    "flags": "low_delay",
-                                    "flags2": "fast",
-                                }
-
-                                frame_decode_failures = 0
-                                logger.info(
-                                    f"✅ Phone {self.config.phone_id}: Decoder recreated"
-                                )
-
-                                # Skip this frame and continue
-                                continue
-                            except Exception as e:
-                                logger.error(f"❌ Failed to recreate decoder: {e}")
-                                # Don't break - try to continue, it might recover
-                                frame_decode_failures = (
-                                    0  # Reset to avoid immediate retry
-                                )
-
-                elif frame_type == FRAME_TYPE_AUDIO and self.audio_enabled:
-                    decoded = await self.process_audio_frame(data, flags, receive_time)
-                    if decoded:
-                        audio_frames_decoded += 1
-                elif frame_type == FRAME_TYPE_METADATA and len(data) > 0:
-                    try:
-                        metadata = json.loads(data.decode("utf-8"))
-                        if metadata.get("type") == "misc":
-                            self.battery_percent = metadata.get("batteryPercent", -1)
-                            self.cpu_temperature_celsius = metadata.get(
-                                "cpuTemperatureCelsius",
-                                metadata.get("temperatureCelsius", -1.0),
-                            )
-
-                            # Log with appropriate icons
-                            battery_icon = "🔋" if self.battery_percent > 20 else "🪫"
-
-                            if self.cpu_temperature_celsius > 0:
-                                if self.cpu_temperature_celsius < 50:
-                                    temp_icon = "❄️"
-                                elif self.cpu_temperature_celsius < 70:
-                                    temp_icon = "🌡️"
-                                elif self.cpu_temperature_celsius < 85:
-                                    temp_icon = "🔥"
-                                else:
-                                    temp_icon = "💥"
-
-                                logger.info(
-                                    f"{battery_icon} Phone {self.config.phone_id}: Battery {self.battery_percent}%, {temp_icon} CPU {self.cpu_temperature_celsius:.1f}°C"
-                                )
-                            else:
-                                logger.info(
-                                    f"{battery_icon} Phone {self.config.phone_id}: Battery {self.battery_percent}%"
-                                )
-                    except Exception as e:
-                        logger.warning(f"Failed to parse metadata: {e}")
-
-                # Periodic logging (every 3 seconds)
-                if frames_received % 90 == 0:
-                    mb = self.bytes_received / 1_000_000
-                    avg_latency = (
-                        sum(self.latency_samples) / len(self.latency_samples)
-                        if self.latency_samples
-                        else 0
-                    )
-                    self.average_latency = avg_latency
-                    av_ratio = audio_frames_decoded / max(video_frames_decoded, 1)
+        logger.info(
+            f"📊 Phone {self.config.phone_id}: "
+            f"{self.video_frames_decoded}V/{self.audio_frames_decoded}A decoded (ratio: {av_ratio:.2f}), "
+            f"{mb:.2f} MB, {processing[50] * 1000:.1f}ms latency "
+            f"(p99 {processing[99] * 1000:.1f}ms){usage}"
+        )
 
-                    # Memory monitoring
-                    process = psutil.Process()
-                    memory_mb = process.memory_info().rss / 1024 / 1024
-                    cpu_percent = process.cpu_percent()
+        if self.decode_scheduler:
+            deadline_stats = self.decode_scheduler.camera_stats(
+                self.config.phone_id
+            )
+            if deadline_stats.deadline_misses:
+                logger.info(
+                    f"⏱️ Phone {self.config.phone_id}: {deadline_stats.deadline_misses} deadline misses "
+                    f"({deadline_stats.shed} shed, "
+                    f"{deadline_stats.missed} sent late)"
+                )
 
-                    logger.info(
-                        f"📊 Phone {self.config.phone_id}: "
-                        f"{video_frames_decoded}V/{audio_frames_decoded}A decoded (ratio: {av_ratio:.2f}), "
-                        f"{mb:.2f} MB, {avg_latency * 1000:.1f}ms latency, "
-                        f"💾 {memory_mb:.1f} MB, ⚙️ {cpu_percent:.1f}% CPU"
-                    )
+        if self.decode_load.degraded:
+            logger.info(
+                f"🪫 Phone {self.config.phone_id}: Degraded decode ({self.decode_load.mode}), "
+                f"{self.decode_load.ewma * 1000:.1f}ms avg decode"
+            )
 
-                    # Force garbage collection every 5 minutes
-                    if frames_received % 9000 == 0:  # ~5 minutes at 30fps
-                        gc.collect()
-                        logger.debug(
-                            f"Phone {self.config.phone_id}: Garbage collection triggered"
-                        )
+        self._log_audio_stats()
+        self._log_timing_stats()
 
-            # Check if force stopped
-            if self._force_stop:
-                logger.info(
-                    f"🛑 Phone {self.config.phone_id}: Force stopped by server shutdown"
+    def _log_audio_stats(self):
+        audio_quality = self.audio_telemetry.snapshot()
+        if audio_quality.jitter_ms or self.audio_lane_connected:
+            lane = "separate" if self.audio_lane_connected else "shared"
+            logger.info(
+                f"🎧 Phone {self.config.phone_id}: Audio jitter {audio_quality.jitter_ms:.1f}ms "
+                f"(p95 {audio_quality.jitter_p95_ms:.1f}ms, {lane} lane)"
+                + (
+                    f", buffer {self.audio_jitter.target_delay * 1000:.0f}ms, "
+                    f"{self.audio_jitter.late} late"
+                    if self.audio_lane_connected
+                    else ""
                 )
-            else:
-                logger.info(f"📵 Phone {self.config.phone_id}: Normal disconnect")
+            )
 
-        except asyncio.CancelledError:
-            logger.info(f"🛑 Phone {self.config.phone_id}: Handler cancelled")
-            raise
-        except Exception as e:
-            logger.error(
-                f"❌ Error handling Phone {self.config.phone_id}: {e}", exc_info=True
+    def _log_timing_stats(self):
+        """Stage latencies, glass-to-glass, network quality and GOP structure"""
+        stages = self.latency.describe()
+        if stages:
+            logger.info(
+                f"⏱️ Phone {self.config.phone_id}: Stage p50/p95/p99 (10s): {stages}"
             )
-        finally:
-            self.running = False
 
-            # Flush and reset decoders to prevent memory accumulation
-            if self.video_decoder:
-                try:
-                    # Flush any remaining frames
-                    list(self.video_decoder.decode(None))
-                    logger.debug(f"Phone {self.config.phone_id}: Video decoder flushed")
-                except Exception as e:
-                    logger.debug(f"Error flushing video decoder: {e}")
+        g2g = self.glass_to_glass
+        if g2g:
+            logger.info(
+                f"⏱️ Phone {self.config.phone_id}: Glass-to-glass "
+                f"p50 {g2g[50] * 1000:.0f}ms, p95 {g2g[95] * 1000:.0f}ms, "
+                f"p99 {g2g[99] * 1000:.0f}ms "
+                f"(RTT {self.clock_sync.round_trip * 1000:.1f}ms)"
+            )
 
-            if self.audio_decoder:
-                try:
-                    list(self.audio_decoder.decode(None))
-                    logger.debug(f"Phone {self.config.phone_id}: Audio decoder flushed")
-                except Exception as e:
-                    logger.debug(f"Error flushing audio decoder: {e}")
+        quality = self.network_quality
+        if quality.samples:
+            logger.info(
+                f"{'📶' if not quality.congested else '🐌'} Phone {self.config.phone_id}: "
+                f"{quality.goodput_bps / 1_000_000:.2f} Mbps goodput, "
+                f"jitter {quality.jitter_ms:.1f}ms (p95 {quality.jitter_p95_ms:.1f}), "
+                f"queue +{quality.queue_delay_ms:.0f}ms ({quality.delay_trend_ms_s:+.1f}ms/s), "
+                f"drift {quality.drift_ppm:+.0f}ppm, burst {quality.burstiness:.1f}x"
+            )
 
-            # Cancel watchdog
-            if self.watchdog_task:
-                self.watchdog_task.cancel()
-                try:
-                    await self.watchdog_task
-                except asyncio.CancelledError:
-                    pass
+        last_gop = self.bitstream.last_gop
+        if last_gop:
+            logger.info(
+                f"🎞️ Phone {self.config.phone_id}: GOP {last_gop.frames} frames "
+                f"(avg {self.bitstream.average_gop_length:.1f}), "
+                f"{last_gop.bitrate / 1_000_000:.2f} Mbps "
+                f"(avg {self.bitstream.average_bitrate / 1_000_000:.2f} Mbps)"
+            )
 
-            # Properly close the connection
+    def _log_disconnect_reason(self):
+        if self.detaching:
+            logger.info(
+                f"🔁 Phone {self.config.phone_id}: Handing connection to the new server process"
+            )
+        elif self.superseded:
+            logger.info(
+                f"♻️ Phone {self.config.phone_id}: Handing over to the resumed connection"
+            )
+        elif self._force_stop:
+            logger.info(
+                f"🛑 Phone {self.config.phone_id}: Force stopped by server shutdown"
+            )
+        else:
+            logger.info(f"📵 Phone {self.config.phone_id}: Normal disconnect")
+
+    async def _end_session(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Hand the connection over, keep the session for a resume, or drop it"""
+        if self.detaching:
+            # The successor process decodes from here on
+            await self._finish_detach(reader, writer)
+            self.session_token = None
+            self._flush_decoders()
+        elif self.session_token and not self._force_stop:
+            # Keep decoders for a reconnect; flush if none comes in time
+            self._session_expires = time.monotonic() + self.resume_window
+            self._loop.call_later(self.resume_window, self._expire_session)
+        elif not self.superseded:
+            self.session_token = None
+            self._flush_decoders()
+
+    async def _stop_connection_tasks(self):
+        """Stop the audio lane playout and the watchdog with the connection"""
+        # Drop the audio lane with the main connection (a resume reopens it)
+        self._close_audio_lane()
+        if self._playout_task:
+            self._playout_task.cancel()
             try:
-                if writer and not writer.is_closing():
-                    writer.close()
-                    await writer.wait_closed()
-                    logger.debug(f"Phone {self.config.phone_id}: Connection closed")
+                await self._playout_task
+            except asyncio.CancelledError:
+                pass
+            self._playout_task = None
+
+        # Cancel watchdog
+        if self.watchdog_task:
+            self.watchdog_task.cancel()
+            try:
+                await self.watchdog_task
+            except asyncio.CancelledError:
+                pass
+
+    async def detach(self) -> tuple[dict, int] | None:
+        """
+        Stop reading at a frame boundary and give up the connection, for a
+        successor process to adopt. Returns (state, dup'd socket fd) or None
+        if there's no TCP connection to hand over. The caller owns the fd.
+        """
+        if not self.running or not self.writer or self._loop is None:
+            return None
+        if self.writer.get_extra_info("transport_kind") == "udp":
+            return None  # Lives in our UDP endpoint; the phone resumes instead
+
+        self._detached = self._loop.create_future()
+        self.detaching = True
+        if self._between_frames and self._handler_task:
+            self._handler_task.cancel()  # Waiting for a header: stop right here
+        return await self._detached
+
+    async def _finish_detach(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Freeze the socket and package what the successor needs to carry on"""
+        result = None
+        try:
+            await writer.drain()  # Control messages fully out before the switch
+            writer.transport.pause_reading()
+            sock = writer.get_extra_info("socket")
+            pending = await _drain_buffered(reader)
+            fd = os.dup(sock.fileno())
+            result = (
+                {
+                    "phoneId": self.config.phone_id,
+                    "name": self.config.name,
+                    "config": self.config_json,
+                    "sessionToken": self.session_token,
+                    "codecConfig": (
+                        base64.b64encode(self._codec_config_data).decode("ascii")
+                        if self._codec_config_data
+                        else None
+                    ),
+                    "requestedBitrate": self.requested_bitrate,
+                    # Read from the socket but not parsed yet (next frame's start)
+                    "pending": base64.b64encode(pending).decode("ascii"),
+                },
+                fd,
+            )
+            # Our fd goes; the dup keeps the connection open, so no FIN is sent
+            writer.transport.abort()
+        except Exception as e:
+            logger.error(f"❌ Phone {self.config.phone_id}: Could not detach: {e}")
+        if self._detached and not self._detached.done():
+            self._detached.set_result(result)
+
+    def adopt(self, state: dict):
+        """Prime this handler with a connection's state from the previous process"""
+        self._handover = state
+        self._pending_config = state.get("config") or {}
+
+    def _flush_decoders(self):
+        """Flush decoders to prevent memory accumulation"""
+        if self.video_decoder:
+            try:
+                # Flush any remaining frames
+                list(self.video_decoder.decode(None))
+                logger.debug(f"Phone {self.config.phone_id}: Video decoder flushed")
             except Exception as e:
-                logger.warning(
-                    f"Error closing writer for phone {self.config.phone_id}: {e}"
-                )
+                logger.debug(f"Error flushing video decoder: {e}")
+            self.video_decoder = None
 
-            # Call disconnect callback for GUI update
-            if self._disconnect_callback:
-                try:
-                    self._disconnect_callback(self.config.phone_id)
-                except Exception as e:
-                    logger.error(f"Error in disconnect callback: {e}")
+        if self.audio_decoder:
+            try:
+                list(self.audio_decoder.decode(None))
+                logger.debug(f"Phone {self.config.phone_id}: Audio decoder flushed")
+            except Exception as e:
+                logger.debug(f"Error flushing audio decoder: {e}")
+            self.audio_decoder = None
+
+    def _expire_session(self):
+        if self.running or time.monotonic() < self._session_expires:
+            return  # Resumed, or dropped again with a later deadline
+        if self.session_token:
+            logger.info(f"⌛ Phone {self.config.phone_id}: Resumable session expired")
+        self.session_token = None
+        self._flush_decoders()
+
+    def can_resume(self, token: str | None) -> bool:
+        """Whether a reconnect presenting ``token`` may take over this session"""
+        if not token or token != self.session_token or self.video_decoder is None:
+            return False
+        return self.running or time.monotonic() < self._session_expires
 
-            # Clear references
-            self.writer = None
-            self.reader = None
-            logger.info(f"📵 Phone {self.config.phone_id} disconnected")
+    def supersede(self):
+        """
+        End the current connection so a resuming one can take over.
+
+        Leaves decoder and session state alone. Safe to call from another
+        event loop (the replacement may arrive on a different shard).
+        """
+        self.superseded = True
+        self._force_stop = True
+        loop, writer = self._loop, self.writer
+        if loop and writer:
+            try:
+                loop.call_soon_threadsafe(writer.close)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    async def serve_audio_lane(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """
+        Read audio frames from the separate audio connection.
+
+        May run on a different event loop than the main connection (sharded
+        single-port mode); frames are handed to the main loop's jitter buffer.
+        """
+        owner = self._loop
+        if owner is None:
+            return
+
+        task = asyncio.current_task()
+        if task:
+            task.set_name(camera_task_name(self.config.phone_id))
+
+        self._close_audio_lane()
+        self._audio_lane = (asyncio.get_running_loop(), writer)
+        self.audio_lane_connected = True
+        addr = writer.get_extra_info("peername")
+        logger.info(
+            f"🎧 Phone {self.config.phone_id}: Audio lane connected from {addr[0]}:{addr[1]}"
+        )
 
-    async def receive_config(self, reader: asyncio.StreamReader) -> bool:
-        """Receive and parse initial configuration from client"""
         try:
-            # Wait up to 5 seconds for config packet
-            header = await asyncio.wait_for(reader.readexactly(5), timeout=5.0)
+            while self.running and not self._force_stop:
+                header = await reader.readexactly(17)
+                frame_type = header[0]
+                size, flags, timestamp = struct.unpack(">IIQ", header[1:])
+                if size == 0 or size > 1_000_000:
+                    logger.error(
+                        f"📦 Phone {self.config.phone_id}: Invalid audio lane frame size: {size}"
+                    )
+                    break
 
-            frame_type = header[0]
-            size = struct.unpack(">I", header[1:5])[0]
+                data = await reader.readexactly(size)
+                if frame_type != FRAME_TYPE_AUDIO:
+                    continue
 
-            if frame_type != FRAME_TYPE_CONFIG:
-                logger.warning(f"⚠️ Expected config, got type {frame_type:02x}")
-                return False
+                arrival = time.time()
+                self.bytes_received += size
+                if owner is asyncio.get_running_loop():
+                    self._queue_lane_audio(data, flags, timestamp, arrival)
+                else:
+                    owner.call_soon_threadsafe(
+                        self._queue_lane_audio, data, flags, timestamp, arrival
+                    )
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if self._audio_lane and self._audio_lane[1] is writer:
+                self._audio_lane = None
+                self.audio_lane_connected = False
+            if not writer.is_closing():
+                writer.close()
+            logger.info(f"🎧 Phone {self.config.phone_id}: Audio lane closed")
+
+    def _queue_lane_audio(self, data: bytes, flags: int, timestamp: int, arrival: float):
+        self.audio_telemetry.record(timestamp, arrival, len(data))
+        self.audio_jitter.set_clock(self.audio_telemetry.ticks_per_second)
+        self.audio_jitter.push(data, flags, timestamp, arrival)
+        if self._audio_wakeup:
+            self._audio_wakeup.set()
+
+    async def _audio_playout(self):
+        """Release jitter-buffered lane audio to the decoder on schedule"""
+        assert self._audio_wakeup is not None
+        while True:
+            due = self.audio_jitter.next_due()
+            timeout = None if due is None else max(0.0, due - time.time())
+            try:
+                await asyncio.wait_for(self._audio_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._audio_wakeup.clear()
+
+            for frame in self.audio_jitter.pop_ready(time.time()):
+                if not self.audio_enabled or not self.audio_decoder:
+                    continue
+                if await self.process_audio_frame(frame.data, frame.flags, frame.arrival):
+                    self.lane_audio_decoded += 1
+
+    def _close_audio_lane(self):
+        if self._audio_lane is None:
+            return
+        loop, writer = self._audio_lane
+        self._audio_lane = None
+        self.audio_lane_connected = False
+        try:
+            loop.call_soon_threadsafe(writer.close)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    @staticmethod
+    async def read_config_packet(reader: asyncio.StreamReader) -> dict | None:
+        """Read the config handshake packet; None if the first packet isn't config"""
+        # Wait up to 5 seconds for config packet
+        header = await asyncio.wait_for(reader.readexactly(5), timeout=5.0)
+
+        frame_type = header[0]
+        size = struct.unpack(">I", header[1:5])[0]
+
+        if frame_type != FRAME_TYPE_CONFIG:
+            logger.warning(f"⚠️ Expected config, got type {frame_type:02x}")
+            return None
+
+        # Read config JSON
+        config_data = await asyncio.wait_for(reader.readexactly(size), timeout=2.0)
+        return json.loads(config_data.decode("utf-8"))
+
+    async def receive_config(self, reader: asyncio.StreamReader) -> bool:
+        """Receive and parse initial configuration from client"""
+        try:
+            if self._pending_config is not None:
+                config_json = self._pending_config
+                self._pending_config = None
+            else:
+                config_json = await self.read_config_packet(reader)
+                if config_json is None:
+                    return False
 
-            # Read config JSON
-            config_data = await asyncio.wait_for(reader.readexactly(size), timeout=2.0)
-            config_json = json.loads(config_data.decode("utf-8"))
+            self.config_json = config_json
 
             # Parse configuration
             video_cfg = config_json.get("video", {})
             audio_cfg = config_json.get("audio", {})
             device_cfg = config_json.get("device", {})
 
-            self.current_width = video_cfg.get("width", self.config.width)
-            self.current_height = video_cfg.get("height", self.config.height)
-            self.current_fps = video_cfg.get("fps", self.config.fps)
-            video_bitrate = video_cfg.get("bitrate", 4_000_000)
+            width = video_cfg.get("width", self.config.width)
+            height = video_cfg.get("height", self.config.height)
+            fps = video_cfg.get("fps", self.config.fps)
+            audio_enabled = audio_cfg.get("enabled", True)
+
+            # A resume must describe the same stream, or the decoder is useless
+            self.resumed = self.can_resume(config_json.get("resume")) and (
+                width,
+                height,
+                fps,
+                audio_enabled,
+            ) == (
+                self.current_width,
+                self.current_height,
+                self.current_fps,
+                self.audio_enabled,
+            )
+
+            self.current_width = width
+            self.current_height = height
+            self.current_fps = fps
+            self.video_bitrate = video_cfg.get("bitrate", 4_000_000)
+            self._send_session()
 
-            self.audio_enabled = audio_cfg.get("enabled", True)
-            audio_sample_rate = audio_cfg.get("sampleRate", 48000)
-            audio_channels = audio_cfg.get("channels", 2)
-            audio_bitrate = audio_cfg.get("bitrate", 128000)
+            self.audio_enabled = audio_enabled
+            self._offer_audio_lane(audio_cfg)
 
             self.device_model = device_cfg.get("model", "Unknown")
             self.battery_percent = device_cfg.get("batteryPercent", -1)
             self.cpu_temperature_celsius = device_cfg.get("cpuTemperatureCelsius", -1.0)
 
-            logger.info(f"📋 Phone {self.config.phone_id} Configuration:")
-            logger.info(f"   📱 Device: {self.device_model}")
-            logger.info(
-                f"   📹 Video: {self.current_width}x{self.current_height}@{self.current_fps}fps, {video_bitrate / 1_000_000:.1f}Mbps"
-            )
-            logger.info(
-                f"   🎤 Audio: {'Enabled' if self.audio_enabled else 'Disabled'}, {audio_sample_rate}Hz, {audio_channels}ch, {audio_bitrate / 1000}kbps"
-            )
-
-            if self.battery_percent >= 0:
-                battery_icon = "🔋" if self.battery_percent > 20 else "🪫"
-                logger.info(f"   {battery_icon} Battery: {self.battery_percent}%")
-
-            # Display CPU temperature with appropriate icon
-            if self.cpu_temperature_celsius > 0:
-                if self.cpu_temperature_celsius < 50:
-                    temp_icon = "❄️"  # Cool
-                elif self.cpu_temperature_celsius < 70:
-                    temp_icon = "🌡️"  # Normal
-                elif self.cpu_temperature_celsius < 85:
-                    temp_icon = "🔥"  # Hot
-                else:
-                    temp_icon = "💥"  # Very hot!
-                logger.info(
-                    f"   {temp_icon} CPU Temperature: {self.cpu_temperature_celsius:.1f}°C"
-                )
-
+            self._log_config(audio_cfg)
             return True
 
         except asyncio.TimeoutError:
@@ -521,16 +1226,72 @@ class PhoneStreamHandler:
             logger.error(f"❌ Config parse error: {e}")
             return False
 
+    def _send_session(self):
+        """Tell the phone its session token (new unless this is a resume)"""
+        if not self.resumed:
+            self.requested_bitrate = 0
+            self.session_token = (
+                self._handover.get("sessionToken") if self._handover else None
+            ) or secrets.token_hex(16)
+        session = {
+            "type": "session",
+            "token": self.session_token,
+            "resumed": self.resumed,
+            "resumeWindow": self.resume_window,
+        }
+        if len(self.server_paths) > 1:
+            session["paths"] = self.server_paths  # Where to resume if this path dies
+        self.send_control(session)
+
+    def _offer_audio_lane(self, audio_cfg: dict):
+        """Hand out a token for the separate audio connection if the phone asked for one"""
+        if self.audio_enabled and audio_cfg.get("lane") == AUDIO_LANE_SEPARATE:
+            if not (self.resumed and self.audio_lane_token):
+                self.audio_lane_token = new_lane_token()
+            self.send_control(
+                {"type": "audioLane", "token": self.audio_lane_token}
+            )
+        else:
+            self.audio_lane_token = None
+
+    def _log_config(self, audio_cfg: dict):
+        audio_sample_rate = audio_cfg.get("sampleRate", 48000)
+        audio_channels = audio_cfg.get("channels", 2)
+        audio_bitrate = audio_cfg.get("bitrate", 128000)
+
+        logger.info(f"📋 Phone {self.config.phone_id} Configuration:")
+        logger.info(f"   📱 Device: {self.device_model}")
+        logger.info(
+            f"   📹 Video: {self.current_width}x{self.current_height}@{self.current_fps}fps, "
+            f"{self.video_bitrate / 1_000_000:.1f}Mbps"
+        )
+        logger.info(
+            f"   🎤 Audio: {'Enabled' if self.audio_enabled else 'Disabled'}, "
+            f"{audio_sample_rate}Hz, {audio_channels}ch, {audio_bitrate / 1000}kbps"
+        )
+
+        if self.battery_percent >= 0:
+            battery_icon = "🔋" if self.battery_percent > 20 else "🪫"
+            logger.info(f"   {battery_icon} Battery: {self.battery_percent}%")
+
+        # Display CPU temperature with appropriate icon
+        if self.cpu_temperature_celsius > 0:
+            logger.info(
+                f"   {self._temperature_icon()} CPU Temperature: {self.cpu_temperature_celsius:.1f}°C"
+            )
+
     async def process_video_frame(
         self, data: bytes, flags: int, receive_time: float
     ) -> bool:
         """Decode H.264 and send to OMT"""
+        self.frame_shed = False
         try:
             # Check if codec config
             if flags & 0x2:  # BUFFER_FLAG_CODEC_CONFIG
                 logger.info(
                     f"🔧 Phone {self.config.phone_id}: Video codec config, size={len(data)}"
                 )
+                self._codec_config_data = data
                 packet = av.Packet(data)
                 try:
                     list(self.video_decoder.decode(packet))  # type: ignore
@@ -543,74 +1304,158 @@ class PhoneStreamHandler:
 
             # Create packet
             packet = av.Packet(data)
+            capture_time = self.capture_time(self._frame_timestamp)
 
             # Set packet flags to indicate keyframe
             if flags & 0x1:  # BUFFER_FLAG_KEY_FRAME
                 packet.is_keyframe = True
 
             try:
-                # Decode with timeout protection
-                frames = []
-                decode_start = time.time()
-
-                for frame in self.video_decoder.decode(packet):  # type: ignore
-                    frames.append(frame)
-                    # Safety: don't decode for more than 100ms
-                    if time.time() - decode_start > 0.1:
-                        logger.warning("⚠️ Decode taking too long, limiting frames")
-                        break
-
-                if not frames:
-                    return False
-
-                # Process only the LAST frame if multiple (drop intermediate frames)
-                frame = frames[-1] if len(frames) > 1 else frames[0]
-
-                if len(frames) > 1:
-                    logger.debug(f"Decoded {len(frames)} frames, using last one")
-
-                nv12_data = self.frame_to_nv12(frame)
-                self._last_nv12_frame = nv12_data
-
-                # Send to OMT
-                success = self.output.send_video_frame(
-                    nv12_data,
-                    self.current_width,
-                    self.current_height,
-                    self.video_frame_pts,
-                )
-
-                if success:
-                    self.video_frame_count += 1
-                    self.video_frame_pts += self.pts_increment
-
-                    if self.video_frame_count == 1:
-                        logger.info(
-                            f"✅ Phone {self.config.phone_id}: First video frame sent!"
-                        )
-
-                # Track latency
-                end_time = time.time()
-                latency = end_time - receive_time
-                self.latency_samples.append(latency)
+                self._queued_at = time.perf_counter()
+                self._decode_time = 0.0
+                if self.decode_scheduler is None:
+                    result = self._decode_and_send(packet, receive_time, capture_time)
+                else:
+                    # Only non-reference frames can be dropped without corrupting later ones
+                    au = self.last_access_unit
+                    result = await self.decode_scheduler.submit(
+                        self.config.phone_id,
+                        self.decode_scheduler.deadline_for(
+                            receive_time, self.current_fps
+                        ),
+                        self._decode_and_send,
+                        packet,
+                        receive_time,
+                        capture_time,
+                        sheddable=au is not None and au.is_droppable,
+                    )
 
-                return True
+                self.frame_shed = result is None
+                return bool(result)
 
             except (av.InvalidDataError, av.EOFError):
                 # Expected decode errors - don't log unless frequent
                 return False
             except Exception as e:
                 logger.error(
-                    f"❌ Error processing video for Phone {self.config.phone_id}: {e}"
+                    f"❌ Error processing video for Phone {self.config.phone_id}: {e}",
+                    extra=rate_limited(self.config.phone_id),
                 )
                 return False
 
         except Exception as e:
             logger.error(
-                f"❌ Error in process_video_frame for Phone {self.config.phone_id}: {e}"
+                f"❌ Error in process_video_frame for Phone {self.config.phone_id}: {e}",
+                extra=rate_limited(self.config.phone_id),
+            )
+            return False
+
+    def _decode_and_send(
+        self,
+        packet: av.Packet,
+        receive_time: float,
+        capture_time: float | None,
+    ) -> bool | None:
+        """
+        Decode a packet and send the newest frame to the output.
+
+        Runs on a decode worker thread when a scheduler is attached. Returns
+        None when the decoder skipped the frame on purpose (load tiers).
+        """
+        if self.decode_load.at_access_unit(self.last_access_unit):
+            logger.info(
+                f"🔋 Phone {self.config.phone_id}: Decode mode → {self.decode_load.mode} at IDR"
             )
+        if self.decode_load.apply_pending:
+            self.decode_load.apply(self.video_decoder)
+
+        frames = self._decode_packet(packet)
+        if not frames:
+            # Frames dropped by skip_frame are intentional, not decode failures
+            if self.decode_load.expects_skip(self.last_access_unit):
+                return None
             return False
 
+        # Process only the LAST frame if multiple (drop intermediate frames)
+        if len(frames) > 1:
+            logger.debug("Decoded %d frames, using last one", len(frames))
+        self._send_frame(frames[-1], receive_time, capture_time)
+        return True
+
+    def _decode_packet(self, packet: av.Packet) -> list:
+        """Decode with timeout protection, feeding the timing to the load controller"""
+        frames = []
+        decode_start = time.perf_counter()
+
+        for frame in self.video_decoder.decode(packet):  # type: ignore
+            frames.append(frame)
+            # Safety: don't decode for more than 100ms
+            if time.perf_counter() - decode_start > 0.1:
+                logger.warning(
+                    f"⚠️ Phone {self.config.phone_id}: Decode taking too long, limiting frames",
+                    extra=rate_limited(self.config.phone_id),
+                )
+                break
+
+        decode_end = time.perf_counter()
+        decode_time = decode_end - decode_start
+        self._decode_time = decode_time
+        self.latency.decode.observe(decode_time)
+        tracer, frame_number = self.tracer, self._trace_frame
+        if tracer:
+            tracer.span(self.config.phone_id, frame_number, QUEUE, self._queued_at, decode_start)
+            tracer.span(self.config.phone_id, frame_number, DECODE, decode_start, decode_end)
+        # Skipped frames cost ~nothing; only decoded ones say what decoding costs
+        if frames and self.decode_load.record(decode_time / len(frames)):
+            logger.warning(
+                f"🪫 Phone {self.config.phone_id}: Decode mode → {self.decode_load.mode} "
+                f"({self.decode_load.ewma * 1000:.1f}ms decode vs "
+                f"{self.decode_load.frame_interval * 1000:.1f}ms frame interval)"
+            )
+        return frames
+
+    def _send_frame(self, frame, receive_time: float, capture_time: float | None):
+        """Convert a decoded frame to NV12 and send it to the output"""
+        tracer, frame_number = self.tracer, self._trace_frame
+        convert_start = time.perf_counter()
+        nv12_data = self.frame_to_nv12(frame)
+        self._last_nv12_frame = nv12_data
+
+        # Send to OMT
+        send_start = time.perf_counter()
+        success = self.output.send_video_frame(
+            nv12_data,
+            self.current_width,
+            self.current_height,
+            self.video_frame_pts,
+        )
+        send_end = time.perf_counter()
+        self.latency.convert.observe(send_start - convert_start)
+        self.latency.send.observe(send_end - send_start)
+        if tracer:
+            tracer.span(self.config.phone_id, frame_number, CONVERT, convert_start, send_start)
+            tracer.span(self.config.phone_id, frame_number, SEND, send_start, send_end)
+
+        if not success:
+            self.metrics.send_failures += 1
+        else:
+            self.video_frame_count += 1
+            self.video_frame_pts += self.pts_increment
+
+            if self.video_frame_count == 1:
+                logger.info(
+                    f"✅ Phone {self.config.phone_id}: First video frame sent!"
+                )
+
+        # Track latency (server processing, and end to end once clocks are synced)
+        end_time = time.time()
+        latency = end_time - receive_time
+        self.latency.process.observe(latency)
+        if tracer and latency > tracer.spike_threshold:
+            tracer.spike(self.config.phone_id, frame_number, latency)
+        if success and capture_time is not None:
+            self.clock_sync.record_latency(end_time - capture_time)
+
     async def process_audio_frame(
         self, data: bytes, flags: int, receive_time: float
     ) -> bool:
@@ -708,13 +1553,15 @@ class PhoneStreamHandler:
                 # Only log unexpected errors
                 if self.audio_frame_count < 10:  # Log first few errors
                     logger.error(
-                        f"❌ Error processing audio for Phone {self.config.phone_id}: {e}"
+                        f"❌ Error processing audio for Phone {self.config.phone_id}: {e}",
+                        extra=rate_limited(self.config.phone_id),
                     )
                 return False
 
         except Exception as e:
             logger.error(
-                f"❌ Error in process_audio_frame for Phone {self.config.phone_id}: {e}"
+                f"❌ Error in process_audio_frame for Phone {self.config.phone_id}: {e}",
+                extra=rate_limited(self.config.phone_id),
             )
             return False
 
@@ -739,12 +1586,34 @@ class PhoneStreamHandler:
 
         return nv12_data
 
-    def nv12_to_rgb(self, nv12_data, width, height):
+    def nv12_to_rgb(self, nv12_data, width, height, step=1):
+        started = time.perf_counter()
+        rgb = self._nv12_to_rgb(nv12_data, width, height, step)
+        finished = time.perf_counter()
+        self.latency.preview.observe(finished - started)
+        if self.tracer:
+            self.tracer.span(
+                self.config.phone_id, self._trace_frame, PREVIEW, started, finished
+            )
+        return rgb
+
+    @staticmethod
+    def _nv12_to_rgb(nv12_data, width, height, step=1):
         # Extract Y and UV planes
         y_size = width * height
         y_plane = nv12_data[:y_size].reshape(height, width)
         uv_plane = nv12_data[y_size:].reshape(height // 2, width)
 
+        # Decimate for low-cost previews (keep NV12 dimensions even)
+        if step > 1 and (height // step) % 2 == 0 and (width // step) % 2 == 0:
+            y_plane = y_plane[::step, ::step]
+            uv_plane = (
+                uv_plane.reshape(height // 2, width // 2, 2)[::step, ::step]
+                .reshape(height // (2 * step), width // step)
+            )
+            height //= step
+            width //= step
+
         # Convert to RGB using OpenCV
         yuv = np.zeros((height * 3 // 2, width), dtype=np.uint8)
         yuv[:height, :] = y_plane
@@ -825,6 +1694,7 @@ class PhoneStreamHandler:
                             f"❌ Phone {self.config.phone_id}: Stream appears frozen "
                             f"({self.bytes_received} bytes received but {current_frame_count} frames)"
                         )
+                        self.flight_recorder.dump("frozen")
                         self.running = False
                         break
                 else:
@@ -837,17 +1707,24 @@ class PhoneStreamHandler:
                         f"📡 Phone {self.config.phone_id}: No data for {time_since_last_frame:.1f}s, "
                         f"disconnecting (timeout: {self.connection_timeout}s)"
                     )
+                    self.flight_recorder.dump("timeout")
                     self.running = False
                     break
 
         except asyncio.CancelledError:
             logger.debug(f"Watchdog cancelled for phone {self.config.phone_id}")
 
-    async def force_disconnect(self):
-        """Force disconnect this client (called during server shutdown)"""
+    async def force_disconnect(self, keep_session: bool = False):
+        """
+        Force disconnect this client (called during server shutdown)
+
+        Args:
+            keep_session: Leave the session resumable (the phone's path died,
+                not the server)
+        """
         logger.info(f"🔌 Force disconnecting phone {self.config.phone_id}...")
 
-        self._force_stop = True
+        self._force_stop = not keep_session
         self.running = False
 
         # Close writer to signal client
@@ -856,13 +1733,21 @@ class PhoneStreamHandler:
                 # Send a "server closing" notification if possible
                 # (optional - client will detect connection close anyway)
                 self.writer.close()
-                await asyncio.wait_for(self.writer.wait_closed(), timeout=2.0)
+                await asyncio.wait_for(self.writer.wait_closed(), timeout=1.0)
                 logger.debug(
                     f"Phone {self.config.phone_id}: Connection closed gracefully"
                 )
             except asyncio.TimeoutError:
+                # Peer isn't reading; drop the unsent buffer instead of waiting on it
                 logger.warning(f"Phone {self.config.phone_id}: Close timeout, forcing")
+                self.writer.transport.abort()
             except Exception as e:
                 logger.warning(
                     f"Phone {self.config.phone_id}: Error closing connection: {e}"
                 )
+
+
+async def _drain_buffered(reader: asyncio.StreamReader) -> bytes:
+    """What the reader already holds, without waiting for more (reading must be paused)"""
+    reader.feed_eof()  # Nothing else arrives once paused; read() stops at the buffer's end
+    return await reader.read()
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import stat
+import struct
+import tempfile
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def _default_handover_path() -> str:
+    """Per-user location: XDG_RUNTIME_DIR, else a private directory under temp"""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, "vss-handover.sock")
+    user = os.getuid() if hasattr(os, "getuid") else os.getenv("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"vss-{user}", "handover.sock")
+
+
+# Where a running server waits for the process that replaces it
+DEFAULT_HANDOVER_PATH = _default_handover_path()
+
+# SCM_RIGHTS fd passing over Unix sockets (Linux/macOS, not Windows)
+HANDOVER_SUPPORTED = hasattr(socket, "send_fds") and hasattr(socket, "AF_UNIX")
+
+_MAX_FDS = 250  # Below the kernel's SCM_MAX_FD (253) per message
+
+# A listening socket's identity, matched between the two processes
+ListenerKey = tuple[str, str, int]  # (kind "tcp"/"udp", address, port)
+
+
+def private_directory(path: str, create: bool = False) -> bool:
+    """
+    Whether the socket's directory is safe to trust: ours and not writable
+    by anyone else. Otherwise another local user could plant a socket there
+    and feed fake listeners to the next server.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if create:
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            logger.error(f"❌ Could not create handover directory {directory}: {e}")
+            return False
+    try:
+        st = os.lstat(directory)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+        logger.error(
+            f"❌ Handover directory {directory} is not private "
+            "(must be a directory owned by this user and writable only by it)"
+        )
+        return False
+    return True
+
+
+def send_message(sock: socket.socket, message: dict, fds: list[int] | None = None):
+    """Length-prefixed JSON; file descriptors ride along with the prefix"""
+    payload = json.dumps(message).encode("utf-8")
+    fds = fds or []
+    if len(fds) > _MAX_FDS:
+        raise ValueError(f"Too many sockets to hand over at once ({len(fds)})")
+    prefix = struct.pack(">II", len(payload), len(fds))
+    if fds:
+        socket.send_fds(sock, [prefix], fds)
+    else:
+        sock.sendall(prefix)
+    sock.sendall(payload)
+
+
+def recv_message(sock: socket.socket) -> tuple[dict, list[socket.socket]]:
+    """Counterpart of send_message; received descriptors come back as sockets"""
+    prefix, fds, _, _ = socket.recv_fds(sock, 8, _MAX_FDS)
+    if len(prefix) < 8:
+        prefix += _recv_exactly(sock, 8 - len(prefix))
+    size, fd_count = struct.unpack(">II", prefix)
+    if len(fds) != fd_count:
+        for fd in fds:
+            os.close(fd)
+        raise ConnectionError(f"Expected {fd_count} sockets, got {len(fds)}")
+    message = json.loads(_recv_exactly(sock, size).decode("utf-8"))
+    return message, [socket.socket(fileno=fd) for fd in fds]
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Handover peer closed the channel")
+        data += chunk
+    return data
+
+
+class HandoverChannel:
+    """
+    One handover conversation, either side. Blocking socket I/O runs in a
+    worker thread so neither event loop stalls.
+
+    Sequence (new → old / old → new):
+        handoverRequest → listeners (+ listening fds) → listening
+        → cameras (+ client fds) → adopted
+    """
+
+    def __init__(self, sock: socket.socket, timeout: float = 5.0):
+        sock.setblocking(True)
+        sock.settimeout(timeout)
+        self.sock = sock
+
+    async def send(self, message: dict, fds: list[int] | None = None):
+        await asyncio.to_thread(send_message, self.sock, message, fds)
+
+    async def receive(self, expected: str) -> tuple[dict, list[socket.socket]]:
+        message, sockets = await asyncio.to_thread(recv_message, self.sock)
+        if message.get("type") != expected:
+            for s in sockets:
+                s.close()
+            raise ConnectionError(
+                f"Handover: expected '{expected}', got '{message.get('type')}'"
+            )
+        return message, sockets
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+async def request_handover(path: str) -> HandoverChannel | None:
+    """Ask the server running at ``path`` to hand over; None if there isn't one"""
+    if not HANDOVER_SUPPORTED or not os.path.exists(path):
+        return None
+    if not private_directory(path):
+        return None
+
+    def connect():
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    try:
+        sock = await asyncio.to_thread(connect)
+    except OSError as e:
+        logger.info(f"🔁 No running server to take over at {path} ({e})")
+        return None
+
+    channel = HandoverChannel(sock)
+    await channel.send({"type": "handoverRequest", "pid": os.getpid()})
+    return channel
+
+
+class HandoverListener:
+    """
+    Waits on a Unix socket for a successor process and runs its handover.
+
+    ``on_request`` raising means the handover was abandoned with this
+    process still serving: the listener then waits for another successor.
+    Returning means it is over (handed over, or failed past the point of no
+    return), and the socket goes away.
+    """
+
+    def __init__(self, path: str, on_request: Callable[[HandoverChannel], Awaitable[None]]):
+        self.path = path
+        self.on_request = on_request
+        self._sock: socket.socket | None = None
+        self._inode: int | None = None  # Our socket file, so we never unlink a successor's
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> bool:
+        if not HANDOVER_SUPPORTED:
+            logger.warning("⚠️ Handover needs Unix sockets with SCM_RIGHTS; not available here")
+            return False
+
+        if not private_directory(self.path, create=True):
+            return False
+        try:
+            os.unlink(self.path)  # Left behind by a crashed process
+        except FileNotFoundError:
+            pass
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Sockets with live phones attached: owner only, from the moment it exists
+        umask = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+            self._inode = os.stat(self.path).st_ino
+            sock.listen(1)
+        except OSError as e:
+            sock.close()
+            logger.error(f"❌ Could not listen for handover on {self.path}: {e}")
+            return False
+        finally:
+            os.umask(umask)
+        sock.setblocking(False)
+        self._sock = sock
+        self._task = asyncio.create_task(self._accept())
+        logger.info(f"🔁 Ready to hand over to a new server process ({self.path})")
+        return True
+
+    async def _accept(self):
+        loop = asyncio.get_running_loop()
+        while self._sock:
+            conn, _ = await loop.sock_accept(self._sock)
+            channel = HandoverChannel(conn)
+            try:
+                request, _ = await channel.receive("handoverRequest")
+                logger.info(f"🔁 Handover requested by process {request.get('pid')}")
+                await self.on_request(channel)
+            except Exception as e:
+                logger.error(f"❌ Handover failed, still serving: {e}")
+                continue
+            finally:
+                channel.close()
+            break
+        self._close_socket()
+
+    def _close_socket(self):
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+            # The successor binds the same path once it has our phones; leave its socket be
+            try:
+                if os.stat(self.path).st_ino == self._inode:
+                    os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    async def close(self):
+        if self._task and asyncio.current_task() is not self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._close_socket()
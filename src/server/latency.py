@@ -0,0 +1,150 @@
+import logging
+import math
+import time
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Log-linear buckets over microseconds: exact below 32 µs, then 16 per
+# power of two (at most 1/16 relative error), up to MAX_LATENCY
+SUB_BUCKET_BITS = 5
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+MAX_LATENCY = 10.0  # Seconds; longer stalls land in the last bucket
+
+# Rolling windows: 1 s slots for the short one, 10 s slots for the long one
+FINE_SLOT = 1.0
+COARSE_SLOT = 10.0
+SHORT_WINDOW = 10.0
+LONG_WINDOW = 300.0
+
+
+def bucket_index(micros: int) -> int:
+    """O(1) bucket for a latency in whole microseconds"""
+    if micros < 2 * _HALF:
+        return max(micros, 0)
+    shift = micros.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (micros >> shift)
+
+
+def bucket_value(index: int) -> float:
+    """Midpoint of a bucket, in seconds"""
+    if index < 2 * _HALF:
+        return index / 1e6
+    shift = index // _HALF - 1
+    low = (index - shift * _HALF) << shift
+    return (low + (1 << shift) / 2) / 1e6
+
+
+BUCKET_COUNT = bucket_index(int(MAX_LATENCY * 1e6)) + 1
+_BUCKET_VALUES = np.array([bucket_value(i) for i in range(BUCKET_COUNT)])
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket (HDR-style) latency histogram with rolling windows.
+
+    observe() costs a bucket computation and three increments: the
+    all-time counts, the current 1 s slot and the current 10 s slot. Slots
+    are rows of a numpy array reused as a ring, so the last ~10 s and ~5 min
+    are always at hand; reading a window sums the live rows in one
+    vectorised call (a few µs, cheap enough for the streaming loop).
+    """
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT  # Since start (Prometheus export)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._fine = np.zeros((int(SHORT_WINDOW / FINE_SLOT) + 1, BUCKET_COUNT), np.int64)
+        self._fine_ticks = [-1] * len(self._fine)
+        self._coarse = np.zeros((int(LONG_WINDOW / COARSE_SLOT) + 1, BUCKET_COUNT), np.int64)
+        self._coarse_ticks = [-1] * len(self._coarse)
+
+    def observe(self, seconds: float):
+        index = min(bucket_index(int(seconds * 1e6)), BUCKET_COUNT - 1)
+        now = time.monotonic()
+        self._fine[self._slot(self._fine, self._fine_ticks, int(now / FINE_SLOT)), index] += 1
+        self._coarse[self._slot(self._coarse, self._coarse_ticks, int(now / COARSE_SLOT)), index] += 1
+        self.counts[index] += 1
+        self.sum += seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    @staticmethod
+    def _slot(slots: np.ndarray, ticks: list[int], tick: int) -> int:
+        i = tick % len(slots)
+        if ticks[i] != tick:
+            # First sample in this slot's new period: forget what it held before
+            slots[i] = 0
+            ticks[i] = tick
+        return i
+
+    def window_counts(self, window: float | None = SHORT_WINDOW) -> np.ndarray:
+        """Bucket counts over the last ``window`` seconds (None: since start)"""
+        if window is None:
+            return np.array(self.counts, np.int64)
+        if window <= SHORT_WINDOW:
+            slots, ticks, size = self._fine, self._fine_ticks, FINE_SLOT
+        else:
+            slots, ticks, size = self._coarse, self._coarse_ticks, COARSE_SLOT
+        now_tick = int(time.monotonic() / size)
+        oldest = now_tick - max(math.ceil(window / size), 1)
+
+        live = [i for i, tick in enumerate(ticks) if oldest < tick <= now_tick]
+        return slots[live].sum(axis=0)
+
+    def percentiles(
+        self, window: float | None = SHORT_WINDOW, points=(50, 95, 99)
+    ) -> dict[int, float] | None:
+        """Latency percentiles (seconds) over a window; None without samples"""
+        running = np.cumsum(self.window_counts(window))
+        total = int(running[-1])
+        if not total:
+            return None
+
+        return {
+            p: bucket_value(int(np.searchsorted(running, max(math.ceil(total * p / 100), 1))))
+            for p in points
+        }
+
+    def cumulative(self, bounds: tuple[float, ...]) -> list[tuple[str, int]]:
+        """All-time counts folded onto coarser (le, count) bounds, ending with +Inf"""
+        running = np.cumsum(self.counts)
+        ends = np.searchsorted(_BUCKET_VALUES, bounds, side="right")
+        buckets = [(repr(bound), int(running[end - 1]) if end else 0) for bound, end in zip(bounds, ends)]
+        buckets.append(("+Inf", int(running[-1])))
+        return buckets
+
+
+@dataclass
+class StageLatency:
+    """One camera's per-stage latency histograms"""
+
+    read: LatencyHistogram = field(default_factory=LatencyHistogram)  # Frame payload arrival after its header
+    decode: LatencyHistogram = field(default_factory=LatencyHistogram)
+    convert: LatencyHistogram = field(default_factory=LatencyHistogram)  # Decoded frame → NV12
+    send: LatencyHistogram = field(default_factory=LatencyHistogram)  # Output (OMT) send call
+    preview: LatencyHistogram = field(default_factory=LatencyHistogram)  # NV12 → RGB for the GUI
+    process: LatencyHistogram = field(default_factory=LatencyHistogram)  # Received → sent, overall
+
+    def stages(self) -> dict[str, LatencyHistogram]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def summary(self, window: float | None = SHORT_WINDOW) -> dict[str, dict[int, float]]:
+        """p50/p95/p99 per stage that has samples in the window"""
+        summary = {}
+        for name, histogram in self.stages().items():
+            points = histogram.percentiles(window)
+            if points:
+                summary[name] = points
+        return summary
+
+    def describe(self, window: float | None = SHORT_WINDOW) -> str:
+        """Compact log form: 'decode 3.1/5.0/9.8ms, ...' (p50/p95/p99)"""
+        return ", ".join(
+            f"{name} {p[50] * 1000:.1f}/{p[95] * 1000:.1f}/{p[99] * 1000:.1f}ms"
+            for name, p in self.summary(window).items()
+        )
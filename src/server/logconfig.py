@@ -0,0 +1,157 @@
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: QueueListener | None = None
+_rate_limit: "RateLimitFilter | None" = None
+
+
+def rate_limited(key: Any = None) -> dict[str, Any]:
+    """
+    ``extra=`` for a log call on a hot path (per frame or per packet), opting
+    it into rate limiting per call site and ``key`` (the camera, usually):
+
+        logger.warning("⚠️ Phone %d: ...", phone_id, extra=rate_limited(phone_id))
+    """
+    return {"rate_limit": (key,)}
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most ``burst`` records per ``interval`` seconds through from each
+    opted-in call site (file, line and ``rate_limited`` key); the rest are
+    dropped and counted. The next record let through from that site says how
+    many were suppressed.
+
+    Records that didn't opt in, and CRITICAL records, always pass: one-off
+    messages such as a camera connecting or failing must never vanish just
+    because other cameras logged the same line.
+    """
+
+    def __init__(self, burst: int = 5, interval: float = 10.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.suppressed = 0  # Records dropped since start
+        self._sites: dict[tuple, list] = {}  # [window start, passed, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        limit = getattr(record, "rate_limit", None)
+        if limit is None or record.levelno >= logging.CRITICAL:
+            return True
+        now = time.monotonic()
+        key = (record.pathname, record.lineno, limit)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                self._sites[key] = [now, 1, 0]
+                return True
+            if now - site[0] >= self.interval:
+                dropped = site[2]
+                site[:] = [now, 1, 0]
+            elif site[1] < self.burst:
+                site[1] += 1
+                dropped = 0
+            else:
+                site[2] += 1
+                self.suppressed += 1
+                return False
+
+        if dropped:
+            record.msg = f"{record.getMessage()} (+{dropped} similar suppressed)"
+            record.args = None
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues the record untouched: message formatting and I/O both happen
+    on the listener thread, so a log call costs the caller a LogRecord and a
+    queue put. (The stock prepare() formats eagerly, for pickling across
+    processes, which is not needed here.)
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    log_file: Path | None = None,
+    console_level: int = logging.INFO,
+    stream=None,
+    burst: int = 5,
+    interval: float = 10.0,
+) -> QueueListener:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    The root logger gets a single non-blocking QueueHandler (rate limiting
+    the call sites that opt in with ``rate_limited``); the console and optional file handlers run on the
+    listener thread. Replaces any handlers installed before, so calling it
+    again reconfigures.
+
+    Args:
+        level: Root level (records below it are never created)
+        log_file: Also write here, at ``level``
+        console_level: Minimum level shown on the console
+        stream: Console stream (default: stderr)
+        burst: Records let through per rate-limited site per ``interval``
+        interval: Rate limiting window in seconds
+    """
+    global _listener, _rate_limit
+    shutdown_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    console = logging.StreamHandler(stream or sys.stderr)
+    console.setLevel(console_level)
+    handlers: list[logging.Handler] = [console]
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setLevel(level)
+        handlers.append(file_handler)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+        old.close()
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _rate_limit = RateLimitFilter(burst, interval)
+    queue_handler = _DeferredQueueHandler(records)
+    queue_handler.addFilter(_rate_limit)
+    root.addHandler(queue_handler)
+    root.setLevel(min(level, console_level))
+
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def suppressed_records() -> int:
+    """Log records dropped by rate limiting since logging was configured"""
+    return _rate_limit.suppressed if _rate_limit else 0
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+
+from .latency import SHORT_WINDOW, LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Frames from our own sources are preferred when blaming a stall
+_SOURCE_ROOT = str(Path(__file__).resolve().parents[1])
+
+
+@dataclass
+class StallOffender:
+    """Where one loop was found blocked, and how badly"""
+
+    loop: str
+    function: str  # "server/handler.py:_decode_and_send"
+    stack: str  # Compact innermost frames at the last capture
+    count: int = 0
+    total: float = 0.0  # Seconds of lag attributed
+    max: float = 0.0
+
+
+class _WatchedLoop:
+    def __init__(self, name: str, loop: asyncio.AbstractEventLoop):
+        self.name = name
+        self.loop = loop
+        self.thread_id: int | None = None  # Known after the first heartbeat
+        self.last_beat = time.monotonic()
+        self.histogram = LatencyHistogram()
+        self.captured: tuple[str, str] | None = None  # Blame for the ongoing stall
+
+
+class LoopLagMonitor:
+    """
+    Continuous scheduling-lag measurement for event loops, with blame.
+
+    Each watched loop runs a heartbeat callback every ``interval``; how late
+    it fires is the loop's lag, kept in a histogram. A watcher thread checks
+    the heartbeats, and when one is overdue by more than ``threshold`` it
+    grabs that loop thread's stack (``sys._current_frames``) while the stall
+    is still going on. The stall is charged to the innermost function of
+    ours on that stack once the loop recovers and its length is known.
+    """
+
+    def __init__(self, interval: float = 0.02, threshold: float = 0.05):
+        """
+        Args:
+            interval: Heartbeat period (also the watcher's poll period)
+            threshold: Lag that counts as a stall and gets a stack capture
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = 0
+        self.offenders: dict[tuple[str, str], StallOffender] = {}
+
+        self._loops: dict[str, _WatchedLoop] = {}
+        self._generation = 0  # Heartbeats from an earlier start() stop themselves
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def watch_loop(self, name: str, loop: asyncio.AbstractEventLoop):
+        watched = self._loops[name] = _WatchedLoop(name, loop)
+        if self._thread:
+            self._arm(watched)
+
+    def start(self):
+        if self._thread:
+            return
+        self._generation += 1
+        self._stop.clear()
+        for watched in self._loops.values():
+            self._arm(watched)
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._generation += 1
+        self._loops.clear()
+        top = self.describe_offenders()
+        if top:
+            logger.info(f"🐢 Event loop stalls so far: {top}")
+
+    def _arm(self, watched: _WatchedLoop):
+        generation = self._generation
+        watched.last_beat = time.monotonic()
+        try:
+            watched.loop.call_soon_threadsafe(self._schedule, watched, generation)
+        except RuntimeError:  # Loop already closed
+            self._loops.pop(watched.name, None)
+
+    def _schedule(self, watched: _WatchedLoop, generation: int):
+        """On the loop: first heartbeat"""
+        watched.thread_id = threading.get_ident()
+        watched.last_beat = time.monotonic()
+        watched.loop.call_later(
+            self.interval, self._beat, watched, generation, watched.loop.time() + self.interval
+        )
+
+    def _beat(self, watched: _WatchedLoop, generation: int, due: float):
+        """On the loop: measure how late we are, then schedule the next one"""
+        if generation != self._generation:
+            return
+        now = watched.loop.time()
+        lag = max(now - due, 0.0)
+        watched.last_beat = time.monotonic()
+        watched.histogram.observe(lag)
+        if lag >= self.threshold:
+            self._record_stall(watched, lag)
+        watched.captured = None
+        watched.loop.call_later(self.interval, self._beat, watched, generation, now + self.interval)
+
+    def _record_stall(self, watched: _WatchedLoop, lag: float):
+        function, stack = watched.captured or ("(not captured)", "")
+        self.stalls += 1
+
+        offender = self.offenders.get((watched.name, function))
+        if offender is None:
+            offender = self.offenders[(watched.name, function)] = StallOffender(
+                watched.name, function, stack
+            )
+        offender.count += 1
+        offender.total += lag
+        offender.max = max(offender.max, lag)
+        if stack:
+            offender.stack = stack
+        logger.warning(
+            f"🐢 Event loop {watched.name} blocked {lag * 1000:.0f}ms in {function}"
+            + (f" ({stack})" if stack else "")
+        )
+
+    def _watch(self):
+        """Watcher thread: catch loops mid-stall and grab their stacks"""
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            for watched in list(self._loops.values()):
+                overdue = now - watched.last_beat - self.interval
+                if overdue < self.threshold or watched.captured or watched.thread_id is None:
+                    continue
+                frame = sys._current_frames().get(watched.thread_id)
+                if frame is not None:
+                    watched.captured = _blame(traceback.extract_stack(frame))
+
+    def lag_percentiles(
+        self, window: float | None = SHORT_WINDOW, point: int = 99
+    ) -> dict[str, float]:
+        """Lag percentile per loop over ``window`` seconds (loops with samples only)"""
+        lag = {}
+        for name, watched in list(self._loops.items()):
+            points = watched.histogram.percentiles(window, (point,))
+            if points:
+                lag[name] = points[point]
+        return lag
+
+    def histograms(self) -> dict[str, LatencyHistogram]:
+        return {name: watched.histogram for name, watched in list(self._loops.items())}
+
+    def top_offenders(self, count: int = 10) -> list[StallOffender]:
+        """Functions that blocked loops the longest in total"""
+        return sorted(self.offenders.values(), key=lambda o: o.total, reverse=True)[:count]
+
+    def describe_offenders(self, count: int = 5) -> str:
+        """Compact log form: 'main server/handler.py:f 3× 240ms (max 120ms), ...'"""
+        return ", ".join(
+            f"{o.loop} {o.function} {o.count}× {o.total * 1000:.0f}ms (max {o.max * 1000:.0f}ms)"
+            for o in self.top_offenders(count)
+        )
+
+
+def _blame(stack: traceback.StackSummary) -> tuple[str, str]:
+    """
+    The function to charge: the innermost frame from our sources (a stall
+    inside libav or the stdlib belongs to whoever called it), plus the
+    last few frames for context
+    """
+    ours = [f for f in stack if f.filename.startswith(_SOURCE_ROOT) and f.filename != __file__]
+    frame = ours[-1] if ours else stack[-1]
+    function = f"{_short_path(frame.filename)}:{frame.name}"
+    context = " → ".join(
+        f"{_short_path(f.filename)}:{f.name}:{f.lineno}" for f in (ours or list(stack))[-4:]
+    )
+    return function, context
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_SOURCE_ROOT):
+        return Path(filename).relative_to(_SOURCE_ROOT).as_posix()
+    return Path(filename).name
@@ -0,0 +1,459 @@
+import asyncio
+import ipaddress
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qs
+
+from .latency import LONG_WINDOW, SHORT_WINDOW, LatencyHistogram
+from .logconfig import suppressed_records
+from .profiler import FORMATS
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond conversions up to a stalled decode
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066, 0.1, 0.25, 0.5, 1.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class CameraMetrics:
+    """
+    Per-camera counters for the metrics endpoint. Plain attribute
+    increments on the hot path; the scraper only reads them. Stage
+    latencies live in the handler's StageLatency.
+    """
+
+    video_received: int = 0
+    audio_received: int = 0
+    metadata_received: int = 0
+    video_decoded: int = 0
+    audio_decoded: int = 0
+    decode_errors: int = 0
+    send_failures: int = 0  # Output refused a decoded frame
+    connections: int = 0
+
+
+class Exposition:
+    """Builds Prometheus text exposition, one metric family at a time"""
+
+    def __init__(self, prefix: str = "vss_"):
+        self.prefix = prefix
+        self.lines: list[str] = []
+
+    def family(self, name: str, kind: str, help_text: str, samples: list[tuple[dict, Any]]):
+        name = self.prefix + name
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(
+        self, name: str, help_text: str, samples: list[tuple[dict, LatencyHistogram]]
+    ):
+        name = self.prefix + name
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in samples:
+            for le, count in histogram.cumulative(LATENCY_BUCKETS):
+                self.lines.append(f"{name}_bucket{_labels({**labels, 'le': le})} {count}")
+            self.lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+            self.lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def render_metrics(bridge) -> str:
+    """Snapshot an OMTBridgeServer's cameras, decode queues and paths as text"""
+    out = Exposition()
+    cameras = sorted(list(bridge.streams.items()))
+    connected = dict(bridge.active_handlers)
+
+    out.family("up", "gauge", "Bridge server is accepting phones", [({}, bridge.listening.is_set())])
+    out.family("cameras", "gauge", "Configured camera slots", [({}, len(cameras))])
+    out.family(
+        "cameras_connected", "gauge", "Camera slots with a phone streaming", [({}, len(connected))]
+    )
+
+    def per_camera(value):
+        return [({"camera": phone_id}, value(handler)) for phone_id, handler in cameras]
+
+    def per_kind(video, audio):
+        return [
+            sample
+            for phone_id, handler in cameras
+            for sample in (
+                ({"camera": phone_id, "kind": "video"}, video(handler)),
+                ({"camera": phone_id, "kind": "audio"}, audio(handler)),
+            )
+        ]
+
+    out.family(
+        "camera_connected", "gauge", "A phone is streaming to this camera",
+        per_camera(lambda h: h.config.phone_id in connected),
+    )
+    out.family(
+        "frames_received_total", "counter", "Frames read from the phone",
+        per_kind(lambda h: h.metrics.video_received, lambda h: h.metrics.audio_received)
+        + [
+            ({"camera": phone_id, "kind": "metadata"}, handler.metrics.metadata_received)
+            for phone_id, handler in cameras
+        ],
+    )
+    out.family(
+        "frames_decoded_total", "counter", "Frames decoded",
+        per_kind(
+            lambda h: h.metrics.video_decoded,
+            lambda h: h.metrics.audio_decoded + h.lane_audio_decoded,
+        ),
+    )
+    out.family(
+        "frames_sent_total", "counter", "Frames delivered to the output (OMT / virtual camera)",
+        per_kind(lambda h: h.video_frame_count, lambda h: h.audio_frame_count),
+    )
+
+    dropped = []
+    for phone_id, handler in cameras:
+        deadlines = handler.decode_scheduler.camera_stats(phone_id) if handler.decode_scheduler else None
+        for reason, value in (
+            ("shed", deadlines.shed if deadlines else 0),
+            ("decode_error", handler.metrics.decode_errors),
+            ("send_failed", handler.metrics.send_failures),
+        ):
+            dropped.append(({"camera": phone_id, "reason": reason}, value))
+    out.family("frames_dropped_total", "counter", "Video frames not delivered, by reason", dropped)
+    out.family(
+        "deadline_missed_total", "counter", "Frames delivered after their decode deadline",
+        [
+            ({"camera": phone_id}, handler.decode_scheduler.camera_stats(phone_id).missed)
+            for phone_id, handler in cameras
+            if handler.decode_scheduler
+        ],
+    )
+    out.family(
+        "bytes_received_total", "counter", "Payload bytes read from the phone",
+        per_camera(lambda h: h.bytes_received),
+    )
+
+    _render_stage_latency(out, cameras)
+
+    out.family(
+        "decode_queue_depth", "gauge", "Frames waiting for a decode worker",
+        [
+            ({"camera": phone_id}, handler.decode_scheduler.camera_stats(phone_id).queued)
+            for phone_id, handler in cameras
+            if handler.decode_scheduler
+        ],
+    )
+    out.family(
+        "audio_buffer_frames", "gauge", "Audio lane jitter buffer occupancy",
+        per_camera(lambda h: len(h.audio_jitter)),
+    )
+    schedulers = [("main", bridge.decode_scheduler)]
+    if bridge.shard_pool:
+        schedulers += [(str(shard.index), shard.scheduler) for shard in bridge.shard_pool.shards]
+    out.family(
+        "decode_workers_busy", "gauge", "Decode jobs running, per scheduler",
+        [({"scheduler": name}, scheduler.busy) for name, scheduler in schedulers],
+    )
+
+    out.family(
+        "connections_total", "counter", "Phone connections accepted",
+        per_camera(lambda h: h.metrics.connections),
+    )
+    out.family(
+        "reconnects_total", "counter", "Sessions continued on a new connection",
+        [
+            sample
+            for phone_id, handler in cameras
+            for sample in (
+                ({"camera": phone_id, "kind": "resume"}, handler.resume_count),
+                ({"camera": phone_id, "kind": "path_move"}, handler.path_moves),
+            )
+        ],
+    )
+
+    out.family(
+        "phone_battery_percent", "gauge", "Phone battery level",
+        [
+            ({"camera": phone_id}, handler.battery_percent)
+            for phone_id, handler in cameras
+            if handler.battery_percent >= 0
+        ],
+    )
+    out.family(
+        "phone_temperature_celsius", "gauge", "Phone CPU temperature",
+        [
+            ({"camera": phone_id}, handler.cpu_temperature_celsius)
+            for phone_id, handler in cameras
+            if handler.cpu_temperature_celsius > 0
+        ],
+    )
+
+    quality = {phone_id: handler.network_quality for phone_id, handler in connected.items()}
+    out.family(
+        "network_goodput_bps", "gauge", "Received goodput",
+        [({"camera": phone_id}, q.goodput_bps) for phone_id, q in sorted(quality.items())],
+    )
+    out.family(
+        "network_jitter_seconds", "gauge", "Mean frame arrival jitter",
+        [({"camera": phone_id}, q.jitter_ms / 1000) for phone_id, q in sorted(quality.items())],
+    )
+    out.family(
+        "network_queue_delay_seconds", "gauge", "One-way delay above the best seen",
+        [({"camera": phone_id}, q.queue_delay_ms / 1000) for phone_id, q in sorted(quality.items())],
+    )
+    out.family(
+        "bitrate_requested_bps", "gauge", "Bitrate last asked of the phone",
+        per_camera(lambda h: h.requested_bitrate or h.video_bitrate),
+    )
+
+    out.family(
+        "path_up", "gauge", "Network path is usable",
+        [({"address": address}, path.up) for address, path in sorted(bridge.paths.items())],
+    )
+    out.family(
+        "decode_cpu_seconds_total", "counter", "Decode worker CPU time spent on each camera",
+        [
+            ({"camera": phone_id}, handler.decode_scheduler.camera_stats(phone_id).cpu_seconds)
+            for phone_id, handler in cameras
+            if handler.decode_scheduler
+        ],
+    )
+
+    # Process resources, from the server's sampler (refreshed every couple of seconds)
+    resources = bridge.resource_sampler.latest
+    if resources.time:
+        _render_resources(out, resources)
+
+    # Event loop lag (heartbeat lateness) and what blocked the loops
+    lag_monitor = bridge.lag_monitor
+    out.histogram(
+        "event_loop_lag_seconds", "How late each loop's heartbeat callback ran",
+        [({"loop": name}, histogram) for name, histogram in sorted(lag_monitor.histograms().items())],
+    )
+    offenders = lag_monitor.top_offenders()
+    out.family(
+        "event_loop_stalls_total", "counter", "Loop stalls over the threshold, by blocking function",
+        [({"loop": o.loop, "function": o.function}, o.count) for o in offenders],
+    )
+    out.family(
+        "event_loop_stall_seconds_total", "counter", "Lag from loop stalls, by blocking function",
+        [({"loop": o.loop, "function": o.function}, o.total) for o in offenders],
+    )
+
+    out.family(
+        "log_records_suppressed_total", "counter", "Log records dropped by rate limiting",
+        [({}, suppressed_records())],
+    )
+    return out.render()
+
+
+def _render_stage_latency(out: Exposition, cameras: list):
+    stages = [
+        (phone_id, stage, histogram)
+        for phone_id, handler in cameras
+        for stage, histogram in handler.latency.stages().items()
+    ]
+    out.histogram(
+        "stage_latency_seconds",
+        "Per-stage latency: read (payload after header), decode, convert (NV12), "
+        "send (output), preview (RGB), process (received to sent)",
+        [({"camera": phone_id, "stage": stage}, histogram) for phone_id, stage, histogram in stages],
+    )
+    quantiles = []
+    for window, label in ((SHORT_WINDOW, "10s"), (LONG_WINDOW, "5m")):
+        for phone_id, stage, histogram in stages:
+            for point, value in (histogram.percentiles(window) or {}).items():
+                labels = {"camera": phone_id, "stage": stage, "window": label}
+                quantiles.append(({**labels, "quantile": point / 100}, value))
+    out.family(
+        "stage_latency_quantile_seconds", "gauge",
+        "Windowed per-stage latency percentiles (p50/p95/p99)", quantiles,
+    )
+
+
+def _render_resources(out: Exposition, resources):
+    """Process resources, from the server's sampler"""
+    out.family(
+        "process_resident_memory_bytes", "gauge", "Resident set size",
+        [({}, resources.rss_bytes)],
+    )
+    out.family(
+        "process_cpu_percent", "gauge", "Process CPU use (100 = one core)",
+        [({}, resources.cpu_percent)],
+    )
+    out.family(
+        "thread_cpu_percent", "gauge", "CPU use per thread name (100 = one core)",
+        [({"thread": name}, value) for name, value in sorted(resources.threads.items())],
+    )
+    out.family(
+        "camera_decode_cpu_percent", "gauge", "Decode CPU use per camera (100 = one core)",
+        [({"camera": camera}, value) for camera, value in sorted(resources.camera_decode_cpu.items())],
+    )
+    out.family(
+        "system_cpu_percent", "gauge", "System-wide CPU use (all cores, 0-100)",
+        [({}, resources.system_cpu_percent)],
+    )
+    if resources.load_average:
+        out.family(
+            "system_load_average", "gauge", "System load average",
+            [
+                ({"period": period}, value)
+                for period, value in zip(("1m", "5m", "15m"), resources.load_average)
+            ],
+        )
+
+
+def health(bridge) -> tuple[bool, dict]:
+    """Liveness for /healthz: listening and not shutting down"""
+    healthy = bridge.listening.is_set() and not bridge._stopped.is_set() and not bridge.handed_over
+    return healthy, {
+        "status": "ok" if healthy else "unavailable",
+        "cameras": len(bridge.streams),
+        "connected": sorted(bridge.active_handlers),
+    }
+
+
+def is_loopback(host: str) -> bool:
+    """True if a bind address only accepts connections from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # Hostname, or "" for every interface
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint on the bridge's event loop: /metrics (Prometheus
+    text exposition), /healthz, and /trace (the frame tracer's ring as
+    Chrome trace JSON, when tracing is on). Rendering reads counters the
+    camera loops update and runs on a worker thread, so a scrape never
+    holds up the loop (which streams cameras itself when shards=1).
+
+    Also the control socket for the sampling profiler: POST
+    /profile/start?rate=200 and /profile/stop?format=folded (default
+    speedscope), which answers with the path of the written profile.
+    These are unauthenticated, so they are only served when the endpoint
+    is bound to loopback; elsewhere they answer 403 (use SIGUSR2).
+    """
+
+    def __init__(self, bridge, host: str = "127.0.0.1", port: int = 9100):
+        self.bridge = bridge
+        self.host = host
+        self.port = port
+        self.allow_control = is_loopback(host)
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> bool:
+        try:
+            self._server = await asyncio.start_server(
+                self._handle, self.host, self.port, reuse_address=True
+            )
+        except OSError as e:
+            logger.error(f"❌ Could not open metrics endpoint on {self.host}:{self.port}: {e}")
+            return False
+        logger.info(f"📈 Metrics on http://{self.host}:{self.port}/metrics (health: /healthz)")
+        if not self.allow_control:
+            logger.warning("⚠️ Metrics endpoint is not local only; /profile control is disabled")
+        return True
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5.0)
+            method, path, *_ = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+            path, _, query = path.partition("?")
+            params = {key: values[-1] for key, values in parse_qs(query).items()}
+
+            if method == "POST" and path.startswith("/profile/"):
+                status, content_type, body = await self._profile(path, params)
+            elif method not in ("GET", "HEAD"):
+                status, content_type, body = "405 Method Not Allowed", "text/plain", b""
+            elif path == "/metrics":
+                status, content_type = "200 OK", CONTENT_TYPE
+                body = (await asyncio.to_thread(render_metrics, self.bridge)).encode("utf-8")
+            elif path == "/healthz":
+                healthy, state = health(self.bridge)
+                status = "200 OK" if healthy else "503 Service Unavailable"
+                content_type, body = "application/json", json.dumps(state).encode("utf-8")
+            elif path == "/trace" and self.bridge.tracer:
+                trace = await asyncio.to_thread(self.bridge.tracer.to_chrome)
+                status, content_type = "200 OK", "application/json"
+                body = json.dumps(trace).encode("utf-8")
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"Not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+            )
+            if method != "HEAD":
+                writer.write(body)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError):
+            pass  # Not HTTP, or gave up; just hang up
+        except Exception as e:
+            logger.error(f"❌ Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+    async def _profile(self, path: str, params: dict[str, str]) -> tuple[str, str, bytes]:
+        if not self.allow_control:
+            return "403 Forbidden", "text/plain", b"Profiler control is local only\n"
+        if path == "/profile/start":
+            try:
+                rate = float(params.get("rate", 100))
+            except ValueError:
+                rate = 0.0
+            if not 1 <= rate <= 1000:
+                return "400 Bad Request", "text/plain", b"rate must be 1-1000 Hz\n"
+            started = self.bridge.start_profiling(rate)
+            state = {"running": True, "started": started, "rate": self.bridge.profiler.rate}
+            status = "200 OK" if started else "409 Conflict"
+            return status, "application/json", json.dumps(state).encode()
+        if path == "/profile/stop":
+            fmt = params.get("format", "speedscope")
+            if fmt not in FORMATS:
+                return "400 Bad Request", "text/plain", f"format must be one of {FORMATS}\n".encode()
+            written = await asyncio.to_thread(self.bridge.stop_profiling, fmt)
+            if written is None:
+                return "409 Conflict", "application/json", json.dumps({"running": False}).encode()
+            profiler = self.bridge.profiler
+            state = {
+                "path": written,
+                "samples": profiler.samples,
+                "seconds": round(profiler.duration, 3),
+            }
+            return "200 OK", "application/json", json.dumps(state).encode()
+        return "404 Not Found", "text/plain", b"Not found\n"
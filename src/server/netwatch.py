@@ -0,0 +1,186 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import struct
+import sys
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# rtnetlink message types and multicast groups (linux/rtnetlink.h)
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+
+_NLMSGHDR = struct.Struct("=IHHII")  # len, type, flags, seq, pid
+_IFADDRMSG = struct.Struct("=BBBBI")  # family, prefixlen, flags, scope, index
+_RTATTR = struct.Struct("=HH")  # len, type
+
+_EVENT_NAMES = {
+    RTM_NEWLINK: "link up/change",
+    RTM_DELLINK: "link removed",
+    RTM_NEWADDR: "address added",
+    RTM_DELADDR: "address removed",
+}
+
+
+@dataclass
+class NetworkEvent:
+    """A single rtnetlink notification"""
+
+    kind: int
+    if_index: int = 0
+    address: str | None = None  # For address events
+
+    @property
+    def name(self) -> str:
+        return _EVENT_NAMES.get(self.kind, f"type {self.kind}")
+
+    @property
+    def removed(self) -> bool:
+        return self.kind in (RTM_DELADDR, RTM_DELLINK)
+
+
+def parse_netlink_messages(data: bytes) -> list[NetworkEvent]:
+    """Decode the link/address notifications in one netlink datagram"""
+    events = []
+    offset = 0
+
+    while offset + _NLMSGHDR.size <= len(data):
+        msg_len, msg_type, _, _, _ = _NLMSGHDR.unpack_from(data, offset)
+        if msg_len < _NLMSGHDR.size or offset + msg_len > len(data):
+            break
+
+        body = offset + _NLMSGHDR.size
+        if msg_type in (RTM_NEWADDR, RTM_DELADDR) and body + _IFADDRMSG.size <= len(
+            data
+        ):
+            family, _, _, _, if_index = _IFADDRMSG.unpack_from(data, body)
+            address = _parse_address(
+                data[body + _IFADDRMSG.size : offset + msg_len], family
+            )
+            events.append(NetworkEvent(msg_type, if_index, address))
+        elif msg_type in (RTM_NEWLINK, RTM_DELLINK):
+            # ifinfomsg: family, pad, type, index, flags, change
+            if_index = struct.unpack_from("=i", data, body + 4)[0]
+            events.append(NetworkEvent(msg_type, if_index))
+
+        offset += (msg_len + 3) & ~3  # NLMSG_ALIGN
+
+    return events
+
+
+def _parse_address(attrs: bytes, family: int) -> str | None:
+    """Pull IFA_LOCAL (or IFA_ADDRESS) out of an ifaddrmsg attribute list"""
+    found = {}
+    offset = 0
+    while offset + _RTATTR.size <= len(attrs):
+        attr_len, attr_type = _RTATTR.unpack_from(attrs, offset)
+        if attr_len < _RTATTR.size:
+            break
+        if attr_type in (IFA_ADDRESS, IFA_LOCAL):
+            found[attr_type] = attrs[offset + _RTATTR.size : offset + attr_len]
+        offset += (attr_len + 3) & ~3  # RTA_ALIGN
+
+    raw = found.get(IFA_LOCAL) or found.get(IFA_ADDRESS)
+    if raw is None:
+        return None
+    try:
+        if family == socket.AF_INET and len(raw) == 4:
+            return str(ipaddress.IPv4Address(raw))
+        if family == socket.AF_INET6 and len(raw) == 16:
+            return str(ipaddress.IPv6Address(raw))
+    except ValueError:
+        pass
+    return None
+
+
+class NetlinkWatcher:
+    """
+    Wakes on real link/address changes via an rtnetlink multicast socket.
+
+    Linux only; ``start()`` returns False elsewhere (or if the socket can't be
+    opened) so callers can fall back to polling.
+    """
+
+    def __init__(self):
+        self.sock: socket.socket | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: list[NetworkEvent] = []
+        self._changed = asyncio.Event()
+
+    @property
+    def active(self) -> bool:
+        return self.sock is not None
+
+    def start(self) -> bool:
+        if not sys.platform.startswith("linux") or not hasattr(socket, "AF_NETLINK"):
+            return False
+
+        try:
+            sock = socket.socket(
+                socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE
+            )
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+            sock.setblocking(False)
+        except OSError as e:
+            logger.info(f"Netlink unavailable, polling network instead: {e}")
+            return False
+
+        self.sock = sock
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(sock.fileno(), self._on_readable)
+        return True
+
+    def _on_readable(self):
+        assert self.sock is not None
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                # ENOBUFS: we missed notifications; still worth a re-check
+                logger.debug(f"Netlink receive error: {e}")
+                self._changed.set()
+                break
+            self._pending.extend(parse_netlink_messages(data))
+
+        if self._pending:
+            self._changed.set()
+
+    async def wait(
+        self, timeout: float, settle: float = 0.2
+    ) -> list[NetworkEvent] | None:
+        """
+        Wait for changes; returns the events seen, or None on timeout.
+
+        Bursts (e.g. DHCP renewals emit several messages) are coalesced by
+        waiting ``settle`` seconds after the first one.
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        await asyncio.sleep(settle)
+        self._changed.clear()
+        events, self._pending = self._pending, []
+        return events
+
+    def stop(self):
+        if self.sock is None:
+            return
+        if self._loop and not self._loop.is_closed():
+            self._loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+        self.sock = None
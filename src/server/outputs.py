@@ -1,4 +1,5 @@
 import ctypes
+import threading
 import av
 import numpy as np
 import logging
@@ -6,10 +7,7 @@ import logging
 from omt.sender import OMTSender
 from omt.types import OMTCodec, OMTQuality, OMTMediaFrame, OMTFrameType
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from .logconfig import rate_limited
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +20,10 @@ class FrameOutput:
     def send_audio_frame(self, audio_frame: av.AudioFrame) -> bool:
         raise NotImplementedError
     
+    def get_tally(self) -> tuple[bool, bool] | None:
+        """(preview, program) tally from the receiving side, if supported"""
+        return None
+    
     def destroy(self):
         pass
 
@@ -35,7 +37,7 @@ class NativeWindowsOutput(FrameOutput):
         self.stream_id = stream_id
         self.frame_count = 0
     
-    def send_video_frame(self, frame: np.ndarray, width: int, height: int) -> bool:
+    def send_video_frame(self, frame: np.ndarray, width: int, height: int, timestamp: int = -1) -> bool:
         """Send NV12 frame to native Windows camera via wrapper"""
         # TODO: Implement TCP communication to VirtualCameraWrapper.exe
         # For now, return False to indicate no active connection
@@ -54,12 +56,19 @@ class NativeWindowsOutput(FrameOutput):
         pass
 
 class OMTOutput(FrameOutput):
-    """OMT output wrapper with dynamic reconfiguration"""
+    """
+    OMT output wrapper with dynamic reconfiguration.
+
+    Video is sent from decode worker threads and audio from the camera's
+    event loop; every call into the sender holds ``_sender_lock``, since
+    libomt makes no promise that one sender can be used from two threads.
+    """
     
     def __init__(self, name: str, lib_path: str = "libomt.dll", quality: int = 50):
         self.name = name
         self.lib_path = lib_path
         self.quality = quality
+        self._sender_lock = threading.Lock()
         self.sender = OMTSender(lib_path)
         if not self.sender.create_sender(name, quality):
             raise RuntimeError("Failed to create OMT sender")
@@ -81,14 +90,15 @@ class OMTOutput(FrameOutput):
         logger.info(f"🔄 Reconfiguring OMT sender: {self.current_width}x{self.current_height}@{self.current_fps}fps → {width}x{height}@{fps}fps")
         
         try:
-            # Destroy old sender
-            self.sender.destroy()
-            
-            # Create new sender with same name
-            self.sender = OMTSender(self.lib_path)
-            if not self.sender.create_sender(self.name, OMTQuality.Medium):
-                logger.error("Failed to recreate OMT sender")
-                return False
+            with self._sender_lock:
+                # Destroy old sender
+                self.sender.destroy()
+
+                # Create new sender with same name
+                self.sender = OMTSender(self.lib_path)
+                if not self.sender.create_sender(self.name, OMTQuality.Medium):
+                    logger.error("Failed to recreate OMT sender")
+                    return False
             
             # Update tracked config
             self.current_width = width
@@ -111,14 +121,15 @@ class OMTOutput(FrameOutput):
         logger.info(f"🔄 Updating OMT quality for {self.name}: {quality_value}")
         
         try:
-            # Destroy old sender
-            self.sender.destroy()
-            
-            # Create new sender with new quality
-            self.sender = OMTSender(self.lib_path)
-            if not self.sender.create_sender(self.name, quality_value):
-                logger.error("Failed to recreate OMT sender with new quality")
-                return False
+            with self._sender_lock:
+                # Destroy old sender
+                self.sender.destroy()
+
+                # Create new sender with new quality
+                self.sender = OMTSender(self.lib_path)
+                if not self.sender.create_sender(self.name, quality_value):
+                    logger.error("Failed to recreate OMT sender with new quality")
+                    return False
             
             logger.info("✅ OMT quality updated successfully")
             return True
@@ -130,7 +141,8 @@ class OMTOutput(FrameOutput):
     def send_video_frame(self, frame: np.ndarray, width: int, height: int, timestamp: int = -1) -> bool:
         """Send NV12 video frame to OMT"""
         # Use current_fps from our tracked config
-        success = self.sender.send_video_frame(frame, width, height, OMTCodec.NV12, self.current_fps, timestamp)
+        with self._sender_lock:
+            success = self.sender.send_video_frame(frame, width, height, OMTCodec.NV12, self.current_fps, timestamp)
         if success:
             self.video_frame_count += 1
         return success
@@ -163,7 +175,7 @@ class OMTOutput(FrameOutput):
             if len(pcm_data.shape) == 2:
                 # Shape is (channels, samples_per_channel) - this is ALREADY planar!
                 # Just flatten in C-order to get [ch0_samples][ch1_samples]
-                logger.debug(f"Audio shape {pcm_data.shape} is already planar (channels, samples)")
+                # (shape is logged once, on the first frame; not per frame)
                 pcm_data = np.ascontiguousarray(pcm_data, dtype=np.float32).flatten('C')
             else:
                 # If 1D, assume it's already interleaved and needs deinterleaving
@@ -209,18 +221,32 @@ class OMTOutput(FrameOutput):
             omt_frame.FrameMetadata = None
             omt_frame.FrameMetadataLength = 0
             
-            result = self.sender.lib.omt_send(self.sender.sender, ctypes.byref(omt_frame))
+            with self._sender_lock:
+                result = self.sender.lib.omt_send(self.sender.sender, ctypes.byref(omt_frame))
             
             if result >= 0:
                 self.audio_frame_count += 1
                 return True
             else:
-                logger.warning(f"⚠️ OMT audio rejected (error code: {result})")
+                logger.warning(
+                    f"⚠️ OMT audio rejected for {self.name} (error code: {result})",
+                    extra=rate_limited(self.name),
+                )
                 return False
         except Exception as e:
-            logger.error(f"Error sending audio via OMT: {e}", exc_info=True)
+            logger.error(
+                f"Error sending audio via OMT for {self.name}: {e}",
+                exc_info=True,
+                extra=rate_limited(self.name),
+            )
             return False
     
+    def get_tally(self) -> tuple[bool, bool] | None:
+        """Poll vMix/OBS tally for this sender without blocking"""
+        with self._sender_lock:
+            return self.sender.get_tally(0)
+    
     def destroy(self):
         """Cleanup OMT"""
-        self.sender.destroy()
\ No newline at end of file
+        with self._sender_lock:
+            self.sender.destroy()
\ No newline at end of file
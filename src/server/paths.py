@@ -0,0 +1,69 @@
+import logging
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Interfaces that never lead to a phone (containers, VMs, VPNs)
+VIRTUAL_INTERFACE_PATTERNS = (
+    "docker",
+    "veth",
+    "br-",
+    "virbr",
+    "vmnet",
+    "vbox",
+    "virtualbox",
+    "vethernet",
+    "hyper-v",
+    "tun",
+    "tap",
+    "utun",
+    "wg",
+    "tailscale",
+    "zt",
+)
+
+
+def usable_interfaces(ip_addresses: list[dict]) -> list[dict]:
+    """Interfaces worth listening on in multi-NIC mode (Wi-Fi, Ethernet, USB tether)"""
+    return [
+        addr_info
+        for addr_info in ip_addresses
+        if not any(
+            pattern in addr_info["interface"].lower()
+            for pattern in VIRTUAL_INTERFACE_PATTERNS
+        )
+    ]
+
+
+@dataclass
+class NetworkPath:
+    """One local address the server listens on, and what has used it"""
+
+    address: str
+    interface: str = "unknown"
+    up: bool = True
+    connections: int = 0  # Accepted since start
+    moves_in: int = 0  # Sessions resumed here after leaving another path
+    down_events: int = 0
+    changed_at: float = field(default_factory=time.time)
+
+    def set_up(self, up: bool) -> bool:
+        """Record an up/down transition; True if the state changed"""
+        if up == self.up:
+            return False
+        self.up = up
+        self.changed_at = time.time()
+        if not up:
+            self.down_events += 1
+        return True
+
+    def as_dict(self) -> dict:
+        return {
+            "address": self.address,
+            "interface": self.interface,
+            "up": self.up,
+            "connections": self.connections,
+            "moves_in": self.moves_in,
+            "down_events": self.down_events,
+        }
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Callable
+
+from .tracing import diagnostics_dir
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("speedscope", "folded")
+
+# Connection tasks are named after their camera so samples can be attributed
+CAMERA_TASK_PREFIX = "camera-"
+
+MAX_DEPTH = 128  # Frames kept per stack (innermost), enough for any of our paths
+
+
+def camera_task_name(phone_id: int) -> str:
+    return f"{CAMERA_TASK_PREFIX}{phone_id}"
+
+
+def loop_camera(loop: asyncio.AbstractEventLoop) -> int | None:
+    """Camera whose task is running on ``loop`` right now (callable from any thread)"""
+    task = asyncio.current_task(loop)
+    if task is None:
+        return None
+    name = task.get_name()
+    if not name.startswith(CAMERA_TASK_PREFIX):
+        return None
+    try:
+        return int(name[len(CAMERA_TASK_PREFIX):])
+    except ValueError:
+        return None
+
+
+class SamplingProfiler:
+    """
+    On-demand statistical profiler for every thread in the process.
+
+    A sampler thread grabs all Python stacks (``sys._current_frames``) at
+    ``rate`` Hz and counts identical (thread, camera, stack) samples; stacks
+    are kept as code objects and only turned into names on export, so a
+    sample is a dictionary walk with no string work. ``thread_camera`` maps
+    a thread id to the camera it is working for at that instant (decode
+    workers, camera loops), which tags the sample.
+
+    Export as folded stacks (flamegraph.pl, inferno, speedscope) or as a
+    speedscope JSON with one profile per thread and camera.
+    """
+
+    def __init__(
+        self,
+        rate: float = 100.0,
+        thread_camera: Callable[[int], int | None] | None = None,
+    ):
+        """
+        Args:
+            rate: Samples per second (each walks every thread's stack)
+            thread_camera: Camera a thread is busy with, if any
+        """
+        self.rate = rate
+        self.thread_camera = thread_camera
+        self.samples = 0  # Sampling passes
+        self.counts: Counter[tuple[str, int | None, tuple[CodeType, ...]]] = Counter()
+        self.started = 0.0
+        self.duration = 0.0
+        self.overhead = 0.0  # Seconds the sampler spent walking stacks
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread:
+            return
+        self.samples = 0
+        self.counts = Counter()
+        self.overhead = 0.0
+        self.started = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"🔬 Sampling profiler started ({self.rate:.0f} Hz)")
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        self.duration = time.time() - self.started
+        logger.info(
+            f"🔬 Sampling profiler stopped: {self.samples} samples over {self.duration:.1f}s "
+            f"({self.overhead / max(self.duration, 1e-6) * 100:.1f}% of one core spent sampling)"
+        )
+
+    def _run(self):
+        interval = 1.0 / self.rate
+        own = threading.get_ident()
+        names: dict[int, str] = {}
+        next_sample = time.perf_counter()
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            frames = sys._current_frames()
+            if frames.keys() - names.keys():
+                names = {t.ident: t.name for t in threading.enumerate() if t.ident}
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                camera = self.thread_camera(ident) if self.thread_camera else None
+                key = (names.get(ident) or f"thread-{ident}", camera, _stack(frame))
+                self.counts[key] += 1
+            del frames, frame
+            self.samples += 1
+            now = time.perf_counter()
+            self.overhead += now - started
+
+            next_sample += interval
+            if next_sample < now:
+                next_sample = now  # Fell behind (GIL contention): skip, don't burst
+            self._stop.wait(next_sample - now)
+
+    def to_folded(self, counts: Counter | None = None) -> str:
+        """One line per distinct stack: 'thread;camera N;outer;...;inner count'"""
+        counts = self.counts if counts is None else counts
+        labels: dict[CodeType, str] = {}
+        lines = []
+        for (thread, camera, stack), count in sorted(
+            counts.items(), key=lambda item: (item[0][0], item[0][1] or 0)
+        ):
+            parts = [thread] + ([f"camera {camera}"] if camera is not None else [])
+            parts += [_label(code, labels).replace(";", ":") for code in stack]
+            lines.append(f"{';'.join(parts)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, counts: Counter | None = None) -> dict:
+        """speedscope file (https://www.speedscope.app): a sampled profile per thread and camera"""
+        counts = self.counts if counts is None else counts
+        frames: list[dict] = []
+        index: dict[CodeType, int] = {}
+        profiles: dict[tuple[str, int | None], dict] = {}
+        weight = 1000.0 / self.rate
+
+        for (thread, camera, stack), count in counts.items():
+            profile = profiles.get((thread, camera))
+            if profile is None:
+                profile = profiles[(thread, camera)] = {
+                    "type": "sampled",
+                    "name": thread + (f" · camera {camera}" if camera is not None else ""),
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": 0,
+                    "samples": [],
+                    "weights": [],
+                }
+            sample = []
+            for code in stack:
+                i = index.get(code)
+                if i is None:
+                    i = index[code] = len(frames)
+                    frames.append(
+                        {"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno}
+                    )
+                sample.append(i)
+            profile["samples"].append(sample)
+            profile["weights"].append(count * weight)
+            profile["endValue"] += count * weight
+
+        ordered = sorted(profiles.items(), key=lambda item: (item[0][0], item[0][1] or 0))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"Video Streamer Server {datetime.fromtimestamp(self.started):%Y-%m-%d %H:%M:%S}",
+            "exporter": "video-streamer-server",
+            "shared": {"frames": frames},
+            "profiles": [profile for _, profile in ordered],
+        }
+
+    def dump(self, fmt: str = "speedscope", path: Path | None = None) -> str:
+        """
+        Write the collected samples (stop first for a complete profile).
+        Counts are copied right away; encoding and writing happen on a
+        background thread.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown profile format {fmt!r} (expected one of {FORMATS})")
+        if path is None:
+            stamp = datetime.fromtimestamp(self.started or time.time()).strftime("%Y%m%d_%H%M%S")
+            suffix = ".speedscope.json" if fmt == "speedscope" else ".folded"
+            path = diagnostics_dir("profiles") / f"profile_{stamp}{suffix}"
+
+        counts = Counter(self.counts)
+
+        def write():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    if fmt == "speedscope":
+                        json.dump(self.to_speedscope(counts), f)
+                    else:
+                        f.write(self.to_folded(counts))
+                logger.info(f"🔬 Profile written: {path} ({len(counts)} distinct stacks)")
+            except OSError as e:
+                logger.error(f"❌ Could not write profile {path}: {e}")
+
+        threading.Thread(target=write, name="profile-dump", daemon=True).start()
+        return str(path)
+
+
+def _stack(frame: FrameType | None) -> tuple[CodeType, ...]:
+    """Code objects from the outermost frame to ``frame`` (innermost MAX_DEPTH kept)"""
+    codes = []
+    while frame is not None and len(codes) < MAX_DEPTH:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    return tuple(codes)
+
+
+def _label(code: CodeType, labels: dict[CodeType, str]) -> str:
+    label = labels.get(code)
+    if label is None:
+        label = labels[code] = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+    return label
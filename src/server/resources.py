@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResourceSnapshot:
+    """One sample of the server's resource use (CPU percentages: 100 = one core)"""
+
+    time: float = 0.0  # Wall clock of the sample
+    rss_bytes: int = 0
+    cpu_percent: float = 0.0  # Whole process
+    system_cpu_percent: float = 0.0  # All cores, 0-100
+    load_average: tuple[float, float, float] | None = None
+    threads: dict[str, float] = field(default_factory=dict)  # Thread name → CPU %
+    camera_decode_cpu: dict[int, float] = field(default_factory=dict)  # Camera → decode CPU %
+    loop_lag: dict[str, float] = field(default_factory=dict)  # Loop name → p99 lag, seconds
+
+    @property
+    def rss_mb(self) -> float:
+        return self.rss_bytes / 1024 / 1024
+
+    @property
+    def max_loop_lag(self) -> float:
+        return max(self.loop_lag.values(), default=0.0)
+
+
+class ResourceSampler:
+    """
+    One background thread sampling the whole server at a fixed interval:
+    process RSS and CPU, CPU per thread, decode CPU per camera, event loop
+    lag and system load. Handlers, the GUI and the metrics endpoint read
+    ``latest`` instead of querying psutil themselves.
+
+    Per-camera decode CPU comes from ``camera_cpu``, a callable returning
+    each camera's cumulative decode CPU seconds (the decode scheduler
+    measures thread CPU time around every job); loop lag from ``loop_lag``
+    (the LoopLagMonitor's recent p99 per loop).
+    """
+
+    def __init__(
+        self,
+        interval: float = 2.0,
+        camera_cpu: Callable[[], dict[int, float]] | None = None,
+        loop_lag: Callable[[], dict[str, float]] | None = None,
+    ):
+        """
+        Args:
+            interval: Seconds between samples
+            camera_cpu: Cumulative decode CPU seconds per camera
+            loop_lag: Current lag per event loop, in seconds
+        """
+        self.interval = interval
+        self.camera_cpu = camera_cpu
+        self.loop_lag = loop_lag
+        self.latest = ResourceSnapshot()
+        self.on_sample: Callable[[ResourceSnapshot], None] | None = None  # Sampler thread
+
+        self._process = psutil.Process()
+        self._thread_times: dict[int, float] = {}
+        self._camera_times: dict[int, float] = {}
+        self._last_sample = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        # Baselines, so the first sample already covers a full interval
+        self._process.cpu_percent()
+        psutil.cpu_percent()
+        self._thread_times = {
+            t.id: t.user_time + t.system_time for t in self._process.threads()
+        }
+        self._camera_times = self.camera_cpu() if self.camera_cpu else {}
+        self._last_sample = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.latest = self.sample()
+            except Exception as e:
+                logger.warning(f"⚠️ Resource sampling failed: {e}")
+                continue
+            if self.on_sample:
+                try:
+                    self.on_sample(self.latest)
+                except Exception as e:
+                    logger.error(f"Error in resource sample callback: {e}")
+
+    def sample(self) -> ResourceSnapshot:
+        now = time.perf_counter()
+        elapsed = max(now - self._last_sample, 1e-6)
+        self._last_sample = now
+
+        with self._process.oneshot():
+            rss = self._process.memory_info().rss
+            cpu = self._process.cpu_percent()
+            threads = self._process.threads()
+
+        return ResourceSnapshot(
+            time=time.time(),
+            rss_bytes=rss,
+            cpu_percent=cpu,
+            system_cpu_percent=psutil.cpu_percent(),
+            load_average=psutil.getloadavg() if hasattr(psutil, "getloadavg") else None,
+            threads=self._thread_cpu(threads, elapsed),
+            camera_decode_cpu=self._camera_decode_cpu(elapsed),
+            loop_lag=self.loop_lag() if self.loop_lag else {},
+        )
+
+    def _thread_cpu(self, threads, elapsed: float) -> dict[str, float]:
+        """CPU % per thread name since the last sample (same-named threads summed)"""
+        names = {t.native_id: t.name for t in threading.enumerate()}
+        usage: dict[str, float] = {}
+        times = {}
+        for t in threads:
+            total = t.user_time + t.system_time
+            times[t.id] = total
+            previous = self._thread_times.get(t.id)
+            if previous is None:
+                continue  # New thread: no baseline yet
+            name = names.get(t.id) or _native_thread_name(t.id)
+            usage[name] = usage.get(name, 0.0) + (total - previous) / elapsed * 100
+        self._thread_times = times
+        return usage
+
+    def _camera_decode_cpu(self, elapsed: float) -> dict[int, float]:
+        if not self.camera_cpu:
+            return {}
+        totals = self.camera_cpu()
+        usage = {
+            camera: max(total - self._camera_times.get(camera, total), 0.0) / elapsed * 100
+            for camera, total in totals.items()
+        }
+        self._camera_times = totals
+        return usage
+
+
+def _native_thread_name(tid: int) -> str:
+    """Threads Python didn't start (libav, OMT): their OS name where readable"""
+    try:
+        with open(f"/proc/self/task/{tid}/comm", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return "native"
@@ -0,0 +1,261 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .config import PRIORITY_PROFILES, CameraPriority
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CameraDeadlineStats:
+    """Deadline accounting for one camera"""
+
+    scheduled: int = 0
+    completed: int = 0
+    shed: int = 0  # Dropped before decoding (non-reference frames)
+    missed: int = 0  # Decoded and sent, but finished after the deadline
+    queued: int = 0  # Waiting for a worker right now
+    cpu_seconds: float = 0.0  # Worker thread CPU time spent on this camera's decodes
+    recent_costs: deque = field(default_factory=lambda: deque(maxlen=30))
+
+    @property
+    def deadline_misses(self) -> int:
+        return self.shed + self.missed
+
+    @property
+    def min_cost(self) -> float:
+        return min(self.recent_costs) if self.recent_costs else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "shed": self.shed,
+            "missed": self.missed,
+            "queued": self.queued,
+            "cpu_seconds": self.cpu_seconds,
+            "deadline_misses": self.deadline_misses,
+        }
+
+
+@dataclass
+class _DecodeJob:
+    camera_id: int
+    deadline: float
+    fn: Callable[..., Any]
+    args: tuple
+    sheddable: bool
+    future: asyncio.Future
+    task: asyncio.Future | None = None
+
+
+class DecodeScheduler:
+    """
+    Earliest-deadline-first decode scheduler shared by all phone handlers.
+
+    Each video frame gets a presentation deadline derived from its receive
+    time and the stream fps. Queued work from every camera is dispatched to a
+    small worker pool in deadline order, with PROGRAM cameras always ahead of
+    the rest. A frame that cannot make its deadline even at its camera's
+    fastest recent decode time is shed before decoding if nothing references
+    it; reference frames are always decoded and output (late, if need be),
+    so an overloaded camera slows down instead of freezing. PROGRAM frames
+    are never shed, and ISO cameras shed droppable frames as soon as work
+    starts to back up.
+
+    Handlers await each frame's decode before reading the next, so a camera
+    has at most one job queued; ordering matters between cameras.
+    """
+
+    def __init__(self, max_workers: int | None = None, deadline_frames: float = 2.0):
+        """
+        Args:
+            max_workers: Concurrent decode jobs (default: half the CPU cores, 2-8)
+            deadline_frames: Frame intervals allowed between receive and output
+        """
+        if max_workers is None:
+            max_workers = max(2, min((os.cpu_count() or 4) // 2, 8))
+
+        self.max_workers = max_workers
+        self.deadline_frames = deadline_frames
+        self.stats: dict[int, CameraDeadlineStats] = {}  # Add/remove only under _stats_lock
+        self.priorities: dict[int, CameraPriority] = {}
+        self.running: dict[int, int] = {}  # Worker thread id -> camera it is decoding for
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="decode"
+        )
+        self._queue: list[tuple[int, float, int, _DecodeJob]] = []
+        self._seq = itertools.count()
+        self._busy = 0
+        # Workers, the metrics thread and shard placement read stats off the loop
+        self._stats_lock = threading.Lock()
+
+    def deadline_for(self, receive_time: float, fps: int) -> float:
+        """Presentation deadline for a frame received at ``receive_time``"""
+        return receive_time + self.deadline_frames / max(fps, 1)
+
+    @property
+    def busy(self) -> int:
+        """Decode jobs running on workers"""
+        return self._busy
+
+    @property
+    def pending(self) -> int:
+        """Decode jobs waiting for a worker"""
+        return len(self._queue)
+
+    def camera_stats(self, camera_id: int) -> CameraDeadlineStats:
+        stats = self.stats.get(camera_id)
+        if stats is None:
+            with self._stats_lock:
+                stats = self.stats.setdefault(camera_id, CameraDeadlineStats())
+        return stats
+
+    def cpu_seconds(self, camera_id: int) -> float:
+        """Decode CPU time charged to a camera so far (0 if it has none here)"""
+        stats = self.stats.get(camera_id)
+        return stats.cpu_seconds if stats else 0.0
+
+    def set_priority(self, camera_id: int, priority: CameraPriority):
+        self.priorities[camera_id] = priority
+
+    def get_stats(self) -> dict[int, dict[str, Any]]:
+        """Per-camera deadline counters"""
+        with self._stats_lock:
+            cameras = list(self.stats.items())
+        return {cam: stats.as_dict() for cam, stats in cameras}
+
+    async def submit(
+        self,
+        camera_id: int,
+        deadline: float,
+        fn: Callable[..., Any],
+        *args,
+        sheddable: bool = False,
+    ) -> Any:
+        """
+        Queue ``fn(*args)`` for decoding before ``deadline``.
+
+        Returns the function's result, or None if the frame was shed.
+        """
+        loop = asyncio.get_running_loop()
+        job = _DecodeJob(camera_id, deadline, fn, args, sheddable, loop.create_future())
+
+        stats = self.camera_stats(camera_id)
+        stats.scheduled += 1
+        stats.queued += 1
+        tier = 0 if self._priority(camera_id) == CameraPriority.PROGRAM else 1
+        heapq.heappush(self._queue, (tier, deadline, next(self._seq), job))
+        self._dispatch(loop)
+
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            # Don't let the caller tear down its decoder while a worker still uses it
+            if job.task is not None and not job.task.done():
+                await asyncio.wait([job.task])
+            raise
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop):
+        while self._busy < self.max_workers and self._queue:
+            _, deadline, _, job = heapq.heappop(self._queue)
+            stats = self.camera_stats(job.camera_id)
+            stats.queued -= 1
+            if job.future.done():
+                continue  # Caller went away while queued
+
+            priority = self._priority(job.camera_id)
+            now = time.time()
+
+            backlogged = len(self._queue) >= self.max_workers
+            if priority == CameraPriority.ISO and backlogged and job.sheddable:
+                stats.shed += 1
+                job.future.set_result(None)
+                continue
+
+            if (
+                job.sheddable
+                and PRIORITY_PROFILES[priority].sheddable
+                and now + stats.min_cost > deadline
+            ):
+                stats.shed += 1
+                job.future.set_result(None)
+                continue
+
+            self._busy += 1
+            job.task = loop.run_in_executor(self._executor, self._run_job, job)
+            job.task.add_done_callback(
+                lambda task, job=job, started=now: self._on_done(loop, job, started, task)
+            )
+
+    def _run_job(self, job: _DecodeJob) -> Any:
+        """Worker side: run the job, charging its thread CPU time to the camera"""
+        worker = threading.get_ident()
+        self.running[worker] = job.camera_id
+        started = time.thread_time()
+        try:
+            return job.fn(*job.args)
+        finally:
+            stats = self.stats.get(job.camera_id)  # Never recreate a forgotten camera
+            if stats is not None:
+                stats.cpu_seconds += time.thread_time() - started
+            self.running.pop(worker, None)
+
+    def _on_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        job: _DecodeJob,
+        started: float,
+        task: asyncio.Future,
+    ):
+        self._busy -= 1
+
+        finished = time.time()
+        stats = self.camera_stats(job.camera_id)
+        stats.completed += 1
+        # Only full jobs (decoded and output) say how long a frame really takes
+        ran_whole = (
+            not task.cancelled()
+            and task.exception() is None
+            and task.result() is not None
+        )
+        if ran_whole:
+            stats.recent_costs.append(finished - started)
+        if finished > job.deadline:
+            stats.missed += 1
+
+        if not job.future.done():
+            if task.cancelled():
+                job.future.cancel()
+            elif task.exception() is not None:
+                job.future.set_exception(task.exception())  # type: ignore
+            else:
+                job.future.set_result(task.result())
+
+        self._dispatch(loop)
+
+    def _priority(self, camera_id: int) -> CameraPriority:
+        return self.priorities.get(camera_id, CameraPriority.PREVIEW)
+
+    def forget(self, camera_id: int):
+        """Drop accounting for a camera (e.g. on disconnect)"""
+        with self._stats_lock:
+            self.stats.pop(camera_id, None)
+
+    def shutdown(self):
+        """Cancel queued work and stop the worker pool"""
+        for *_, job in self._queue:
+            if not job.future.done():
+                job.future.cancel()
+        self._queue.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
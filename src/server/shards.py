@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Coroutine
+
+from .scheduler import DecodeScheduler
+
+logger = logging.getLogger(__name__)
+
+CAMERAS_PER_SHARD = 4  # Starting point for the automatic shard count (not a measured limit)
+DECODE_SECONDS_PER_PIXEL = 4e-9  # Guessed prior, replaced once any camera has been measured
+COST_REFRESH = 2.0  # Seconds between decode CPU readings of a camera
+REBALANCE_MARGIN = 0.02  # Cores a move must take off the gap between two shards
+
+
+def default_shard_count(camera_count: int) -> int:
+    """Event loops to run for ``camera_count`` cameras (1 = classic single loop)"""
+    if camera_count <= 8:
+        return 1
+    cpu_limit = max(2, (os.cpu_count() or 4) // 4)
+    return min(math.ceil(camera_count / CAMERAS_PER_SHARD), cpu_limit)
+
+
+class EventLoopShard:
+    """One asyncio event loop on its own thread, with its own decode pool"""
+
+    def __init__(self, index: int, decode_workers: int):
+        self.index = index
+        self.loop = asyncio.new_event_loop()
+        self.scheduler = DecodeScheduler(max_workers=decode_workers)
+        self.cameras: dict[int, float] = {}  # phone_id -> decode load (cores)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def thread_id(self) -> int | None:
+        return self._thread.ident if self._thread else None
+
+    @property
+    def load(self) -> float:
+        return sum(self.cameras.values())
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.loop.call_soon(ready.set)
+            self.loop.run_forever()
+
+        self._thread = threading.Thread(
+            target=run, name=f"loop-shard-{self.index}", daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on this shard from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def run(self, coro: Coroutine) -> Any:
+        """Await a coroutine running on this shard from another loop"""
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def call_soon(self, fn: Callable[..., Any], *args):
+        self.loop.call_soon_threadsafe(fn, *args)
+
+    async def _shutdown(self):
+        self.scheduler.shutdown()
+
+        tasks = [
+            t for t in asyncio.all_tasks(self.loop) if t is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self, timeout: float = 3.0):
+        """Cancel remaining work, stop the loop and join the thread"""
+        if self._thread is None:
+            return
+
+        if self.loop.is_running():
+            try:
+                self.submit(self._shutdown()).result(timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Shard {self.index}: shutdown incomplete ({e})")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Shard {self.index}: loop thread did not exit")
+        else:
+            self.loop.close()
+        self._thread = None
+
+
+class ShardPool:
+    """
+    K event loops, each owning a subset of cameras.
+
+    Cameras are placed on the least-loaded shard, so a busy camera's socket
+    reads, timeouts and decode scheduling never queue behind another
+    shard's. A camera's load is its measured decode CPU (the shard
+    scheduler's ``cpu_seconds``, as cores) once it has decoded something;
+    until then its pixel rate, priced at what the measured cameras actually
+    cost per pixel. Each shard has its own decode scheduler; the host's
+    decode threads are split evenly between shards.
+
+    Startup placement therefore only has the pixel-rate estimate to go on.
+    ``rebalance_move`` corrects it as measurements come in, by picking an
+    idle camera (no phone connected) to move off the busiest shard; a
+    streaming camera stays where it is until its phone leaves.
+    """
+
+    def __init__(self, shard_count: int, decode_workers: int | None = None):
+        """
+        Args:
+            shard_count: Number of event loop threads
+            decode_workers: Total decode threads across shards (default: CPU cores)
+        """
+        total_workers = decode_workers or (os.cpu_count() or 4)
+        per_shard = max(2, total_workers // max(shard_count, 1))
+
+        self.shards = [EventLoopShard(i, per_shard) for i in range(shard_count)]
+        self.placement: dict[int, EventLoopShard] = {}
+        self._pixel_rates: dict[int, float] = {}  # phone_id -> pixels per second
+        self._measured: dict[int, float] = {}  # phone_id -> decode cores
+        self._cpu_marks: dict[int, tuple[float, float]] = {}  # phone_id -> (cpu_seconds, time)
+        self._lock = threading.Lock()
+
+    def start(self):
+        for shard in self.shards:
+            shard.start()
+        logger.info(
+            f"🧵 Started {len(self.shards)} event loop shards "
+            f"({self.shards[0].scheduler.max_workers} decode workers each)"
+        )
+
+    def assign(self, phone_id: int, pixel_rate: float) -> EventLoopShard:
+        """Place a camera on the shard with the least measured decode load"""
+        with self._lock:
+            self._refresh_costs()
+            shard = min(self.shards, key=lambda s: (s.load, len(s.cameras), s.index))
+            self._place(phone_id, shard, pixel_rate)
+            return shard
+
+    def bind(self, phone_id: int, shard: EventLoopShard, pixel_rate: float):
+        """Record that a camera is now served by ``shard`` (e.g. accepted there)"""
+        with self._lock:
+            previous = self.placement.get(phone_id)
+            if previous is not None and previous is not shard:
+                previous.cameras.pop(phone_id, None)
+                previous.scheduler.forget(phone_id)
+                self._cpu_marks.pop(phone_id, None)  # CPU time is counted per scheduler
+            self._place(phone_id, shard, pixel_rate)
+
+    def release(self, phone_id: int):
+        with self._lock:
+            shard = self.placement.pop(phone_id, None)
+            if shard is not None:
+                shard.cameras.pop(phone_id, None)
+            self._pixel_rates.pop(phone_id, None)
+            self._measured.pop(phone_id, None)
+            self._cpu_marks.pop(phone_id, None)
+
+    def rebalance_move(self, idle: set[int]) -> tuple[int, EventLoopShard] | None:
+        """
+        An idle camera to move from the busiest shard to the least-loaded
+        one, and that shard; None unless it narrows the gap between them
+        by at least REBALANCE_MARGIN
+        """
+        with self._lock:
+            self._refresh_costs()
+            busiest = max(self.shards, key=lambda s: s.load)
+            lightest = min(self.shards, key=lambda s: s.load)
+            gap = busiest.load - lightest.load
+            best: tuple[float, int] | None = None
+            for phone_id, cost in busiest.cameras.items():
+                if phone_id not in idle:
+                    continue
+                remaining = abs(gap - 2 * cost)  # Gap after moving this camera
+                if gap - remaining >= REBALANCE_MARGIN and (best is None or remaining < best[0]):
+                    best = (remaining, phone_id)
+            return (best[1], lightest) if best else None
+
+    def _place(self, phone_id: int, shard: EventLoopShard, pixel_rate: float):
+        self._pixel_rates[phone_id] = pixel_rate
+        self.placement[phone_id] = shard
+        if phone_id not in self._cpu_marks:
+            cpu = shard.scheduler.cpu_seconds(phone_id)
+            self._cpu_marks[phone_id] = (cpu, time.monotonic())
+        shard.cameras[phone_id] = self._cost(phone_id)
+
+    def _refresh_costs(self):
+        """Turn decode CPU time since each camera's last reading into its load"""
+        now = time.monotonic()
+        for phone_id, shard in self.placement.items():
+            cpu = shard.scheduler.cpu_seconds(phone_id)
+            last_cpu, last_time = self._cpu_marks.get(phone_id, (cpu, now))
+            if now - last_time < COST_REFRESH:
+                continue
+            if cpu > last_cpu:
+                self._measured[phone_id] = (cpu - last_cpu) / (now - last_time)
+            # Idle (no phone): keep the last measurement, or the estimate
+            self._cpu_marks[phone_id] = (cpu, now)
+        for phone_id, shard in self.placement.items():
+            shard.cameras[phone_id] = self._cost(phone_id)
+
+    def _cost(self, phone_id: int) -> float:
+        measured = self._measured.get(phone_id)
+        if measured is not None:
+            return measured
+        return self._pixel_rates.get(phone_id, 0.0) * self._seconds_per_pixel()
+
+    def _seconds_per_pixel(self) -> float:
+        """Decode CPU per pixel across measured cameras (the prior until there are any)"""
+        pixels = sum(self._pixel_rates.get(phone_id, 0.0) for phone_id in self._measured)
+        if not pixels:
+            return DECODE_SECONDS_PER_PIXEL
+        return sum(self._measured.values()) / pixels
+
+    def shard_for(self, phone_id: int) -> EventLoopShard | None:
+        return self.placement.get(phone_id)
+
+    def get_stats(self) -> list[dict[str, Any]]:
+        """Per-shard placement, decode load and deadline counters"""
+        with self._lock:
+            self._refresh_costs()
+        return [
+            {
+                "shard": shard.index,
+                "cameras": sorted(shard.cameras),
+                "decode_load_cores": shard.load,
+                "decode_workers": shard.scheduler.max_workers,
+                "deadlines": shard.scheduler.get_stats(),
+            }
+            for shard in self.shards
+        ]
+
+    def stop(self):
+        """Stop all shards in parallel (each waits on its own loop's shutdown)"""
+        with ThreadPoolExecutor(len(self.shards)) as pool:
+            list(pool.map(EventLoopShard.stop, self.shards))
+        self.placement.clear()
+        self._pixel_rates.clear()
+        self._measured.clear()
+        self._cpu_marks.clear()
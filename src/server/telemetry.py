@@ -0,0 +1,237 @@
+import logging
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Candidate sender clock units (ticks per second): s, ms, us, ns
+_CLOCK_UNITS = (1.0, 1e3, 1e6, 1e9)
+
+
+@dataclass
+class NetworkQuality:
+    """Snapshot of one camera's link quality"""
+
+    goodput_bps: float = 0.0
+    jitter_ms: float = 0.0  # Mean |transit delta| between consecutive frames
+    jitter_p95_ms: float = 0.0
+    queue_delay_ms: float = 0.0  # Current one-way delay above the best seen
+    delay_trend_ms_s: float = 0.0  # Short-term slope of one-way delay
+    drift_ppm: float = 0.0  # Sender clock vs ours, from the delay floor
+    burstiness: float = 0.0  # Peak / mean bytes per 100 ms bin
+    samples: int = 0
+
+    @property
+    def congested(self) -> bool:
+        """Delay building up or highly variable: the network, not the server"""
+        return (
+            self.queue_delay_ms > 100
+            or self.delay_trend_ms_s > 10
+            or self.jitter_p95_ms > 50
+        )
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "goodput_bps": self.goodput_bps,
+            "jitter_ms": self.jitter_ms,
+            "jitter_p95_ms": self.jitter_p95_ms,
+            "queue_delay_ms": self.queue_delay_ms,
+            "delay_trend_ms_s": self.delay_trend_ms_s,
+            "drift_ppm": self.drift_ppm,
+            "burstiness": self.burstiness,
+            "samples": self.samples,
+        }
+
+
+class NetworkTelemetry:
+    """
+    Per-camera arrival telemetry from the frame header's sender timestamp.
+
+    Every frame is written into fixed-size numpy rings (arrival time, sender
+    time, size); statistics are computed vectorised on demand. Transit time
+    (arrival - sender time) includes an unknown clock offset, so only its
+    changes are meaningful: its spread is jitter, its rise above the floor is
+    queueing delay, and the slope of its per-second floor is clock drift.
+    The sender's timestamp unit is inferred from the first frames.
+    """
+
+    def __init__(self, capacity: int = 1024, floor_history: int = 300):
+        """
+        Args:
+            capacity: Frames kept for jitter, goodput and burstiness
+            floor_history: Per-second delay floors kept for drift (seconds)
+        """
+        self.capacity = capacity
+        self.arrival = np.zeros(capacity, dtype=np.float64)
+        self.sender = np.zeros(capacity, dtype=np.float64)
+        self.size = np.zeros(capacity, dtype=np.int64)
+        self.timed = np.zeros(capacity, dtype=bool)
+        self.count = 0  # Total frames recorded
+
+        # Per-second minimum transit: (arrival second, min transit)
+        self.floor_time = np.zeros(floor_history, dtype=np.float64)
+        self.floor_value = np.zeros(floor_history, dtype=np.float64)
+        self.floor_count = 0
+        self._floor_second: int | None = None
+        self._floor_min = math.inf
+
+        self.ticks_per_second: float | None = None
+        self._base_timestamp: int | None = None
+        self._base_arrival = 0.0
+
+    def reset(self):
+        """Forget everything (new connection; the sender clock may differ)"""
+        self.__init__(self.capacity, len(self.floor_time))
+
+    def record(self, timestamp: int, arrival: float, size: int, timed: bool = True):
+        """
+        Add one frame.
+
+        Args:
+            timestamp: Raw sender timestamp from the frame header (0 = none)
+            arrival: Local receive time (time.time())
+            size: Payload bytes
+            timed: False to count the frame only towards goodput (e.g. audio
+                stamped from a different clock)
+        """
+        timed = timed and timestamp > 0
+        if timed and self._base_timestamp is None:
+            self._base_timestamp = timestamp
+            self._base_arrival = arrival
+
+        i = self.count % self.capacity
+        self.arrival[i] = arrival
+        self.size[i] = size
+        self.timed[i] = timed
+        self.sender[i] = (
+            float(timestamp - self._base_timestamp)
+            if timed and self._base_timestamp is not None
+            else 0.0
+        )
+        self.count += 1
+
+        if not timed:
+            return
+        if self.ticks_per_second is None:
+            self._infer_clock_unit()
+            return
+
+        transit = (arrival - self._base_arrival) - self.sender[i] / self.ticks_per_second
+        second = int(arrival)
+        if second != self._floor_second:
+            self._close_floor_bucket()
+            self._floor_second = second
+        self._floor_min = min(self._floor_min, transit)
+
+    def _close_floor_bucket(self):
+        if self._floor_second is None or math.isinf(self._floor_min):
+            return
+        j = self.floor_count % len(self.floor_time)
+        self.floor_time[j] = self._floor_second
+        self.floor_value[j] = self._floor_min
+        self.floor_count += 1
+        self._floor_min = math.inf
+
+    def _infer_clock_unit(self):
+        arrival, sender = self._timed_window()
+        if arrival.size < 10:
+            return
+
+        d_arrival = np.diff(arrival)
+        d_sender = np.diff(sender)
+        ok = (d_arrival > 1e-4) & (d_sender > 0)
+        if ok.sum() < 5:
+            return
+
+        ratio = float(np.median(d_sender[ok] / d_arrival[ok]))
+        self.ticks_per_second = min(
+            _CLOCK_UNITS, key=lambda unit: abs(math.log10(ratio) - math.log10(unit))
+        )
+        logger.debug(f"Sender clock: {self.ticks_per_second:g} ticks/s")
+
+    def _window(self) -> slice | np.ndarray:
+        """Ring indices in arrival order"""
+        n = min(self.count, self.capacity)
+        if self.count <= self.capacity:
+            return slice(0, n)
+        start = self.count % self.capacity
+        return np.concatenate(
+            (np.arange(start, self.capacity), np.arange(0, start))
+        )
+
+    def _timed_window(self) -> tuple[np.ndarray, np.ndarray]:
+        idx = self._window()
+        mask = self.timed[idx]
+        return self.arrival[idx][mask], self.sender[idx][mask]
+
+    def snapshot(self, window: float = 5.0) -> NetworkQuality:
+        """Compute link quality over the last ``window`` seconds"""
+        quality = NetworkQuality()
+        if self.count < 2:
+            return quality
+
+        idx = self._window()
+        arrival = self.arrival[idx]
+        recent = arrival >= arrival[-1] - window
+        arrival_w = arrival[recent]
+        size_w = self.size[idx][recent]
+        quality.samples = int(arrival_w.size)
+
+        span = arrival_w[-1] - arrival_w[0]
+        if span > 0:
+            quality.goodput_bps = float(size_w[1:].sum() * 8 / span)
+
+            bins = np.floor((arrival_w - arrival_w[0]) / 0.1).astype(np.int64)
+            per_bin = np.bincount(bins, weights=size_w)
+            if per_bin.mean() > 0:
+                quality.burstiness = float(per_bin.max() / per_bin.mean())
+
+        if not self.ticks_per_second:
+            return quality
+
+        timed_w = self.timed[idx][recent]
+        t_arrival = arrival_w[timed_w]
+        if t_arrival.size < 3:
+            return quality
+        t_sender = self.sender[idx][recent][timed_w] / self.ticks_per_second
+        transit = (t_arrival - self._base_arrival) - t_sender
+
+        d_transit = np.abs(np.diff(transit)) * 1000
+        quality.jitter_ms = float(d_transit.mean())
+        quality.jitter_p95_ms = float(np.percentile(d_transit, 95))
+
+        if np.ptp(t_arrival) > 0.5:
+            slope = np.polyfit(t_arrival - t_arrival[0], transit, 1)[0]
+            quality.delay_trend_ms_s = float(slope * 1000)
+
+        drift, floor = self._floor_fit()
+        quality.drift_ppm = drift * 1e6
+        if floor is not None:
+            # Delay above the drift-corrected floor is queueing on the path
+            expected = floor + drift * (t_arrival[-1] - self._base_arrival)
+            quality.queue_delay_ms = max(0.0, float(transit[-1] - expected) * 1000)
+        else:
+            quality.queue_delay_ms = float(transit[-1] - transit.min()) * 1000
+
+        return quality
+
+    def _floor_fit(self) -> tuple[float, float | None]:
+        """Drift (s/s) and intercept of the per-second delay floor"""
+        n = min(self.floor_count, len(self.floor_time))
+        if n < 10:
+            return 0.0, None
+
+        times = self.floor_time[:n] - self._base_arrival
+        values = self.floor_value[:n]
+        drift, intercept = np.polyfit(times, values, 1)
+
+        # Refit on the lower half so queueing episodes don't bias the floor
+        residual = values - (intercept + drift * times)
+        low = residual <= np.median(residual)
+        if low.sum() >= 5:
+            drift, intercept = np.polyfit(times[low], values[low], 1)
+            intercept += float((values[low] - (intercept + drift * times[low])).min())
+
+        return float(drift), float(intercept)
@@ -0,0 +1,180 @@
+import itertools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Frame lifecycle stages (span kinds)
+READ, QUEUE, DECODE, CONVERT, SEND, PREVIEW = range(6)
+STAGE_NAMES = ("read", "queue", "decode", "convert", "send", "preview")
+
+# Each camera gets a track per lane, so slices on one track never overlap
+_LANES = ("connection", "decode", "preview")
+_STAGE_LANE = (0, 0, 1, 1, 1, 2)
+
+
+def diagnostics_dir(kind: str) -> Path:
+    """Where diagnostic dumps go: next to the GUI's logs (APPDATA or temp)"""
+    base = os.getenv("APPDATA") or tempfile.gettempdir()
+    return Path(base) / "VideoStreamerServer" / kind
+
+
+class FrameTracer:
+    """
+    Begin/end spans of each frame's lifecycle (read, decode queue, decode,
+    convert, send, preview) for every camera, exportable as a Chrome /
+    Perfetto JSON trace.
+
+    Spans go into preallocated numpy columns used as a ring; recording one
+    is a handful of item stores, safe from any thread. A process latency
+    above ``spike_threshold`` dumps the ring automatically (at most once per
+    ``min_dump_interval``), so the trace shows which stage stalled.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 65536,
+        spike_threshold: float = 0.1,
+        dump_dir: Path | None = None,
+        min_dump_interval: float = 30.0,
+    ):
+        """
+        Args:
+            capacity: Spans kept (about 6 per video frame)
+            spike_threshold: Received-to-sent seconds that trigger a dump
+            dump_dir: Directory for trace files (default: diagnostics dir)
+            min_dump_interval: Seconds between automatic dumps
+        """
+        self.capacity = capacity
+        self.spike_threshold = spike_threshold
+        self.dump_dir = dump_dir or diagnostics_dir("traces")
+        self.min_dump_interval = min_dump_interval
+
+        self.camera = np.zeros(capacity, dtype=np.uint16)
+        self.frame = np.zeros(capacity, dtype=np.uint32)
+        self.stage = np.zeros(capacity, dtype=np.uint8)
+        self.start = np.zeros(capacity, dtype=np.float64)  # perf_counter seconds
+        self.end = np.zeros(capacity, dtype=np.float64)
+        self._seq = itertools.count()  # Atomic slot claim across threads
+        self.count = 0  # Spans recorded
+
+        self.spikes = 0
+        self._last_dump = -float("inf")
+        # perf_counter → wall clock, for naming and the trace's metadata
+        self._wall_offset = time.time() - time.perf_counter()
+
+    def span(self, camera: int, frame: int, stage: int, start: float, end: float):
+        """Record one stage of one frame (``start``/``end`` from time.perf_counter())"""
+        n = next(self._seq)
+        i = n % self.capacity
+        self.camera[i] = camera
+        self.frame[i] = frame
+        self.stage[i] = stage
+        self.start[i] = start
+        self.end[i] = end
+        self.count = n + 1
+
+    def spike(self, camera: int, frame: int, latency: float) -> str | None:
+        """A frame took ``latency`` seconds end to end; dump the ring if allowed"""
+        self.spikes += 1
+        now = time.monotonic()
+        if now - self._last_dump < self.min_dump_interval:
+            return None
+        self._last_dump = now
+        logger.warning(
+            f"🐢 Camera {camera}: frame {frame} took {latency * 1000:.0f}ms, dumping frame trace"
+        )
+        return self.dump(f"spike-cam{camera}")
+
+    def snapshot(self) -> dict[str, np.ndarray]:
+        """Copies of the recorded spans, oldest first"""
+        count = min(self.count, self.capacity)
+        order = np.arange(count)
+        if self.count > self.capacity:
+            order = (order + self.count) % self.capacity
+        columns = {
+            "camera": self.camera[order],
+            "frame": self.frame[order],
+            "stage": self.stage[order],
+            "start": self.start[order],
+            "end": self.end[order],
+        }
+        valid = columns["end"] >= columns["start"]  # Skip a slot caught mid-write
+        return {name: column[valid] for name, column in columns.items()}
+
+    def to_chrome(self, spans: dict[str, np.ndarray] | None = None) -> dict:
+        """Chrome trace event format: tracks per camera and lane, a slice per stage"""
+        if spans is None:
+            spans = self.snapshot()
+        pid = os.getpid()
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": int(camera) * len(_LANES) + lane,
+                "args": {"name": f"Camera {int(camera)} {name}"},
+            }
+            for camera in np.unique(spans["camera"])
+            for lane, name in enumerate(_LANES)
+        ]
+        for camera, frame, stage, start, end in zip(
+            spans["camera"].tolist(),
+            spans["frame"].tolist(),
+            spans["stage"].tolist(),
+            spans["start"].tolist(),
+            spans["end"].tolist(),
+        ):
+            events.append(
+                {
+                    "name": STAGE_NAMES[stage],
+                    "cat": "frame",
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": camera * len(_LANES) + _STAGE_LANE[stage],
+                    "args": {"frame": frame},
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "wall_clock_offset_s": self._wall_offset,
+                "spans": self.count,
+                "spikes": self.spikes,
+            },
+        }
+
+    def dump(self, reason: str = "manual", path: Path | None = None) -> str:
+        """
+        Write the trace as JSON (open in ui.perfetto.dev or chrome://tracing).
+        The ring is copied right away; encoding and writing happen on a
+        background thread so no camera loop or decode worker waits on them.
+        """
+        spans = self.snapshot()
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = self.dump_dir / f"frame_trace_{stamp}_{reason}.json"
+
+        def write():
+            trace = self.to_chrome(spans)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(trace, f)
+                logger.info(f"🧵 Frame trace written: {path} ({len(trace['traceEvents'])} events)")
+            except OSError as e:
+                logger.error(f"❌ Could not write frame trace {path}: {e}")
+
+        threading.Thread(target=write, name="trace-dump", daemon=True).start()
+        return str(path)
@@ -0,0 +1,630 @@
+import asyncio
+import logging
+import socket
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+UDP_VERSION = 1
+
+# Packet kinds
+KIND_DATA = 1
+KIND_FEC = 2
+KIND_NACK = 3
+
+# Frame type 0 carries raw stream bytes (server → phone control messages)
+FRAME_TYPE_RAW = 0
+FRAME_TYPE_CONFIG = 0x03
+
+# version, kind, seq, frame_id, frag_index, frag_count, frame_type, flags, timestamp
+_HEADER = struct.Struct(">BBIIHHBIQ")
+HEADER_SIZE = _HEADER.size  # 27 bytes
+
+MAX_PAYLOAD = 1200  # Fits a 1280-byte IPv6 minimum MTU with headers
+FEC_GROUP = 8  # Data packets protected by one XOR parity packet
+MAX_NACK_SEQS = 64
+TOMBSTONE_SECONDS = 5.0  # Ignore a closed peer's stragglers this long
+
+SEQ_MASK = 0xFFFFFFFF  # seq and frame_id are 32-bit and wrap
+
+
+def seq_delta(a: int, b: int) -> int:
+    """Signed distance a - b between wrapping 32-bit counters (serial number arithmetic)"""
+    return ((a - b + 0x80000000) & SEQ_MASK) - 0x80000000
+
+
+@dataclass
+class UdpPacket:
+    kind: int
+    seq: int
+    frame_id: int
+    frag_index: int
+    frag_count: int
+    frame_type: int
+    flags: int
+    timestamp: int
+    payload: bytes
+
+    @classmethod
+    def parse(cls, data: bytes) -> "UdpPacket | None":
+        if len(data) < HEADER_SIZE:
+            return None
+        version, kind, *fields = _HEADER.unpack_from(data)
+        if version != UDP_VERSION:
+            return None
+        return cls(kind, *fields, payload=data[HEADER_SIZE:])
+
+
+def _pack(
+    kind: int,
+    seq: int,
+    frame_id: int = 0,
+    frag_index: int = 0,
+    frag_count: int = 0,
+    frame_type: int = 0,
+    flags: int = 0,
+    timestamp: int = 0,
+    payload: bytes = b"",
+) -> bytes:
+    return (
+        _HEADER.pack(
+            UDP_VERSION,
+            kind,
+            seq,
+            frame_id,
+            frag_index,
+            frag_count,
+            frame_type,
+            flags,
+            timestamp,
+        )
+        + payload
+    )
+
+
+def _fec_unit(packet: bytes) -> bytes:
+    """Length-prefixed packet, so XOR recovery restores the exact bytes"""
+    return struct.pack(">H", len(packet)) + packet
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    """XOR two byte strings, zero-padding the shorter (big-int XOR is C-speed)"""
+    size = max(len(a), len(b))
+    a, b = a.ljust(size, b"\0"), b.ljust(size, b"\0")
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(size, "big")
+
+
+def encode_nack(seqs: list[int]) -> bytes:
+    seqs = seqs[:MAX_NACK_SEQS]
+    return _pack(KIND_NACK, 0, payload=struct.pack(f">{len(seqs)}I", *seqs))
+
+
+class UdpPacketizer:
+    """
+    Sender side: fragments frames into sequenced packets, adds one XOR parity
+    packet per group of up to ``fec_group`` fragments (groups never span
+    frames, so recovery never waits on the next frame), and keeps recent
+    packets for NACK retransmission.
+    """
+
+    def __init__(self, fec_group: int = FEC_GROUP, history: int = 4096):
+        self.fec_group = fec_group
+        self.seq = 0
+        self.frame_id = 0
+        self._history: OrderedDict[int, bytes] = OrderedDict()
+        self._history_size = history
+        self.retransmitted = 0
+
+    def packetize(
+        self, frame_type: int, flags: int, timestamp: int, payload: bytes
+    ) -> list[bytes]:
+        chunks = [
+            payload[i : i + MAX_PAYLOAD] for i in range(0, len(payload), MAX_PAYLOAD)
+        ] or [b""]
+        frame_id = self.frame_id
+        self.frame_id = (self.frame_id + 1) & SEQ_MASK
+
+        packets = []
+        group_start = self.seq
+        parity = b""
+
+        for index, chunk in enumerate(chunks):
+            packet = _pack(
+                KIND_DATA,
+                self.seq,
+                frame_id,
+                index,
+                len(chunks),
+                frame_type,
+                flags,
+                timestamp,
+                chunk,
+            )
+            packets.append(packet)
+            self._remember(self.seq, packet)
+            parity = _xor(parity, _fec_unit(packet))
+            self.seq = (self.seq + 1) & SEQ_MASK
+
+            group_len = (self.seq - group_start) & SEQ_MASK
+            if group_len == self.fec_group or index == len(chunks) - 1:
+                packets.append(
+                    _pack(
+                        KIND_FEC,
+                        group_start,
+                        frame_id,
+                        group_len,
+                        payload=parity,
+                    )
+                )
+                group_start = self.seq
+                parity = b""
+
+        return packets
+
+    def _remember(self, seq: int, packet: bytes):
+        self._history[seq] = packet
+        if len(self._history) > self._history_size:
+            self._history.popitem(last=False)
+
+    def retransmit(self, seqs: list[int]) -> list[bytes]:
+        packets = [self._history[s] for s in seqs if s in self._history]
+        self.retransmitted += len(packets)
+        return packets
+
+
+@dataclass
+class _FrameAssembly:
+    frag_count: int
+    frame_type: int
+    flags: int
+    timestamp: int
+    first_arrival: float
+    parts: dict[int, bytes] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return len(self.parts) == self.frag_count
+
+
+@dataclass
+class ReassembledFrame:
+    frame_type: int
+    flags: int
+    timestamp: int
+    payload: bytes
+    first_arrival: float
+
+
+class UdpReassembler:
+    """
+    Receiver side: FEC recovery, NACK scheduling and an in-order frame
+    reorder buffer. A frame that is still incomplete ``latency_cap`` seconds
+    after a later frame became deliverable is skipped rather than stalling
+    the stream (the decoder's error recovery handles the gap).
+    """
+
+    def __init__(
+        self,
+        latency_cap: float = 0.15,
+        nack_delay: float = 0.01,
+        nack_retry: float = 0.04,
+        max_nacks: int = 2,
+    ):
+        self.latency_cap = latency_cap
+        self.nack_delay = nack_delay
+        self.nack_retry = nack_retry
+        self.max_nacks = max_nacks
+
+        self._raw: OrderedDict[int, bytes] = OrderedDict()  # seq -> packet (for FEC)
+        self._fec: dict[int, tuple[int, bytes]] = {}  # group start -> (len, parity)
+        self._frames: dict[int, _FrameAssembly] = {}
+        self._missing: dict[int, list[float]] = {}  # seq -> [since, last_nack, count]
+        self._highest_seq: int | None = None
+        self._next_frame: int | None = None
+        self._blocked_since: float | None = None
+
+        # Counters
+        self.received = 0
+        self.recovered = 0
+        self.nacked = 0
+        self.skipped_frames = 0
+        self.delivered_frames = 0
+
+    def on_datagram(self, data: bytes, now: float):
+        packet = UdpPacket.parse(data)
+        if packet is None:
+            return
+        if packet.kind == KIND_DATA:
+            self._on_data(packet, data, now)
+        elif packet.kind == KIND_FEC:
+            self._fec[packet.seq] = (packet.frag_index, packet.payload)
+            self._try_recover(packet.seq, now)
+
+    def _on_data(self, packet: UdpPacket, raw: bytes, now: float):
+        if packet.seq in self._raw:
+            return  # Duplicate (retransmission after FEC recovery)
+        self.received += 1
+
+        self._raw[packet.seq] = raw
+        while len(self._raw) > 4096:
+            self._raw.popitem(last=False)
+
+        # Gap tracking for NACKs
+        self._missing.pop(packet.seq, None)
+        ahead = seq_delta(packet.seq, self._highest_seq) if self._highest_seq is not None else 0
+        if self._highest_seq is None:
+            self._highest_seq = packet.seq
+        elif ahead > 0:
+            for step in range(1, min(ahead, 512)):
+                seq = (self._highest_seq + step) & SEQ_MASK
+                if seq not in self._raw:
+                    self._missing[seq] = [now, 0.0, 0]
+            self._highest_seq = packet.seq
+
+        self._add_fragment(packet, now)
+
+        # This packet may complete an FEC group with one loss
+        for start in list(self._fec):
+            length = self._fec[start][0]
+            if 0 <= seq_delta(packet.seq, start) < length:
+                self._try_recover(start, now)
+                break
+
+    def _add_fragment(self, packet: UdpPacket, now: float):
+        if self._next_frame is None:
+            self._next_frame = packet.frame_id
+        if seq_delta(packet.frame_id, self._next_frame) < 0:
+            return  # Frame already delivered or skipped
+
+        frame = self._frames.get(packet.frame_id)
+        if frame is None:
+            frame = self._frames[packet.frame_id] = _FrameAssembly(
+                packet.frag_count,
+                packet.frame_type,
+                packet.flags,
+                packet.timestamp,
+                now,
+            )
+        frame.parts[packet.frag_index] = packet.payload
+
+    def _try_recover(self, start: int, now: float):
+        entry = self._fec.get(start)
+        if entry is None:
+            return
+        length, parity = entry
+        seqs = [(start + i) & SEQ_MASK for i in range(length)]
+        missing = [s for s in seqs if s not in self._raw]
+        if len(missing) != 1:
+            if not missing:
+                self._fec.pop(start, None)
+            return
+
+        acc = parity
+        for seq in seqs:
+            if seq != missing[0]:
+                acc = _xor(acc, _fec_unit(self._raw[seq]))
+        size = struct.unpack(">H", acc[:2])[0]
+        recovered = bytes(acc[2 : 2 + size])
+
+        packet = UdpPacket.parse(recovered)
+        self._fec.pop(start, None)
+        if packet is None or packet.seq != missing[0]:
+            return
+        self.recovered += 1
+        self._on_data(packet, recovered, now)
+
+    def poll(self, now: float) -> tuple[list[ReassembledFrame], list[int]]:
+        """Deliverable frames in order, and sequence numbers to NACK now"""
+        frames = self._deliver(now)
+        nacks = self._due_nacks(now)
+        self.nacked += len(nacks)
+        self._prune(now)
+        return frames, nacks
+
+    def _deliver(self, now: float) -> list[ReassembledFrame]:
+        """Complete frames from the head of line; skips one held up past the latency cap"""
+        frames = []
+        while self._next_frame is not None:
+            frame = self._frames.get(self._next_frame)
+            if frame is not None and frame.complete:
+                frames.append(
+                    ReassembledFrame(
+                        frame.frame_type,
+                        frame.flags,
+                        frame.timestamp,
+                        b"".join(frame.parts[i] for i in range(frame.frag_count)),
+                        frame.first_arrival,
+                    )
+                )
+                self._advance()
+                self.delivered_frames += 1
+                continue
+
+            # Head of line is incomplete; only skip once something later is waiting
+            later = any(seq_delta(fid, self._next_frame) > 0 for fid in self._frames)
+            if not later:
+                self._blocked_since = None
+                break
+            if self._blocked_since is None:
+                self._blocked_since = now
+            if now - self._blocked_since < self.latency_cap:
+                break
+
+            self.skipped_frames += 1
+            self._advance()
+        return frames
+
+    def _due_nacks(self, now: float) -> list[int]:
+        nacks = []
+        for seq, state in self._missing.items():
+            since, last_nack, count = state
+            if count >= self.max_nacks or now - since < self.nack_delay:
+                continue
+            if count and now - last_nack < self.nack_retry:
+                continue
+            state[1], state[2] = now, count + 1
+            nacks.append(seq)
+            if len(nacks) >= MAX_NACK_SEQS:
+                break
+        return nacks
+
+    def _prune(self, now: float):
+        """Give up on gaps and parity groups nobody will fill"""
+        for seq in [s for s, st in self._missing.items() if now - st[0] > 1.0]:
+            del self._missing[seq]
+        if len(self._fec) > 256 and self._highest_seq is not None:
+            for start in [s for s in self._fec if seq_delta(self._highest_seq, s) > 2048]:
+                del self._fec[start]
+
+    def _advance(self):
+        self._frames.pop(self._next_frame, None)
+        self._next_frame = (self._next_frame + 1) & SEQ_MASK  # type: ignore
+        self._blocked_since = None
+
+        # Drop fragments of frames we have moved past
+        for fid in [f for f in self._frames if seq_delta(f, self._next_frame) < 0]:  # type: ignore
+            del self._frames[fid]
+
+
+class UdpStreamWriter:
+    """StreamWriter stand-in that sends writes as raw-stream UDP frames"""
+
+    def __init__(self, session: "UdpSession"):
+        self._session = session
+        self._closing = False
+
+    def write(self, data: bytes):
+        if not self._closing:
+            self._session.send_frame(FRAME_TYPE_RAW, 0, 0, bytes(data))
+
+    async def drain(self):
+        pass
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self):
+        if not self._closing:
+            self._closing = True
+            self._session.close()
+
+    async def wait_closed(self):
+        pass
+
+    def get_extra_info(self, name: str, default: Any = None) -> Any:
+        if name == "peername":
+            return self._session.addr
+        if name == "transport_kind":
+            return "udp"
+        return default
+
+
+class UdpSession:
+    """One remote peer: reassembles its frames into a StreamReader"""
+
+    def __init__(self, endpoint: "UdpIngestEndpoint", addr: tuple):
+        self.endpoint = endpoint
+        self.addr = addr
+        self.reader = asyncio.StreamReader()
+        self.writer = UdpStreamWriter(self)
+        self.packetizer = UdpPacketizer()
+        self.reassembler = UdpReassembler(latency_cap=endpoint.latency_cap)
+        self.last_packet = time.time()
+        self.closed = False
+
+    def on_datagram(self, data: bytes, now: float):
+        self.last_packet = now
+        packet = UdpPacket.parse(data)
+        if packet is not None and packet.kind == KIND_NACK:
+            count = len(packet.payload) // 4
+            seqs = list(struct.unpack(f">{count}I", packet.payload[: count * 4]))
+            for resend in self.packetizer.retransmit(seqs):
+                self.endpoint.sendto(resend, self.addr)
+            return
+        self.reassembler.on_datagram(data, now)
+        self.pump(now)
+
+    def pump(self, now: float):
+        frames, nacks = self.reassembler.poll(now)
+        for frame in frames:
+            self.reader.feed_data(stream_bytes(frame))
+        if nacks:
+            self.endpoint.sendto(encode_nack(nacks), self.addr)
+
+    def send_frame(self, frame_type: int, flags: int, timestamp: int, payload: bytes):
+        for packet in self.packetizer.packetize(frame_type, flags, timestamp, payload):
+            self.endpoint.sendto(packet, self.addr)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.reader.feed_eof()
+        self.endpoint.forget(self)
+
+
+def stream_bytes(frame: ReassembledFrame) -> bytes:
+    """Re-serialise a reassembled frame in the TCP stream format"""
+    if frame.frame_type == FRAME_TYPE_RAW:
+        return frame.payload
+    if frame.frame_type == FRAME_TYPE_CONFIG:
+        return bytes([FRAME_TYPE_CONFIG]) + struct.pack(">I", len(frame.payload)) + frame.payload
+    return (
+        bytes([frame.frame_type])
+        + struct.pack(">IIQ", len(frame.payload), frame.flags, frame.timestamp)
+        + frame.payload
+    )
+
+
+class UdpIngestEndpoint(asyncio.DatagramProtocol):
+    """
+    UDP counterpart of ``asyncio.start_server``: every new peer whose first
+    frame is a config handshake gets a (reader, writer) pair handed to the
+    same client callback as TCP connections, so the handler code is shared.
+    Senders should transmit the config frame's packets twice, since a session
+    can't NACK before it exists.
+
+    ``stop_accepting`` drains instead of closing: current sessions carry on
+    and the socket closes once the last of them ends. (A UDP session lives
+    on the endpoint's socket, unlike an accepted TCP connection.)
+    """
+
+    def __init__(
+        self,
+        client_connected_cb: Callable[..., Awaitable[None]],
+        latency_cap: float = 0.15,
+        tick: float = 0.02,
+    ):
+        self.client_connected_cb = client_connected_cb
+        self.latency_cap = latency_cap
+        self.tick = tick
+        self.transport: asyncio.DatagramTransport | None = None
+        self.sessions: dict[tuple, UdpSession] = {}
+        self.accepting = True
+        self._tombstones: dict[tuple, float] = {}  # Recently closed peers
+        self._tasks: set[asyncio.Task] = set()
+        self._ticker: asyncio.Task | None = None
+        self._closed = asyncio.Event()
+
+    def connection_made(self, transport):
+        self.transport = transport  # type: ignore
+        self._ticker = asyncio.get_running_loop().create_task(self._tick())
+
+    def connection_lost(self, exc):
+        self._closed.set()
+
+    def datagram_received(self, data: bytes, addr):
+        now = time.time()
+        session = self.sessions.get(addr)
+        if session is None:
+            if not self.accepting or now - self._tombstones.get(addr, 0.0) < TOMBSTONE_SECONDS:
+                return
+            # A session starts with the first fragment of a config frame
+            packet = UdpPacket.parse(data)
+            if (
+                packet is None
+                or packet.kind != KIND_DATA
+                or packet.frame_type != FRAME_TYPE_CONFIG
+            ):
+                return
+            session = self.sessions[addr] = UdpSession(self, addr)
+            task = asyncio.get_running_loop().create_task(self._serve(session))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        session.on_datagram(data, now)
+
+    async def _serve(self, session: UdpSession):
+        try:
+            await self.client_connected_cb(session.reader, session.writer)
+        except Exception as e:
+            logger.error(f"UDP session {session.addr[0]}:{session.addr[1]} failed: {e}")
+        finally:
+            session.writer.close()
+
+    async def _tick(self):
+        """Drive latency-cap skips and NACK retries while packets are quiet"""
+        while True:
+            await asyncio.sleep(self.tick)
+            now = time.time()
+            for session in list(self.sessions.values()):
+                session.pump(now)
+            if self._tombstones:
+                self._tombstones = {
+                    addr: closed
+                    for addr, closed in self._tombstones.items()
+                    if now - closed < TOMBSTONE_SECONDS
+                }
+
+    def sendto(self, data: bytes, addr):
+        if self.transport and not self.transport.is_closing():
+            self.transport.sendto(data, addr)
+
+    def forget(self, session: UdpSession):
+        if self.sessions.get(session.addr) is session:
+            del self.sessions[session.addr]
+            self._tombstones[session.addr] = time.time()
+        if not self.accepting and not self.sessions and not self.closed:
+            self.close()  # Drained
+
+    def stop_accepting(self):
+        """Take no new peers; close once the current sessions have ended"""
+        self.accepting = False
+        if not self.sessions:
+            self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.transport is None or self.transport.is_closing()
+
+    def close(self):
+        if self._ticker:
+            self._ticker.cancel()
+        if self.transport:
+            self.transport.close()
+        for session in list(self.sessions.values()):
+            session.close()
+
+    async def wait_closed(self):
+        """Until the socket is released and session callbacks have finished"""
+        if self.transport:
+            await self._closed.wait()
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=2.0)
+
+    @property
+    def sockets(self) -> list:
+        sock = self.transport.get_extra_info("socket") if self.transport else None
+        return [sock] if sock else []
+
+
+async def start_udp_server(
+    client_connected_cb: Callable[..., Awaitable[None]],
+    host: str,
+    port: int,
+    latency_cap: float = 0.15,
+    sock: socket.socket | None = None,
+) -> UdpIngestEndpoint:
+    """Bind a UDP ingest endpoint on the running loop (or serve an already bound ``sock``)"""
+    loop = asyncio.get_running_loop()
+    transport, endpoint = await loop.create_datagram_endpoint(
+        lambda: UdpIngestEndpoint(client_connected_cb, latency_cap),
+        **({"sock": sock} if sock else {"local_addr": (host, port)}),
+    )
+    set_receive_buffer(transport)
+    return endpoint
+
+
+def set_receive_buffer(transport: asyncio.BaseTransport, size: int = 4 * 1024 * 1024):
+    """Room for an IDR burst from several phones; the default overflows into loss"""
+    sock = transport.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+    except OSError as e:
+        logger.warning(f"Could not enlarge UDP receive buffer: {e}")
@@ -24,6 +24,7 @@ from gui.main_window import MainWindow
 from utils.crash_recovery import CrashRecovery
 from utils.dll_checker import DLLChecker
 from utils.fallback_mode import FallbackMode
+from server.logconfig import configure_logging
 
 from constants import ICON_PATH as icon_path
 
@@ -94,22 +95,16 @@ def setup_logging():
     # Create log filename with timestamp
     log_file = log_dir / f"video_streamer_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
     
-    # Configure root logger
-    logging.basicConfig(
-        level=logging.DEBUG,  # Capture everything
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            # File handler - detailed logging
-            logging.FileHandler(log_file, encoding='utf-8'),
-            # Console handler - important messages only
-            logging.StreamHandler(sys.stdout)
-        ]
+    # Configure root logger: everything to the file, important messages to the
+    # console. Both are written by a background thread behind a queue, so
+    # logging never blocks the camera loops; chatty call sites are rate limited.
+    configure_logging(
+        level=logging.DEBUG,
+        log_file=log_file,
+        console_level=logging.INFO,
+        stream=sys.stdout,
     )
     
-    # Set console handler to INFO level
-    console_handler = logging.getLogger().handlers[-1]
-    console_handler.setLevel(logging.INFO)
-    
     logger = logging.getLogger(__name__)
     logger.info("=" * 70)
     logger.info("Video Streamer Server Starting")
@@ -150,6 +145,13 @@ def global_exception_handler(exc_type, exc_value, exc_traceback):
     logger = logging.getLogger(__name__)
     logger.critical("Uncaught exception occurred!")
     logger.critical(error_msg)
+
+    # Save what every camera was doing in the seconds before the crash
+    try:
+        from server.flightrecorder import dump_all
+        dump_all("crash")
+    except Exception as e:
+        logger.error(f"Flight recorder dump failed: {e}")
     
     # Show user-friendly dialog
     try:
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The server runs from src/ (it is not an installed package)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
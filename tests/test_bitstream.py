@@ -0,0 +1,108 @@
+import av
+import numpy as np
+import pytest
+
+from server.bitstream import (
+    NAL_IDR,
+    NAL_PPS,
+    NAL_SLICE,
+    NAL_SPS,
+    AccessUnitInfo,
+    BitstreamInspector,
+    parse_sps,
+    remove_emulation_prevention,
+    split_nal_units,
+)
+
+GOP = 5
+
+
+@pytest.fixture(scope="module")
+def packets() -> list[bytes]:
+    """12 frames of 320x180 from libx264: IDR every 5 frames, two B frames between P frames"""
+    codec = av.CodecContext.create("libx264", "w")
+    codec.width, codec.height, codec.pix_fmt = 320, 180, "yuv420p"
+    codec.framerate = 30
+    codec.gop_size = GOP
+    codec.options = {"preset": "ultrafast", "bf": "2", "b-pyramid": "none", "keyint_min": str(GOP), "sc_threshold": "0"}
+    codec.open()
+
+    encoded = []
+    for i in range(12):
+        image = np.full((180, 320, 3), i * 10, np.uint8)
+        encoded += codec.encode(av.VideoFrame.from_ndarray(image, format="rgb24").reformat(format="yuv420p"))
+    encoded += codec.encode(None)
+    return [bytes(packet) for packet in encoded]
+
+
+def test_split_annex_b_with_both_start_code_lengths():
+    data = b"\x00\x00\x00\x01\x67\xaa\xbb" + b"\x00\x00\x01\x68\xcc" + b"\x00\x00\x00\x01\x65\xdd\x00\x00"
+    spans = split_nal_units(data)
+    assert [data[offset:offset + length] for offset, length in spans] == [
+        b"\x67\xaa\xbb",
+        b"\x68\xcc",
+        b"\x65\xdd",  # Trailing zero bytes are not part of the NAL unit
+    ]
+
+
+def test_split_avcc():
+    data = b"\x00\x00\x00\x03\x67\xaa\xbb" + b"\x00\x00\x00\x02\x68\xcc"
+    assert split_nal_units(data) == [(4, 3), (11, 2)]
+
+
+def test_split_rejects_unframed_data():
+    assert split_nal_units(b"\x12\x34\x56\x78\x9a\xbc\xde") == []
+
+
+def test_remove_emulation_prevention():
+    assert remove_emulation_prevention(b"\x01\x00\x00\x03\x01\x02") == b"\x01\x00\x00\x01\x02"
+    assert remove_emulation_prevention(b"\x01\x02\x03") == b"\x01\x02\x03"
+
+
+def test_parse_sps_applies_cropping(packets):
+    data = packets[0]
+    sps = next(
+        data[offset:offset + length]
+        for offset, length in split_nal_units(data)
+        if data[offset] & 0x1F == NAL_SPS
+    )
+    info = parse_sps(sps)
+    # 180 lines are coded as 12 macroblock rows (192) and cropped back
+    assert (info.width, info.height) == (320, 180)
+    assert info.chroma_format_idc == 1
+
+
+def test_parse_sps_rejects_truncated_nal():
+    assert parse_sps(b"\x67\x4d") is None
+
+
+def test_access_unit_classification():
+    assert AccessUnitInfo(nal_types=[NAL_SLICE], max_ref_idc=0).is_droppable
+    assert not AccessUnitInfo(nal_types=[NAL_SLICE], max_ref_idc=2).is_droppable
+    assert not AccessUnitInfo(nal_types=[NAL_SPS, NAL_PPS, NAL_IDR], is_idr=True, max_ref_idc=3).is_droppable
+    assert AccessUnitInfo(nal_types=[NAL_SPS, NAL_PPS]).is_config_only
+    assert not AccessUnitInfo(nal_types=[NAL_SPS, NAL_PPS]).is_droppable
+
+
+def test_inspector_classifies_encoder_output(packets):
+    inspector = BitstreamInspector(fps=30)
+    infos = [inspector.inspect(data) for data in packets]
+
+    assert [info.is_idr for info in infos] == [i % GOP == 0 for i in range(len(packets))]
+    assert all(info.has_sps for info in infos if info.is_idr)
+    # Only the B frames (nal_ref_idc 0 without a B pyramid) may be dropped
+    assert [info.is_droppable for info in infos[:GOP]] == [False, False, True, True, False]
+    assert inspector.sps.width == 320
+    assert inspector.idr_count == 3
+
+
+def test_inspector_gop_stats(packets):
+    inspector = BitstreamInspector(fps=30)
+    for data in packets:
+        inspector.inspect(data)
+
+    gops = list(inspector.recent_gops)
+    assert [gop.frames for gop in gops] == [GOP, GOP]
+    assert gops[0].bytes == sum(len(data) for data in packets[:GOP])
+    assert gops[0].bitrate == pytest.approx(gops[0].bytes * 8 / (GOP / 30))
+    assert inspector.average_gop_length == GOP
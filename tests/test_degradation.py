@@ -0,0 +1,106 @@
+from server.bitstream import NAL_IDR, NAL_SLICE, AccessUnitInfo
+from server.degradation import DecodeLoadController
+
+IDR = AccessUnitInfo(nal_types=[NAL_IDR], is_idr=True, max_ref_idc=3)
+P_FRAME = AccessUnitInfo(nal_types=[NAL_SLICE], max_ref_idc=2)
+B_FRAME = AccessUnitInfo(nal_types=[NAL_SLICE], max_ref_idc=0)
+
+SLOW = 0.040  # Above a 30 fps frame interval
+FAST = 0.005
+
+
+def feed(controller: DecodeLoadController, decode_time: float, start: float, seconds: float) -> float:
+    """Record one frame per frame interval; returns the time after the last one"""
+    now = start
+    while now < start + seconds:
+        controller.record(decode_time, now)
+        now += controller.frame_interval
+    return now
+
+
+def overload(controller: DecodeLoadController, now: float = 0.0) -> float:
+    """Drive the controller one tier down"""
+    level = controller.level
+    while controller.level == level:
+        controller.record(SLOW, now)
+        now += controller.frame_interval
+    return now
+
+
+def test_short_spike_does_not_degrade():
+    controller = DecodeLoadController(fps=30)
+    feed(controller, SLOW, 0.0, 0.3)
+    assert controller.level == 0
+
+
+def test_sustained_overload_steps_down_one_tier_per_hold():
+    controller = DecodeLoadController(fps=30)
+    now = feed(controller, SLOW, 0.0, 0.6)
+    assert controller.mode == "BIDIR"
+    assert controller.apply_pending
+
+    # The hold starts again after each step
+    now = feed(controller, SLOW, now, 0.3)
+    assert controller.mode == "BIDIR"
+    feed(controller, SLOW, now, 5.0)
+    assert controller.mode == "NONKEY"  # Heaviest tier, no further
+
+
+def test_recovery_waits_for_an_idr():
+    controller = DecodeLoadController(fps=30)
+    now = overload(controller)
+    now = feed(controller, FAST, now, 4.0)
+    assert controller.restore_level == 0
+    assert controller.level == 1
+
+    assert not controller.at_access_unit(P_FRAME)
+    assert controller.level == 1
+    assert controller.at_access_unit(IDR)
+    assert controller.mode == "FULL"
+
+
+def test_renewed_overload_cancels_a_pending_restore():
+    controller = DecodeLoadController(fps=30)
+    now = overload(controller)
+    now = feed(controller, FAST, now, 4.0)
+    assert controller.restore_level == 0
+
+    feed(controller, SLOW, now, 0.4)
+    assert controller.restore_level is None
+    assert controller.level == 1
+    assert not controller.at_access_unit(IDR)
+
+
+def test_expects_skip_follows_the_tier():
+    controller = DecodeLoadController(fps=30)
+    assert not controller.expects_skip(B_FRAME)
+
+    overload(controller)  # BIDIR
+    assert controller.expects_skip(B_FRAME)
+    assert not controller.expects_skip(P_FRAME)
+
+    controller.level = 3  # NONKEY
+    assert controller.expects_skip(P_FRAME)
+    assert not controller.expects_skip(IDR)
+
+
+def test_disabled_controller_restores_at_next_idr_and_ignores_load():
+    controller = DecodeLoadController(fps=30)
+    now = overload(controller)
+    controller.set_enabled(False)
+    assert controller.restore_level == 0
+
+    assert not controller.record(SLOW, now + 10)
+    assert controller.at_access_unit(IDR)
+    assert controller.level == 0
+
+
+def test_reset_returns_to_full_decode_immediately():
+    controller = DecodeLoadController(fps=30)
+    overload(controller)
+    controller.apply_pending = False
+
+    controller.reset()
+    assert controller.level == 0
+    assert controller.ewma == 0.0
+    assert controller.apply_pending
@@ -0,0 +1,103 @@
+import pytest
+
+import server.latency
+from server.latency import (
+    BUCKET_COUNT,
+    MAX_LATENCY,
+    LatencyHistogram,
+    StageLatency,
+    bucket_index,
+    bucket_value,
+)
+
+
+class Clock:
+    """Stand-in for time.monotonic() that only moves when told to"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(server.latency, "time", clock)
+    return clock
+
+
+def test_buckets_are_exact_below_32us():
+    for micros in range(32):
+        assert bucket_index(micros) == micros
+        assert bucket_value(micros) == micros / 1e6
+
+
+def test_bucket_relative_error_is_bounded():
+    for micros in (33, 100, 1_000, 12_345, 999_999, int(MAX_LATENCY * 1e6)):
+        value = bucket_value(bucket_index(micros)) * 1e6
+        assert abs(value - micros) / micros <= 1 / 16
+
+
+def test_buckets_are_monotonic():
+    indices = [bucket_index(micros) for micros in range(0, 200_000, 7)]
+    assert indices == sorted(indices)
+    assert bucket_index(int(MAX_LATENCY * 1e6)) == BUCKET_COUNT - 1
+
+
+def test_percentiles(clock):
+    histogram = LatencyHistogram()
+    assert histogram.percentiles() is None
+
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+    points = histogram.percentiles()
+    assert points[50] == pytest.approx(0.050, rel=1 / 16)
+    assert points[95] == pytest.approx(0.095, rel=1 / 16)
+    assert points[99] == pytest.approx(0.099, rel=1 / 16)
+    assert histogram.count == 100
+    assert histogram.max == 0.1
+
+
+def test_stall_beyond_max_latency_lands_in_last_bucket(clock):
+    histogram = LatencyHistogram()
+    histogram.observe(MAX_LATENCY * 3)
+    assert histogram.counts[-1] == 1
+
+
+def test_short_window_forgets_old_samples(clock):
+    histogram = LatencyHistogram()
+    histogram.observe(0.200)
+    clock.now += 5
+    histogram.observe(0.010)
+    assert histogram.window_counts().sum() == 2
+
+    clock.now += 6  # The 200 ms sample is now 11 s old
+    assert histogram.window_counts().sum() == 1
+    assert histogram.percentiles()[99] == pytest.approx(0.010, rel=1 / 16)
+    # The long window and the all-time counts still hold both
+    assert histogram.window_counts(60).sum() == 2
+    assert histogram.window_counts(None).sum() == 2
+
+
+def test_reused_slot_is_cleared(clock):
+    histogram = LatencyHistogram()
+    histogram.observe(0.200)
+    clock.now += 11  # Same ring slot, next lap
+    histogram.observe(0.010)
+    assert histogram.window_counts().sum() == 1
+
+
+def test_cumulative(clock):
+    histogram = LatencyHistogram()
+    for seconds in (0.001, 0.004, 0.020, 0.500):
+        histogram.observe(seconds)
+    assert histogram.cumulative((0.005, 0.05)) == [("0.005", 2), ("0.05", 3), ("+Inf", 4)]
+
+
+def test_stage_summary_skips_idle_stages(clock):
+    latency = StageLatency()
+    latency.decode.observe(0.004)
+    assert list(latency.summary()) == ["decode"]
+    assert latency.describe().startswith("decode 4.0/")
@@ -0,0 +1,122 @@
+from server.udp import (
+    KIND_DATA,
+    MAX_PAYLOAD,
+    SEQ_MASK,
+    UdpPacket,
+    UdpPacketizer,
+    UdpReassembler,
+    seq_delta,
+)
+
+
+def payload(index: int, fragments: int = 3) -> bytes:
+    return bytes([index % 256]) * (MAX_PAYLOAD * (fragments - 1) + 100)
+
+
+def data_seqs(packets: list[bytes]) -> list[int]:
+    return [UdpPacket.parse(p).seq for p in packets if UdpPacket.parse(p).kind == KIND_DATA]
+
+
+def deliver(reassembler: UdpReassembler, packets: list[bytes], now: float, drop=()):
+    """Feed packets, skipping data packets whose seq is in ``drop``"""
+    for packet in packets:
+        parsed = UdpPacket.parse(packet)
+        if parsed.kind == KIND_DATA and parsed.seq in drop:
+            continue
+        reassembler.on_datagram(packet, now)
+
+
+def test_seq_delta_wraps():
+    assert seq_delta(5, 3) == 2
+    assert seq_delta(0, SEQ_MASK) == 1
+    assert seq_delta(SEQ_MASK, 0) == -1
+    assert seq_delta(2, SEQ_MASK - 1) == 4
+
+
+def test_lossless_frames_arrive_in_order():
+    packetizer, reassembler = UdpPacketizer(), UdpReassembler()
+    sent = [payload(i) for i in range(5)]
+    for i, data in enumerate(sent):
+        deliver(reassembler, packetizer.packetize(1, 0, i, data), now=0.0)
+
+    frames, nacks = reassembler.poll(0.0)
+    assert [f.payload for f in frames] == sent
+    assert [f.timestamp for f in frames] == list(range(5))
+    assert nacks == []
+
+
+def test_fec_recovers_one_loss_per_group():
+    packetizer, reassembler = UdpPacketizer(), UdpReassembler()
+    packets = packetizer.packetize(1, 0, 0, payload(0))
+    deliver(reassembler, packets, now=0.0, drop={data_seqs(packets)[1]})
+
+    frames, nacks = reassembler.poll(0.1)
+    assert [f.payload for f in frames] == [payload(0)]
+    assert reassembler.recovered == 1
+    assert nacks == []
+
+
+def test_nack_retransmission_fills_two_losses_in_a_group():
+    packetizer, reassembler = UdpPacketizer(), UdpReassembler()
+    deliver(reassembler, packetizer.packetize(1, 0, 0, payload(0)), now=0.0)
+    lossy = packetizer.packetize(1, 0, 1, payload(1))
+    lost = set(data_seqs(lossy)[1:3])  # Beyond one parity packet
+    deliver(reassembler, lossy, now=0.0, drop=lost)
+    deliver(reassembler, packetizer.packetize(1, 0, 2, payload(2)), now=0.0)
+
+    frames, nacks = reassembler.poll(0.0)
+    assert [f.payload for f in frames] == [payload(0)]
+    assert nacks == []  # Not before nack_delay
+
+    frames, nacks = reassembler.poll(0.02)
+    assert frames == []
+    assert set(nacks) == lost
+
+    deliver(reassembler, packetizer.retransmit(nacks), now=0.03)
+    frames, _ = reassembler.poll(0.03)
+    assert [f.payload for f in frames] == [payload(1), payload(2)]
+    assert reassembler.skipped_frames == 0
+
+
+def test_sequence_numbers_wrap():
+    packetizer, reassembler = UdpPacketizer(), UdpReassembler()
+    packetizer.seq = SEQ_MASK - 4
+    packetizer.frame_id = SEQ_MASK - 1
+    sent = [payload(i) for i in range(6)]
+    lost = set()
+    for i, data in enumerate(sent):
+        packets = packetizer.packetize(1, 0, i, data)
+        if i == 2:
+            lost = set(data_seqs(packets)[:2])
+        deliver(reassembler, packets, now=0.0, drop=lost)
+    assert packetizer.seq < 100 and packetizer.frame_id == 4  # Both wrapped
+
+    frames, nacks = reassembler.poll(0.02)
+    assert [f.payload for f in frames] == sent[:2]
+    assert set(nacks) == lost
+
+    deliver(reassembler, packetizer.retransmit(nacks), now=0.03)
+    frames, nacks = reassembler.poll(0.03)
+    assert [f.payload for f in frames] == sent[2:]
+    assert nacks == []
+
+
+def test_latency_cap_skips_an_unrecoverable_frame():
+    packetizer, reassembler = UdpPacketizer(), UdpReassembler(latency_cap=0.15, max_nacks=0)
+    first = packetizer.packetize(1, 0, 0, payload(0))
+    deliver(reassembler, first, now=0.0, drop=set(data_seqs(first)[:2]))
+    deliver(reassembler, packetizer.packetize(1, 0, 1, payload(1)), now=0.0)
+
+    frames, _ = reassembler.poll(0.0)
+    assert frames == []  # Head of line waits for the gap to fill...
+    frames, _ = reassembler.poll(0.1)
+    assert frames == []
+
+    frames, _ = reassembler.poll(0.16)  # ...until the cap, then moves on
+    assert [f.payload for f in frames] == [payload(1)]
+    assert reassembler.skipped_frames == 1
+
+    # Late fragments of the skipped frame are ignored
+    deliver(reassembler, packetizer.retransmit(data_seqs(first)[:2]), now=0.2)
+    frames, _ = reassembler.poll(0.2)
+    assert frames == []